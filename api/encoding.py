@@ -0,0 +1,155 @@
+"""
+Response encodings for forecast results.
+
+Computed results keep their series as float64 arrays and their dates as
+datetime64[D] arrays. JSON (the default) converts them to lists and ISO date
+strings; the binary formats write the buffers as they are:
+
+- Arrow IPC stream (``application/vnd.apache.arrow.stream``): one long table
+  with a dictionary-encoded ``series`` column, a ``date`` (date32) column and
+  a ``value`` (float64) column; model weights, the term structure and charts
+  are JSON strings in the schema metadata.
+- MessagePack (``application/msgpack``): a map whose series are raw
+  little-endian float64 buffers and whose dates are int32 days since
+  1970-01-01, each described by ``dtype`` and ``unit`` keys.
+
+pyarrow and msgpack are optional; a format whose library is missing is not
+offered during negotiation.
+"""
+import importlib.util
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from volatility.calendar import get_calendar
+
+JSON = 'application/json'
+NDJSON = 'application/x-ndjson'
+ARROW = 'application/vnd.apache.arrow.stream'
+MSGPACK = 'application/msgpack'
+
+_ALIASES = {'application/x-msgpack': MSGPACK}
+_LIBRARIES = {ARROW: 'pyarrow', MSGPACK: 'msgpack'}
+
+# Series fields and the date field each one is aligned with
+SERIES_DATES = {
+    'historical_data': 'dates',
+    'forecast_data': 'forecast_dates',
+    'ensemble_forecast': 'forecast_dates'
+}
+DATE_FIELDS = ('dates', 'forecast_dates')
+
+class NotAcceptableError(Exception):
+    """No media type in the Accept header can be produced."""
+
+def _available(media_type: str) -> bool:
+    library = _LIBRARIES.get(media_type)
+    return library is None or importlib.util.find_spec(library) is not None
+
+def negotiate(accept: Optional[str], supported: Sequence[str] = (JSON, ARROW, MSGPACK)) -> str:
+    """
+    Pick the response media type from an Accept header.
+
+    Args:
+        accept: Accept header value; missing or empty selects the default
+        supported: Media types the endpoint can produce, default first
+
+    Returns:
+        The highest-quality supported media type whose library is installed
+
+    Raises:
+        NotAcceptableError: If no acceptable media type can be produced
+    """
+    default = supported[0]
+    if not accept or not accept.strip():
+        return default
+
+    candidates = []
+    for position, item in enumerate(accept.split(',')):
+        media_type, *params = [part.strip() for part in item.split(';')]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            candidates.append((-quality, position, media_type.lower()))
+
+    for _, _, media_type in sorted(candidates):
+        if media_type in ('*/*', 'application/*'):
+            return default
+        media_type = _ALIASES.get(media_type, media_type)
+        if media_type in supported and _available(media_type):
+            return media_type
+
+    offered = [media_type for media_type in supported if _available(media_type)]
+    raise NotAcceptableError(f"Cannot produce {accept}; available media types: {', '.join(offered)}")
+
+def json_payload(result: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Convert the requested fields of a result to JSON-compatible values."""
+    payload = {}
+    for field in fields:
+        value = result[field]
+        if isinstance(value, np.ndarray):
+            # Dates reuse the calendar's ISO strings
+            value = get_calendar().iso(value) if value.dtype.kind == 'M' else value.tolist()
+        payload[field] = value
+    return payload
+
+def _epoch_days(dates) -> np.ndarray:
+    return np.asarray(dates, dtype='datetime64[D]').astype('<i4')
+
+def msgpack_payload(result: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Map of the requested fields with series and dates as raw buffers."""
+    payload = {}
+    for field in fields:
+        value = result[field]
+        if field in SERIES_DATES:
+            value = {'dtype': '<f8', 'data': np.asarray(value, dtype='<f8').tobytes()}
+        elif field in DATE_FIELDS:
+            value = {'dtype': '<i4', 'unit': 'epoch_day', 'data': _epoch_days(value).tobytes()}
+        payload[field] = value
+    return payload
+
+def encode_msgpack(payload: Dict[str, Any]) -> bytes:
+    """Pack a map with MessagePack, keeping bytes as the bin type."""
+    import msgpack  # Optional dependency, only needed for this format
+
+    return msgpack.packb(payload, use_bin_type=True)
+
+def encode_arrow(result: Dict[str, Any], fields: List[str]) -> bytes:
+    """Write the requested series of a result as an Arrow IPC stream."""
+    import pyarrow as pa  # Optional dependency, only needed for this format
+
+    names = [field for field in SERIES_DATES if field in fields]
+    values = [np.asarray(result[field], dtype=np.float64) for field in names]
+    dates = [np.asarray(result[SERIES_DATES[field]], dtype='datetime64[D]') for field in names]
+    lengths = [len(array) for array in values]
+
+    series = pa.DictionaryArray.from_arrays(
+        pa.array(np.repeat(np.arange(len(names), dtype=np.int8), lengths)),
+        pa.array(names, type=pa.string())
+    )
+    metadata = {
+        field: json.dumps(result[field])
+        for field in ('model_weights', 'term_structure', 'volatility_chart', 'residuals_chart')
+        if field in fields
+    }
+    table = pa.table(
+        {
+            'series': series,
+            'date': pa.array(np.concatenate(dates) if dates else np.array([], dtype='datetime64[D]'),
+                             type=pa.date32()),
+            'value': pa.array(np.concatenate(values) if values else np.array([], dtype=np.float64))
+        },
+        metadata=metadata
+    )
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,133 @@
+"""
+Bounded worker pools for the blocking stages of the forecast pipeline.
+
+Data fetches are I/O bound and run on a thread pool. Model fitting and chart
+building are CPU bound; on hosts with more than one core they run on a
+process pool, so throughput scales with cores. With a single core, or with
+``VOLATILITY_MODEL_EXECUTOR=thread``, they run on a thread pool and share
+one core through the GIL. Batch requests fit on a pool of their own
+(``VOLATILITY_BATCH_EXECUTOR``), which follows the same default, so a
+batch spreads across worker processes even where single requests are kept
+on threads.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+FETCH_STAGE = 'fetch'
+MODEL_STAGE = 'model'
+BATCH_STAGE = 'batch'
+
+def _default_executor() -> str:
+    """Processes where there are cores to spread over, threads otherwise."""
+    return 'process' if (os.cpu_count() or 1) > 1 else 'thread'
+
+_settings: Dict[str, Any] = {
+    'fetch_workers': int(os.getenv('VOLATILITY_FETCH_WORKERS', '8')),
+    'model_workers': int(os.getenv('VOLATILITY_MODEL_WORKERS', str(os.cpu_count() or 1))),
+    'model_executor': os.getenv('VOLATILITY_MODEL_EXECUTOR') or _default_executor(),
+    'batch_workers': int(os.getenv('VOLATILITY_BATCH_WORKERS', str(os.cpu_count() or 1))),
+    'batch_executor': os.getenv('VOLATILITY_BATCH_EXECUTOR') or _default_executor(),
+    'fetch_timeout': float(os.getenv('VOLATILITY_FETCH_TIMEOUT', '20')),
+    'model_timeout': float(os.getenv('VOLATILITY_MODEL_TIMEOUT', '30')),
+    'batch_timeout': float(os.getenv('VOLATILITY_BATCH_TIMEOUT', os.getenv('VOLATILITY_MODEL_TIMEOUT', '30'))),
+}
+
+_pools: Dict[str, Executor] = {}
+_lock = threading.Lock()
+
+class StageTimeoutError(Exception):
+    """Raised when a pipeline stage does not finish within its timeout."""
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"Stage '{stage}' timed out after {timeout:g}s")
+        self.stage = stage
+        self.timeout = timeout
+
+def get_settings() -> Dict[str, Any]:
+    """Return a copy of the current pool settings."""
+    return dict(_settings)
+
+def configure_pools(**overrides: Any) -> None:
+    """
+    Override pool sizes, executor type or stage timeouts.
+
+    Existing pools are shut down and recreated lazily with the new settings.
+
+    Args:
+        **overrides: Any of fetch_workers, model_workers, model_executor,
+            batch_workers, batch_executor, fetch_timeout, model_timeout,
+            batch_timeout
+    """
+    unknown = set(overrides) - set(_settings)
+    if unknown:
+        raise ValueError(f"Unknown pool settings: {', '.join(sorted(unknown))}")
+    for name in ('model_executor', 'batch_executor'):
+        if overrides.get(name, 'thread') not in ('thread', 'process'):
+            raise ValueError(f"{name} must be 'thread' or 'process'")
+
+    shutdown_pools()
+    _settings.update(overrides)
+
+def get_pool(stage: str) -> Executor:
+    """Return the executor for a stage, creating it on first use."""
+    with _lock:
+        if stage not in _pools:
+            if stage == FETCH_STAGE:
+                _pools[stage] = ThreadPoolExecutor(
+                    max_workers=_settings['fetch_workers'],
+                    thread_name_prefix='volatility-fetch'
+                )
+            elif stage in (MODEL_STAGE, BATCH_STAGE):
+                if _settings[f'{stage}_executor'] == 'process':
+                    _pools[stage] = ProcessPoolExecutor(max_workers=_settings[f'{stage}_workers'])
+                else:
+                    _pools[stage] = ThreadPoolExecutor(
+                        max_workers=_settings[f'{stage}_workers'],
+                        thread_name_prefix=f'volatility-{stage}'
+                    )
+            else:
+                raise ValueError(f"Unknown pipeline stage: {stage}")
+        return _pools[stage]
+
+def shutdown_pools() -> None:
+    """Shut down all pools without waiting for queued work."""
+    with _lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+async def run_in_pool(stage: str,
+                      func: Callable[..., Any],
+                      *args: Any,
+                      timeout: Optional[float] = None,
+                      **kwargs: Any) -> Any:
+    """
+    Run a blocking function on a stage's pool without blocking the event loop.
+
+    Args:
+        stage: FETCH_STAGE, MODEL_STAGE or BATCH_STAGE
+        func: Function to run; must be picklable for a process pool
+        timeout: Seconds to wait; defaults to the stage's configured timeout
+
+    Returns:
+        The function's return value
+    """
+    if timeout is None:
+        timeout = _settings[f'{stage}_timeout']
+
+    loop = asyncio.get_running_loop()
+    pool = get_pool(stage)
+    call = functools.partial(func, *args, **kwargs)
+    if isinstance(pool, ThreadPoolExecutor):
+        # Carry context variables (e.g. the request's timing trace) into the worker thread
+        call = functools.partial(contextvars.copy_context().run, call)
+    future = loop.run_in_executor(pool, call)
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        raise StageTimeoutError(stage, timeout)
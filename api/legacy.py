@@ -0,0 +1,110 @@
+"""
+Compatibility routes of the former standalone volatility app.
+
+``POST /forecast`` keeps the request and response schema of the app that
+used to live in ``volatility/main.py`` (rolling volatility, a decayed EWMA
+forecast and normal confidence bands), but runs on the shared price store,
+result cache and worker pools of the unified service.
+"""
+from datetime import datetime, timedelta
+from typing import List
+
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+
+from volatility.instrumentation import timed
+from volatility.models import calculate_volatility, forecast_volatility, get_confidence_intervals
+
+from api.encoding import json_payload
+from api.executors import FETCH_STAGE, MODEL_STAGE, StageTimeoutError, run_in_pool
+from api.price_store import get_price_store
+from api.result_cache import get_result_cache, make_cache_key
+
+router = APIRouter(tags=["legacy"])
+
+class LegacyVolatilityRequest(BaseModel):
+    ticker: str
+    window: int = Field(default=20, ge=2)
+    forecast_horizon: int = Field(default=5, gt=0)
+    confidence: float = Field(default=0.95, gt=0, lt=1)
+
+class LegacyVolatilityResponse(BaseModel):
+    ticker: str
+    historical_dates: List[str]
+    historical_volatility: List[float]
+    forecast_dates: List[str]
+    forecast_volatility: List[float]
+    lower_bound: List[float]
+    upper_bound: List[float]
+
+def _compute_legacy_forecast(prices: pd.Series, request: LegacyVolatilityRequest) -> dict:
+    """Rolling volatility, EWMA forecast and bands; runs on the model pool."""
+    # Calculate historical volatility
+    hist_vol = calculate_volatility(prices, window=request.window).dropna()
+
+    # Generate forecast
+    forecast = forecast_volatility(
+        prices,
+        forecast_horizon=request.forecast_horizon,
+        window=request.window
+    )
+
+    # Calculate confidence intervals
+    lower_bound, upper_bound = get_confidence_intervals(
+        forecast,
+        hist_vol.std(),
+        confidence=request.confidence
+    )
+
+    return dict(
+        historical_dates=hist_vol.index.to_numpy(dtype='datetime64[D]'),
+        historical_volatility=hist_vol.to_numpy(dtype=np.float64),
+        forecast_dates=forecast.index.to_numpy(dtype='datetime64[D]'),
+        forecast_volatility=forecast.to_numpy(dtype=np.float64),
+        lower_bound=lower_bound.to_numpy(dtype=np.float64),
+        upper_bound=upper_bound.to_numpy(dtype=np.float64)
+    )
+
+@router.get("/")
+async def root():
+    return {"message": "Volatility Forecasting API"}
+
+@router.post("/forecast", response_model=LegacyVolatilityResponse)
+async def get_legacy_forecast(request: LegacyVolatilityRequest):
+    ticker = request.ticker.upper()
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=request.window * 2)  # Get extra data for better calculations
+
+    try:
+        with timed('fetch'):
+            hist_data = await run_in_pool(
+                FETCH_STAGE, get_price_store().get_history, ticker, start_date, end_date
+            )
+    except StageTimeoutError:
+        raise HTTPException(status_code=504, detail=f"Timed out while fetching {ticker}")
+    except Exception:
+        hist_data = pd.DataFrame()
+
+    if hist_data.empty:
+        raise HTTPException(status_code=404, detail=f"No data found for ticker {request.ticker}")
+
+    cache = get_result_cache()
+    key = make_cache_key(ticker, request.window, request.forecast_horizon, request.confidence,
+                         hist_data, endpoint='legacy')
+    result = cache.get(key)
+    if result is None:
+        try:
+            with timed('model'):
+                result = await run_in_pool(
+                    MODEL_STAGE, _compute_legacy_forecast, hist_data['Close'], request
+                )
+        except StageTimeoutError:
+            raise HTTPException(status_code=504, detail=f"Timed out while forecasting {ticker}")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        cache.set(key, result)
+
+    with timed('response'):
+        return LegacyVolatilityResponse(ticker=request.ticker, **json_payload(result, list(result)))
@@ -1,22 +1,81 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field, validator
 import pandas as pd
-import yfinance as yf
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import os
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime
 import json
-from typing import List, Dict, Optional
-
-from volatility.models import (
-    calculate_historical_volatility,
-    calculate_garch_forecast,
-    calculate_ewma_forecast,
-    calculate_parkinson_volatility,
-    VolatilityEnsemble
+from typing import List, Dict, Optional, Tuple
+
+from volatility.garch_store import get_garch_store
+from volatility.instrumentation import (
+    end_trace,
+    get_registry,
+    server_timing_header,
+    start_trace,
+    timed
+)
+
+from api.encoding import (
+    ARROW,
+    JSON,
+    MSGPACK,
+    NDJSON,
+    NotAcceptableError,
+    encode_arrow,
+    encode_msgpack,
+    json_payload,
+    msgpack_payload,
+    negotiate
 )
-from volatility.visualization import create_volatility_chart, plot_model_residuals
+from api.legacy import router as legacy_router
+from api.executors import (
+    BATCH_STAGE,
+    FETCH_STAGE,
+    MODEL_STAGE,
+    StageTimeoutError,
+    run_in_pool,
+    shutdown_pools
+)
+from api.pipeline import compute_forecast, history_window
+from api.price_store import get_price_store, validate_ticker
+from api.result_cache import get_result_cache, make_cache_key
+from api.singleflight import SingleFlight
+from api.snapshots import get_snapshot_store
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown_pools()
+    get_garch_store().flush()
+
+app = FastAPI(title="Volatility Forecast API", lifespan=lifespan)
+
+# Forecast routes, mounted under /api/v1/volatility and the unversioned
+# /api/volatility prefix existing clients use
+router = APIRouter(tags=["forecast"])
+
+MAX_BATCH_SIZE = 100
+
+# Limits of a term-structure request
+MAX_TERM_HORIZONS = 20
+MAX_TERM_HORIZON_DAYS = 2520
+
+# Seconds clients and CDNs may reuse a forecast response
+CACHE_MAX_AGE = int(os.getenv('VOLATILITY_CACHE_MAX_AGE', '300'))
+
+# Report per-stage timings to clients in a Server-Timing header
+SERVER_TIMING = os.getenv('VOLATILITY_SERVER_TIMING', '0') == '1'
 
-app = FastAPI(title="Volatility Forecast API")
+# Concurrent requests share in-flight downloads (per ticker) and model runs
+# (per result key)
+fetch_flights = SingleFlight()
+result_flights = SingleFlight()
 
 # Add CORS middleware
 app.add_middleware(
@@ -27,135 +86,311 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_stage_timings(request: Request, call_next):
+    """Time every request and optionally report its stages in Server-Timing.
+
+    Streamed responses only include the stages finished before the first byte.
+    """
+    token = start_trace()
+    try:
+        with timed('request'):
+            response = await call_next(request)
+    finally:
+        trace = end_trace(token)
+    if SERVER_TIMING and trace:
+        response.headers['Server-Timing'] = server_timing_header(trace)
+    return response
+
+CHART_FIELDS = ('volatility_chart', 'residuals_chart')
+RESPONSE_FIELDS = (
+    'historical_data',
+    'forecast_data',
+    'ensemble_forecast',
+    'dates',
+    'forecast_dates',
+    'model_weights',
+    'term_structure',
+) + CHART_FIELDS
+
 class VolatilityRequest(BaseModel):
     ticker: str
     historical_window: int = Field(default=30, gt=0)
     forecast_horizon: int = Field(default=5, gt=0)
     confidence_level: float = Field(default=0.95, gt=0, lt=1)
+    include_charts: bool = True
+    forecast_horizons: Optional[List[int]] = None
+    fields: Optional[List[str]] = None
 
     @validator('ticker')
-    def validate_ticker(cls, v):
+    def _check_ticker(cls, v):
         if not v or not isinstance(v, str) or len(v) > 10:
             raise ValueError("Invalid ticker symbol")
-        return v.upper()
+        return validate_ticker(v.upper())
+
+    @validator('forecast_horizons')
+    def validate_forecast_horizons(cls, v):
+        if v is not None:
+            horizons = sorted(set(v))
+            if not horizons or len(horizons) > MAX_TERM_HORIZONS:
+                raise ValueError(f"forecast_horizons must list 1 to {MAX_TERM_HORIZONS} horizons")
+            if horizons[0] < 1 or horizons[-1] > MAX_TERM_HORIZON_DAYS:
+                raise ValueError(f"Horizons must be between 1 and {MAX_TERM_HORIZON_DAYS} days")
+            return horizons
+        return v
+
+    @validator('fields')
+    def validate_fields(cls, v, values):
+        if v is not None:
+            unknown = sorted(set(v) - set(RESPONSE_FIELDS))
+            if unknown:
+                raise ValueError(f"Unknown response fields: {', '.join(unknown)}")
+            if 'term_structure' in v and not values.get('forecast_horizons'):
+                raise ValueError("The term_structure field needs forecast_horizons")
+        return v
+
+    def response_fields(self) -> List[str]:
+        """Return the response fields this request asks for."""
+        if self.fields is not None:
+            return [field for field in RESPONSE_FIELDS if field in self.fields]
+        return [
+            field for field in RESPONSE_FIELDS
+            if (self.include_charts or field not in CHART_FIELDS)
+            and (self.forecast_horizons or field != 'term_structure')
+        ]
+
+class BatchVolatilityRequest(BaseModel):
+    requests: List[VolatilityRequest] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+class TermStructure(BaseModel):
+    horizons: List[int]
+    models: Dict[str, List[float]]
+    ensemble: List[float]
 
 class VolatilityResponse(BaseModel):
-    historical_data: List[float]
-    forecast_data: List[float]
-    ensemble_forecast: List[float]
-    dates: List[str]
-    forecast_dates: List[str]
-    model_weights: Dict[str, float]
-    volatility_chart: dict
-    residuals_chart: dict
-
-@app.post("/api/volatility/forecast", response_model=VolatilityResponse)
-async def get_volatility_forecast(request: VolatilityRequest):
+    historical_data: Optional[List[float]] = None
+    forecast_data: Optional[List[float]] = None
+    ensemble_forecast: Optional[List[float]] = None
+    dates: Optional[List[str]] = None
+    forecast_dates: Optional[List[str]] = None
+    model_weights: Optional[Dict[str, float]] = None
+    term_structure: Optional[TermStructure] = None
+    volatility_chart: Optional[dict] = None
+    residuals_chart: Optional[dict] = None
+
+def _download_history(ticker: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    """Load daily OHLC bars for a ticker through the price cache."""
+    return get_price_store().get_history(ticker, start_date, end_date)
+
+def _compute_forecast(hist_data: pd.DataFrame,
+                      request: VolatilityRequest,
+                      include_charts: bool) -> dict:
+    """Fit the models and build every response field; runs on the model pool."""
+    return compute_forecast(
+        hist_data,
+        request.ticker,
+        historical_window=request.historical_window,
+        forecast_horizon=request.forecast_horizon,
+        forecast_horizons=request.forecast_horizons,
+        confidence_level=request.confidence_level,
+        include_charts=include_charts
+    )
+
+def _history_window(request: VolatilityRequest) -> Tuple[datetime, datetime]:
+    """Return the (start, end) dates of price history needed for a request."""
+    return history_window(request.historical_window)
+
+def _timeout_error(request: VolatilityRequest, error: StageTimeoutError) -> HTTPException:
+    return HTTPException(
+        status_code=504,
+        detail=f"Timed out while processing {request.ticker} ({error.stage} stage). Please try again later."
+    )
+
+def _validate_history(hist_data: pd.DataFrame, request: VolatilityRequest) -> None:
+    """Reject histories that are empty or shorter than the requested window."""
+    if hist_data.empty:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data found for ticker {request.ticker}"
+        )
+    
+    if len(hist_data) < request.historical_window:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Insufficient historical data for ticker {request.ticker}. " \
+                   f"Need at least {request.historical_window} days, but got {len(hist_data)} days."
+        )
+
+def _wants_charts(request: VolatilityRequest) -> bool:
+    return any(field in CHART_FIELDS for field in request.response_fields())
+
+def _result_key(hist_data: pd.DataFrame, request: VolatilityRequest) -> str:
+    """Key of the computed result, before field projection."""
+    return make_cache_key(
+        request.ticker,
+        request.historical_window,
+        request.forecast_horizon,
+        request.confidence_level,
+        hist_data,
+        include_charts=_wants_charts(request),
+        forecast_horizons=request.forecast_horizons
+    )
+
+def _etag(result_key: str, request: VolatilityRequest, media_type: str = JSON) -> str:
+    """Entity tag of the projected response in one media type."""
+    fields = ','.join(request.response_fields())
+    tag = f"{result_key}:{fields}:{media_type}"
+    return '"' + hashlib.sha256(tag.encode('utf-8')).hexdigest()[:32] + '"'
+
+# One entity tag of an If-None-Match list, weak or strong (RFC 9110 section 8.8.3)
+_ENTITY_TAG = re.compile(r'\s*(?:W/)?("[^"]*")\s*(?:,|$)')
+
+def _none_match(header: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches the response's entity tag.
+
+    ``*`` matches any current representation; listed tags are compared
+    weakly (RFC 9110 section 13.1.2), i.e. ``W/`` prefixes are ignored.
+    """
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    opaque_tag = etag[2:] if etag.startswith('W/') else etag
+    return any(match.group(1) == opaque_tag for match in _ENTITY_TAG.finditer(header))
+
+def _snapshot_result(request: VolatilityRequest) -> Optional[Tuple[str, dict]]:
+    """Return (result key, result) from the nightly snapshot, or None to compute live."""
+    store = get_snapshot_store()
+    if store is None or _wants_charts(request) or request.forecast_horizons:
+        return None
     try:
-        # Fetch historical data
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=request.historical_window * 2)  # Extra data for better modeling
-        
-        try:
-            hist_data = yf.download(
-                request.ticker,
-                start=start_date,
-                end=end_date,
-                progress=False
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No data found for ticker {request.ticker}"
-            )
-        
-        if hist_data.empty:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No data found for ticker {request.ticker}"
+        with timed('snapshot'):
+            return store.lookup(request.ticker, request.historical_window, request.forecast_horizon)
+    except (OSError, ValueError):
+        # An unreadable snapshot must not fail requests that can be computed live
+        return None
+
+def _negotiate(http_request: Request, supported) -> str:
+    try:
+        return negotiate(http_request.headers.get('accept'), supported)
+    except NotAcceptableError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+
+async def _fetch_history(request: VolatilityRequest) -> pd.DataFrame:
+    """Fetch a request's price history, joining an in-flight download of the ticker that covers it."""
+    start_date, end_date = _history_window(request)
+    hist_data = await fetch_flights.do(
+        request.ticker,
+        lambda: run_in_pool(FETCH_STAGE, _download_history, request.ticker, start_date, end_date),
+        meta=start_date,
+        joinable=lambda flight_start: flight_start <= start_date
+    )
+    # A joined download may reach further back than this request's window
+    return hist_data.loc[start_date:]
+
+async def _compute_result(hist_data: pd.DataFrame,
+                          request: VolatilityRequest,
+                          result_key: str,
+                          stage: str = MODEL_STAGE) -> dict:
+    """Run the model stage for a result on the stage's pool and cache it."""
+    try:
+        with timed('model'):
+            result = await run_in_pool(
+                stage, _compute_forecast, hist_data, request, _wants_charts(request)
             )
+    except StageTimeoutError as e:
+        raise _timeout_error(request, e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while processing the request. Please try again later."
+        )
+    get_result_cache().set(result_key, result)
+    return result
+
+async def _forecast_result(hist_data: pd.DataFrame,
+                           request: VolatilityRequest,
+                           result_key: str,
+                           stage: str = MODEL_STAGE) -> dict:
+    """Return a validated history's computed result from the result cache or the model stage."""
+    result = get_result_cache().get(result_key)
+    
+    if result is None:
+        # Identical concurrent requests wait for one model run
+        result = await result_flights.do(
+            result_key, lambda: _compute_result(hist_data, request, result_key, stage)
+        )
+    
+    return result
+
+def _json_response(result: dict, request: VolatilityRequest) -> VolatilityResponse:
+    with timed('response'):
+        return VolatilityResponse(**json_payload(result, request.response_fields()))
+
+def _binary_response(result: dict, request: VolatilityRequest, media_type: str) -> Response:
+    with timed('response'):
+        fields = request.response_fields()
+        if media_type == ARROW:
+            content = encode_arrow(result, fields)
+        else:
+            content = encode_msgpack(msgpack_payload(result, fields))
+        return Response(content=content, media_type=media_type)
+
+def _cache_headers(etag: str) -> Dict[str, str]:
+    return {'ETag': etag, 'Cache-Control': f"public, max-age={CACHE_MAX_AGE}", 'Vary': 'Accept'}
+
+@router.post("/forecast",
+             response_model=VolatilityResponse,
+             response_model_exclude_unset=True)
+async def get_volatility_forecast(request: VolatilityRequest, http_request: Request, response: Response):
+    """
+    Forecast one ticker.
+
+    The body is JSON unless the Accept header asks for an Arrow IPC stream
+    (application/vnd.apache.arrow.stream) or MessagePack (application/msgpack).
+    Requests without charts that match the nightly snapshot's window and
+    horizon are served from it (see api.snapshots). With ``forecast_horizons``
+    the response also carries a ``term_structure`` computed from the same fit.
+    """
+    try:
+        media_type = _negotiate(http_request, (JSON, ARROW, MSGPACK))
         
-        if len(hist_data) < request.historical_window:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Insufficient historical data for ticker {request.ticker}. " \
-                       f"Need at least {request.historical_window} days, but got {len(hist_data)} days."
-            )
+        # Precomputed end-of-day forecasts need neither prices nor models
+        snapshot = _snapshot_result(request)
+        if snapshot is not None:
+            result_key, result = snapshot
+        else:
+            # Fetch historical data
+            try:
+                with timed('fetch'):
+                    hist_data = await _fetch_history(request)
+            except StageTimeoutError as e:
+                raise _timeout_error(request, e)
+            except Exception as e:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No data found for ticker {request.ticker}"
+                )
+            
+            _validate_history(hist_data, request)
+            result_key, result = _result_key(hist_data, request), None
+        etag = _etag(result_key, request, media_type)
         
-        # Calculate volatilities
-        prices = hist_data['Close']
-        ohlc_data = hist_data[['High', 'Low']]
+        # The client already holds this exact response
+        if _none_match(http_request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=_cache_headers(etag))
         
-        try:
-            # Initialize ensemble model
-            ensemble = VolatilityEnsemble(
-                historical_window=request.historical_window,
-                forecast_horizon=request.forecast_horizon
-            )
-            
-            # Fit ensemble and generate forecasts
-            ensemble.fit(prices, ohlc_data)
-            ensemble_forecast = ensemble.predict()
-            
-            # Get individual model forecasts
-            garch_forecast = calculate_garch_forecast(prices, request.forecast_horizon)
-            
-            # Calculate historical volatility
-            hist_vol = calculate_historical_volatility(prices, request.historical_window)
-            
-            # Create visualization
-            vol_chart = create_volatility_chart(
-                historical_data=hist_vol,
-                forecast_data=garch_forecast,
-                ensemble_forecast=ensemble_forecast,
-                model_weights=ensemble.get_model_weights(),
-                title=f"{request.ticker} Volatility Forecast",
-                show_confidence_intervals=True,
-                confidence_level=request.confidence_level
-            )
-            
-            # Create residuals analysis
-            residuals_chart = plot_model_residuals(
-                historical_data=hist_vol,
-                forecast_data=garch_forecast,
-                ensemble_forecast=ensemble_forecast
-            )
-            
-            # Convert numpy arrays and pandas series to lists
-            hist_vol_list = hist_vol.fillna(0).tolist()  # Replace NaN with 0 for serialization
-            garch_forecast_list = garch_forecast.fillna(0).tolist()
-            ensemble_forecast_list = ensemble_forecast.fillna(0).tolist()
-            dates_list = hist_vol.index.strftime('%Y-%m-%d').tolist()
-            forecast_dates_list = ensemble_forecast.index.strftime('%Y-%m-%d').tolist()
-            
-            # Convert chart data to JSON-serializable format
-            vol_chart_dict = {
-                'data': [trace.to_plotly_json() for trace in vol_chart.data],
-                'layout': vol_chart.layout.to_plotly_json()
-            }
-            residuals_chart_dict = {
-                'data': [trace.to_plotly_json() for trace in residuals_chart.data],
-                'layout': residuals_chart.layout.to_plotly_json()
-            }
-            
-            return VolatilityResponse(
-                historical_data=hist_vol_list,
-                forecast_data=garch_forecast_list,
-                ensemble_forecast=ensemble_forecast_list,
-                dates=dates_list,
-                forecast_dates=forecast_dates_list,
-                model_weights=ensemble.get_model_weights(),
-                volatility_chart=vol_chart_dict,
-                residuals_chart=residuals_chart_dict
-            )
-            
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail="An error occurred while processing the request. Please try again later."
-            )
+        if result is None:
+            result = await _forecast_result(hist_data, request, result_key)
+        if media_type != JSON:
+            forecast = _binary_response(result, request, media_type)
+            forecast.headers.update(_cache_headers(etag))
+            return forecast
+        response.headers.update(_cache_headers(etag))
+        return _json_response(result, request)
             
     except HTTPException:
         raise
@@ -165,6 +400,99 @@ async def get_volatility_forecast(request: VolatilityRequest):
             detail="An unexpected error occurred. Please try again later."
         )
 
+def _download_histories(tickers: List[str],
+                        start_date: datetime,
+                        end_date: datetime) -> Dict[str, pd.DataFrame]:
+    """Load daily OHLC bars for several tickers with one provider call."""
+    return get_price_store().get_many(tickers, start_date, end_date)
+
+@router.post("/forecast/batch")
+async def get_volatility_forecast_batch(batch: BatchVolatilityRequest, http_request: Request):
+    """
+    Forecast several tickers in one request.
+
+    Prices for all tickers are fetched in one download, the models run
+    concurrently on the batch pool (worker processes on multi-core hosts),
+    and each result is streamed back as an
+    NDJSON line as soon as it finishes. Lines carry the request ``index`` and
+    either a ``result`` or an error ``detail`` with its HTTP ``status``.
+    With ``Accept: application/msgpack`` the lines are concatenated
+    MessagePack maps instead, with binary series as in the single endpoint.
+    """
+    media_type = _negotiate(http_request, (NDJSON, MSGPACK))
+    windows = [_history_window(request) for request in batch.requests]
+    tickers = list(dict.fromkeys(request.ticker for request in batch.requests))
+    
+    fetch_error: Optional[StageTimeoutError] = None
+    try:
+        with timed('fetch'):
+            histories = await run_in_pool(
+                FETCH_STAGE,
+                _download_histories,
+                tickers,
+                min(start for start, _ in windows),
+                max(end for _, end in windows)
+            )
+    except StageTimeoutError as e:
+        histories, fetch_error = {}, e
+    except Exception:
+        histories = {}
+    
+    async def forecast_one(index: int, request: VolatilityRequest) -> dict:
+        line = {'index': index, 'ticker': request.ticker}
+        try:
+            if fetch_error is not None:
+                raise _timeout_error(request, fetch_error)
+            hist_data = histories.get(request.ticker)
+            if hist_data is None:
+                hist_data = pd.DataFrame()
+            else:
+                hist_data = hist_data.loc[windows[index][0]:]
+            _validate_history(hist_data, request)
+            result = await _forecast_result(hist_data, request, _result_key(hist_data, request),
+                                            BATCH_STAGE)
+            if media_type == MSGPACK:
+                payload = msgpack_payload(result, request.response_fields())
+            else:
+                payload = _json_response(result, request).model_dump(exclude_unset=True)
+            line.update(status=200, result=payload)
+        except HTTPException as e:
+            line.update(status=e.status_code, detail=e.detail)
+        except Exception:
+            line.update(status=500, detail="An unexpected error occurred. Please try again later.")
+        return line
+    
+    async def stream_results():
+        tasks = [
+            asyncio.ensure_future(forecast_one(index, request))
+            for index, request in enumerate(batch.requests)
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                line = await next_result
+                if media_type == MSGPACK:
+                    yield encode_msgpack(line)
+                else:
+                    yield json.dumps(line) + '\n'
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(stream_results(), media_type=media_type)
+
+app.include_router(router, prefix="/api/v1/volatility")
+app.include_router(router, prefix="/api/volatility")
+# The former standalone app's / and /forecast routes
+app.include_router(legacy_router)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Stage duration histograms in the Prometheus text exposition format."""
+    return PlainTextResponse(
+        get_registry().render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
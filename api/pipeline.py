@@ -0,0 +1,143 @@
+"""
+Per-ticker forecast pipeline.
+
+``compute_forecast`` fits the models on one ticker's price history and
+builds every response field; ``history_window`` gives the price history a
+historical window needs. The forecast endpoints (``api.main``) and the
+nightly snapshot build (``api.snapshots``) both run forecasts through here.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from volatility.garch_store import get_garch_store
+from volatility.instrumentation import timed
+from volatility.models import (
+    calculate_historical_volatility,
+    VolatilityEnsemble
+)
+from volatility.series import CompactFrame, CompactSeries
+
+def history_window(historical_window: int) -> Tuple[datetime, datetime]:
+    """Return the (start, end) dates of price history needed for a historical window."""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=historical_window * 2)  # Extra data for better modeling
+    return start_date, end_date
+
+def compute_forecast(hist_data: pd.DataFrame,
+                     ticker: str,
+                     historical_window: int = 30,
+                     forecast_horizon: int = 5,
+                     forecast_horizons: Optional[Sequence[int]] = None,
+                     confidence_level: float = 0.95,
+                     include_charts: bool = False) -> dict:
+    """
+    Fit the models and build every response field.
+
+    Args:
+        hist_data: Daily OHLC bars of the ticker
+        ticker: Ticker the bars belong to; with the window, keys its stored GARCH model
+        historical_window: Window of the historical and range estimators
+        forecast_horizon: Number of forecast days
+        forecast_horizons: Horizons of the term structure, if one is wanted
+        confidence_level: Confidence level of the chart's forecast bands
+        include_charts: Whether to build the Plotly charts
+
+    Returns:
+        Response fields, with series as float64 and dates as datetime64[D] arrays
+    """
+    # The models run on compact arrays; pandas is only rebuilt for charts
+    prices = CompactSeries.from_pandas(hist_data['Close'])
+    ohlc_data = CompactFrame.from_pandas(hist_data, ['Open', 'High', 'Low', 'Close'])
+
+    # Initialize ensemble model
+    ensemble = VolatilityEnsemble(
+        historical_window=historical_window,
+        forecast_horizon=forecast_horizon
+    )
+
+    # Extend or warm-start the stored GARCH model of this ticker and window
+    # instead of a cold fit
+    garch_fit = get_garch_store().fit(ticker, prices, window=historical_window)
+
+    # Fit ensemble and generate forecasts
+    ensemble.fit(prices, ohlc_data, garch_fit=garch_fit)
+    ensemble_forecast = ensemble.predict()
+
+    # Reuse the ensemble's GARCH fit instead of refitting
+    garch_forecast = ensemble.get_model_forecasts()['garch']
+
+    # Calculate historical volatility
+    hist_vol = calculate_historical_volatility(prices, historical_window)
+
+    # Keep series as float64 and dates as datetime64[D] arrays; api.encoding
+    # converts them for the negotiated response format
+    result = dict(
+        historical_data=hist_vol.fillna(0).to_numpy(dtype=np.float64),  # Replace NaN with 0 for serialization
+        forecast_data=garch_forecast.fillna(0).to_numpy(dtype=np.float64),
+        ensemble_forecast=ensemble_forecast.fillna(0).to_numpy(dtype=np.float64),
+        dates=hist_vol.dates,
+        forecast_dates=ensemble_forecast.dates,
+        model_weights={name: float(weight) for name, weight in ensemble.get_model_weights().items()}
+    )
+
+    # Every horizon comes from the same GARCH fit and the flat EWMA and range levels
+    if forecast_horizons:
+        terms = ensemble.term_structure(forecast_horizons)
+        ensemble_terms = terms.pop('ensemble')
+        result['term_structure'] = dict(
+            horizons=list(forecast_horizons),
+            models={name: values.tolist() for name, values in terms.items()},
+            ensemble=ensemble_terms.tolist()
+        )
+
+    if include_charts:
+        result.update(_build_charts(
+            hist_vol.to_pandas(), garch_forecast.to_pandas(), ensemble_forecast.to_pandas(),
+            result['model_weights'], ticker, confidence_level
+        ))
+
+    return result
+
+@timed('charts')
+def _build_charts(hist_vol: pd.Series,
+                  garch_forecast: pd.Series,
+                  ensemble_forecast: pd.Series,
+                  model_weights: Dict[str, float],
+                  ticker: str,
+                  confidence_level: float) -> dict:
+    """Build both Plotly charts as JSON-serializable dicts."""
+    # Imported here so numeric-only requests never load plotly
+    from volatility.visualization import create_volatility_chart, plot_model_residuals
+
+    # Create visualization
+    vol_chart = create_volatility_chart(
+        historical_data=hist_vol,
+        forecast_data=garch_forecast,
+        ensemble_forecast=ensemble_forecast,
+        model_weights=model_weights,
+        title=f"{ticker} Volatility Forecast",
+        show_confidence_intervals=True,
+        confidence_level=confidence_level
+    )
+
+    # Create residuals analysis
+    residuals_chart = plot_model_residuals(
+        historical_data=hist_vol,
+        forecast_data=garch_forecast,
+        ensemble_forecast=ensemble_forecast
+    )
+
+    # Convert chart data to JSON-serializable format
+    return dict(
+        volatility_chart={
+            'data': [trace.to_plotly_json() for trace in vol_chart.data],
+            'layout': vol_chart.layout.to_plotly_json()
+        },
+        residuals_chart={
+            'data': [trace.to_plotly_json() for trace in residuals_chart.data],
+            'layout': residuals_chart.layout.to_plotly_json()
+        }
+    )
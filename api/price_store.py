@@ -0,0 +1,334 @@
+"""
+Per-ticker daily price history cache with incremental top-up.
+
+Bars are kept in an in-memory LRU and, when a cache directory is configured,
+on disk as Parquet (one file per ticker). On a hit only the bars since the
+last stored date are requested from the provider. Tickers name the cache
+files, so only ``TICKER_PATTERN`` symbols are accepted.
+"""
+import json
+import os
+import re
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+class PriceProvider:
+    """Source of daily OHLC bars."""
+
+    def fetch(self, ticker: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """Return daily bars for one ticker between start and end."""
+        raise NotImplementedError
+
+    def fetch_many(self,
+                   tickers: List[str],
+                   start: datetime,
+                   end: datetime) -> Dict[str, pd.DataFrame]:
+        """Return daily bars for several tickers, keyed by ticker."""
+        return {ticker: self.fetch(ticker, start, end) for ticker in tickers}
+
+class YahooPriceProvider(PriceProvider):
+    """Price provider backed by ``yfinance.download``."""
+
+    def fetch(self, ticker: str, start: datetime, end: datetime) -> pd.DataFrame:
+        import yfinance as yf  # Deferred to keep API cold starts fast
+
+        data = yf.download(ticker, start=start, end=end, progress=False)
+        return normalize_bars(data, ticker)
+
+    def fetch_many(self,
+                   tickers: List[str],
+                   start: datetime,
+                   end: datetime) -> Dict[str, pd.DataFrame]:
+        if len(tickers) == 1:
+            return {tickers[0]: self.fetch(tickers[0], start, end)}
+        import yfinance as yf  # Deferred to keep API cold starts fast
+
+        data = yf.download(tickers, start=start, end=end, progress=False, group_by='ticker')
+        return {ticker: normalize_bars(data, ticker) for ticker in tickers}
+
+# Exchange symbols, indices (^GSPC), futures (ES=F) and share classes (BRK-B, BF.B)
+TICKER_PATTERN = re.compile(r'[A-Z0-9.^=-]{1,10}')
+
+def validate_ticker(ticker: str) -> str:
+    """
+    Check that a ticker is a plain symbol, safe to use as a file name.
+
+    Args:
+        ticker: Upper-case ticker symbol
+
+    Returns:
+        The ticker, unchanged
+    """
+    if not isinstance(ticker, str) or not TICKER_PATTERN.fullmatch(ticker):
+        raise ValueError(f"Invalid ticker symbol: {ticker!r}")
+    return ticker
+
+def _empty_bars() -> pd.DataFrame:
+    return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([]), dtype=float)
+
+def normalize_bars(data: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """
+    Reduce a provider frame to flat OHLCV columns for one ticker.
+
+    Handles the (field, ticker) and (ticker, field) column layouts that
+    ``yfinance`` returns for single and grouped downloads.
+    """
+    if isinstance(data.columns, pd.MultiIndex):
+        for level in range(data.columns.nlevels):
+            if ticker in data.columns.get_level_values(level):
+                data = data.xs(ticker, axis=1, level=level)
+                break
+        else:
+            return _empty_bars()
+
+    columns = [column for column in OHLCV_COLUMNS if column in data.columns]
+    bars = data[columns]
+    if 'Close' in bars.columns:
+        bars = bars.dropna(subset=['Close'])
+    if isinstance(bars.index, pd.DatetimeIndex) and bars.index.tz is not None:
+        bars = bars.tz_localize(None)
+    return bars.sort_index()
+
+class _Entry:
+    """Cached bars for one ticker."""
+
+    __slots__ = ('bars', 'covered_from', 'fetched_at')
+
+    def __init__(self, bars: pd.DataFrame, covered_from: pd.Timestamp, fetched_at: float):
+        self.bars = bars
+        self.covered_from = covered_from
+        self.fetched_at = fetched_at
+
+class PriceStore:
+    """
+    Two-tier cache of daily bars in front of a PriceProvider.
+
+    Args:
+        provider: Where missing bars come from (Yahoo Finance by default)
+        cache_dir: Directory for Parquet files; memory-only when None
+        max_entries: Tickers kept in the in-memory LRU
+        ttl: Seconds before a cached ticker is topped up from the provider
+        disk_max_age: Seconds before an on-disk file is evicted
+    """
+
+    def __init__(self,
+                 provider: Optional[PriceProvider] = None,
+                 cache_dir: Optional[str] = None,
+                 max_entries: int = 256,
+                 ttl: float = 300.0,
+                 disk_max_age: float = 7 * 24 * 3600.0):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.provider = provider if provider is not None else YahooPriceProvider()
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_max_age = disk_max_age
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'topups': 0, 'evictions': 0}
+
+        if cache_dir is not None:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                warnings.warn("pyarrow is not installed; price cache is memory-only")
+                self.cache_dir = None
+            else:
+                os.makedirs(cache_dir, exist_ok=True)
+
+    def get_history(self, ticker: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """Return daily bars for ticker from start to end, fetching only what is missing."""
+        return self.get_many([ticker], start, end)[ticker]
+
+    def get_many(self,
+                 tickers: Iterable[str],
+                 start: datetime,
+                 end: datetime) -> Dict[str, pd.DataFrame]:
+        """
+        Return daily bars for several tickers.
+
+        Tickers that are missing or do not cover ``start`` are fetched in one
+        ``fetch_many`` call; stale tickers are topped up from their last bar.
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        tickers = [validate_ticker(ticker) for ticker in dict.fromkeys(tickers)]
+        now = time.time()
+        entries: Dict[str, _Entry] = {}
+        missing: List[str] = []
+        stale: List[str] = []
+
+        for ticker in tickers:
+            entry, from_disk = self._lookup(ticker)
+            if entry is None or start < entry.covered_from:
+                missing.append(ticker)
+            else:
+                self._count('disk_hits' if from_disk else 'hits')
+                entries[ticker] = entry
+                if now - entry.fetched_at > self.ttl:
+                    stale.append(ticker)
+
+        if missing:
+            self._count('misses', len(missing))
+            fetched = self.provider.fetch_many(missing, start.to_pydatetime(), end.to_pydatetime())
+            for ticker in missing:
+                bars = fetched.get(ticker)
+                if bars is None or bars.empty:
+                    entries[ticker] = _Entry(_empty_bars(), start, now)
+                    continue
+                entries[ticker] = self._store(ticker, _Entry(bars, start, now))
+
+        for ticker in stale:
+            entries[ticker] = self._top_up(ticker, entries[ticker], end, now)
+
+        return {ticker: entries[ticker].bars.loc[start:end] for ticker in tickers}
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of tickers in memory."""
+        with self._lock:
+            return dict(self._counters, entries=len(self._entries))
+
+    def clear(self) -> None:
+        """Drop the in-memory tier and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def evict_expired(self) -> int:
+        """Delete on-disk files older than disk_max_age; returns the number removed."""
+        if self.cache_dir is None:
+            return 0
+        removed = 0
+        cutoff = time.time() - self.disk_max_age
+        for name in os.listdir(self.cache_dir):
+            ticker = name[:-len('.json')]
+            if not name.endswith('.json') or not TICKER_PATTERN.fullmatch(ticker):
+                continue
+            meta = self._read_meta(ticker)
+            if meta is None or meta['fetched_at'] < cutoff:
+                self._remove_files(ticker)
+                removed += 1
+        self._count('evictions', removed)
+        return removed
+
+    def _top_up(self, ticker: str, entry: _Entry, end: pd.Timestamp, now: float) -> _Entry:
+        """Fetch bars from the last stored date onwards and merge them in."""
+        self._count('topups')
+        last_date = entry.bars.index[-1]
+        try:
+            new_bars = self.provider.fetch(ticker, last_date.to_pydatetime(), end.to_pydatetime())
+        except Exception:
+            # Serve the stale bars rather than failing the request
+            return entry
+
+        if new_bars.empty:
+            return self._store(ticker, _Entry(entry.bars, entry.covered_from, now))
+
+        # The last stored bar is re-fetched too, in case it was an intraday partial
+        bars = pd.concat([entry.bars, new_bars.loc[last_date:]])
+        bars = bars[~bars.index.duplicated(keep='last')].sort_index()
+        return self._store(ticker, _Entry(bars, entry.covered_from, now))
+
+    def _lookup(self, ticker: str) -> Tuple[Optional[_Entry], bool]:
+        """Return the cached entry and whether it came from disk."""
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is not None:
+                self._entries.move_to_end(ticker)
+                return entry, False
+
+        entry = self._load(ticker)
+        if entry is not None:
+            self._remember(ticker, entry)
+        return entry, entry is not None
+
+    def _store(self, ticker: str, entry: _Entry) -> _Entry:
+        self._remember(ticker, entry)
+        self._save(ticker, entry)
+        return entry
+
+    def _remember(self, ticker: str, entry: _Entry) -> None:
+        with self._lock:
+            self._entries[ticker] = entry
+            self._entries.move_to_end(ticker)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def _path(self, ticker: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, f"{validate_ticker(ticker)}{suffix}")
+
+    def _read_meta(self, ticker: str) -> Optional[dict]:
+        try:
+            with open(self._path(ticker, '.json'), 'r', encoding='utf-8') as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def _load(self, ticker: str) -> Optional[_Entry]:
+        if self.cache_dir is None:
+            return None
+        meta = self._read_meta(ticker)
+        if meta is None or time.time() - meta['fetched_at'] > self.disk_max_age:
+            return None
+        try:
+            bars = pd.read_parquet(self._path(ticker, '.parquet'))
+        except (OSError, ValueError):
+            return None
+        return _Entry(bars, pd.Timestamp(meta['covered_from']), meta['fetched_at'])
+
+    def _save(self, ticker: str, entry: _Entry) -> None:
+        if self.cache_dir is None:
+            return
+        # Both files are written aside and swapped in whole, bars first, so a
+        # reader or a crash never leaves metadata next to partial bars
+        parquet_path = self._path(ticker, '.parquet')
+        tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        entry.bars.to_parquet(parquet_path + tmp_suffix)
+        os.replace(parquet_path + tmp_suffix, parquet_path)
+        meta = {'covered_from': entry.covered_from.isoformat(), 'fetched_at': entry.fetched_at}
+        meta_path = self._path(ticker, '.json')
+        with open(meta_path + tmp_suffix, 'w', encoding='utf-8') as fh:
+            json.dump(meta, fh)
+        os.replace(meta_path + tmp_suffix, meta_path)
+
+    def _remove_files(self, ticker: str) -> None:
+        for suffix in ('.json', '.parquet'):
+            try:
+                os.remove(self._path(ticker, suffix))
+            except FileNotFoundError:
+                pass
+
+_default_store: Optional[PriceStore] = None
+_default_lock = threading.Lock()
+
+def get_price_store() -> PriceStore:
+    """Return the process-wide price store, configured from the environment."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = PriceStore(
+                cache_dir=os.getenv('VOLATILITY_PRICE_CACHE_DIR') or None,
+                max_entries=int(os.getenv('VOLATILITY_PRICE_CACHE_SIZE', '256')),
+                ttl=float(os.getenv('VOLATILITY_PRICE_CACHE_TTL', '300')),
+            )
+        return _default_store
+
+def set_price_store(store: Optional[PriceStore]) -> None:
+    """Replace the process-wide price store; None recreates it from the environment."""
+    global _default_store
+    with _default_lock:
+        _default_store = store
@@ -0,0 +1,196 @@
+"""
+Cache of computed forecast results.
+
+For a given trading day a forecast is a pure function of the request
+parameters and the last price bar, so results are keyed on exactly those
+inputs. A new (or revised) bar changes the key, which invalidates old entries
+without any explicit purge.
+"""
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+def make_cache_key(ticker: str,
+                   historical_window: int,
+                   forecast_horizon: int,
+                   confidence_level: float,
+                   history: pd.DataFrame,
+                   **variant: Any) -> str:
+    """
+    Build a result cache key from the request inputs and the last price bar.
+
+    Args:
+        history: Price bars the forecast is computed from
+        **variant: Extra inputs that change the result (e.g. whether charts
+            are built)
+
+    Returns:
+        Hex digest identifying the result
+    """
+    last_bar = history.iloc[-1]
+    payload = {
+        'ticker': ticker,
+        'historical_window': historical_window,
+        'forecast_horizon': forecast_horizon,
+        'confidence_level': confidence_level,
+        'first_bar_date': history.index[0].isoformat(),
+        'last_bar_date': history.index[-1].isoformat(),
+        # Catches intraday revisions of the latest bar
+        'last_close': repr(float(last_bar['Close'])),
+        'bars': len(history),
+        **variant
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+class ResultCache:
+    """Interface for result cache backends."""
+
+    def __init__(self):
+        self._counters = {'hits': 0, 'misses': 0}
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None."""
+        value = self._get(key)
+        with self._counter_lock:
+            self._counters['hits' if value is not None else 'misses'] += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a result under key."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Remove all results and reset counters."""
+        with self._counter_lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters."""
+        with self._counter_lock:
+            return dict(self._counters)
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+class MemoryResultCache(ResultCache):
+    """In-process LRU of results."""
+
+    def __init__(self, max_entries: int = 512):
+        super().__init__()
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        super().clear()
+
+class DiskResultCache(ResultCache):
+    """
+    Results pickled to a directory, shareable between worker processes.
+
+    Args:
+        cache_dir: Directory holding one file per key
+        max_age: Seconds after which an entry is treated as missing and removed
+    """
+
+    def __init__(self, cache_dir: str, max_age: float = 24 * 3600.0):
+        super().__init__()
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                return None
+            with open(path, 'rb') as fh:
+                return pickle.load(fh)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as fh:
+            pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+
+    def clear(self) -> None:
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(self.cache_dir, name))
+        super().clear()
+
+class NullResultCache(ResultCache):
+    """Backend that never stores anything, for disabling the cache."""
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        pass
+
+_default_cache: Optional[ResultCache] = None
+_default_lock = threading.Lock()
+
+def get_result_cache() -> ResultCache:
+    """
+    Return the process-wide result cache.
+
+    The backend is chosen by VOLATILITY_RESULT_CACHE: ``memory`` (default),
+    ``disk`` (in VOLATILITY_RESULT_CACHE_DIR) or ``none``.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            backend = os.getenv('VOLATILITY_RESULT_CACHE', 'memory')
+            if backend == 'memory':
+                _default_cache = MemoryResultCache(
+                    max_entries=int(os.getenv('VOLATILITY_RESULT_CACHE_SIZE', '512'))
+                )
+            elif backend == 'disk':
+                _default_cache = DiskResultCache(
+                    os.getenv('VOLATILITY_RESULT_CACHE_DIR', '.volatility-cache/results')
+                )
+            elif backend == 'none':
+                _default_cache = NullResultCache()
+            else:
+                raise ValueError(f"Unknown result cache backend: {backend}")
+        return _default_cache
+
+def set_result_cache(cache: Optional[ResultCache]) -> None:
+    """Replace the process-wide result cache; None recreates it from the environment."""
+    global _default_cache
+    with _default_lock:
+        _default_cache = cache
@@ -0,0 +1,80 @@
+"""
+Coalescing of concurrent identical calls.
+
+``SingleFlight.do`` runs a coroutine for a key unless a call with that key is
+already in flight, in which case the caller awaits the running call and gets
+its result (or exception). Nothing is kept once a call finishes; caching
+finished results is the job of the price store and result cache.
+
+The shared call runs as its own task and callers await it through
+``asyncio.shield``, so a client that disconnects does not cancel the work
+the other callers are waiting for.
+"""
+import asyncio
+import functools
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, TypeVar
+
+T = TypeVar('T')
+
+class _Flight(NamedTuple):
+    task: 'asyncio.Future[Any]'
+    meta: Any
+
+class SingleFlight:
+    """Deduplicates concurrent async calls by key."""
+
+    def __init__(self):
+        # In-flight calls per event loop; a task only belongs to its own loop
+        self._flights: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, _Flight]]' = (
+            weakref.WeakKeyDictionary()
+        )
+        self._counters = {'calls': 0, 'shared': 0}
+
+    async def do(self,
+                 key: Hashable,
+                 fn: Callable[[], Awaitable[T]],
+                 meta: Any = None,
+                 joinable: Optional[Callable[[Any], bool]] = None) -> T:
+        """
+        Await fn() or an in-flight call with the same key.
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument coroutine function producing the result
+            meta: Kept with this call for later callers' ``joinable`` checks
+            joinable: Given the in-flight call's meta, whether its result
+                serves this caller; if not, this caller runs fn() and later
+                callers join its call instead
+
+        Returns:
+            The result of this or the joined call
+        """
+        flights = self._flights.setdefault(asyncio.get_running_loop(), {})
+        flight = flights.get(key)
+        if flight is not None and (joinable is None or joinable(flight.meta)):
+            self._counters['shared'] += 1
+            return await asyncio.shield(flight.task)
+
+        task = asyncio.ensure_future(fn())
+        flights[key] = _Flight(task, meta)
+        task.add_done_callback(functools.partial(self._finish, flights, key))
+        self._counters['calls'] += 1
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _finish(flights: Dict[Hashable, _Flight], key: Hashable, task: 'asyncio.Future[Any]') -> None:
+        flight = flights.get(key)
+        if flight is not None and flight.task is task:
+            del flights[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller went away
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Number of calls currently running across event loops."""
+        return sum(len(flights) for flights in list(self._flights.values()))
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many calls ran and how many callers joined one."""
+        return dict(self._counters)
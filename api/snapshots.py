@@ -0,0 +1,293 @@
+"""
+Precomputed end-of-day forecast snapshots.
+
+A nightly job (``build_snapshot``, or ``scripts/build_snapshot.py``) forecasts
+a configured universe after the close and writes every ticker's numeric
+response fields to one file with a fixed layout:
+
+- an 8-byte magic and a little-endian uint32 header length;
+- a JSON header with the build parameters, the model names and the tickers
+  in row order, padded to a 64-byte boundary;
+- one fixed-size record per ticker (see ``record_dtype``): the historical
+  volatility and its dates padded to the longest history, the GARCH and
+  ensemble forecasts, their dates and the model weights.
+
+``SnapshotStore`` memory-maps the records, so a lookup returns views into
+the map and copies nothing. The forecast endpoint serves a snapshot when the
+request's window and horizon match it and no charts are asked for, and
+computes live otherwise. A rebuild replaces the file atomically; open stores
+switch to it on their next lookup.
+"""
+import json
+import math
+import os
+import struct
+import threading
+import time
+import warnings
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from volatility.instrumentation import timed
+
+from api.pipeline import compute_forecast, history_window
+from api.price_store import get_price_store
+
+MAGIC = b'VOLSNAP1'
+VERSION = 1
+
+_PREFIX = struct.Struct('<8sI')
+_ALIGNMENT = 64
+
+def record_dtype(history_length: int, forecast_horizon: int, n_models: int) -> np.dtype:
+    """
+    Structured dtype of one ticker's record.
+
+    Args:
+        history_length: Slots for historical volatility; shorter histories
+            fill the first ``n_history`` slots
+        forecast_horizon: Forecast steps
+        n_models: Number of model weights, in the header's model order
+    """
+    return np.dtype([
+        ('n_history', '<i8'),
+        ('historical_data', '<f8', (history_length,)),
+        ('dates', '<M8[D]', (history_length,)),
+        ('forecast_data', '<f8', (forecast_horizon,)),
+        ('ensemble_forecast', '<f8', (forecast_horizon,)),
+        ('forecast_dates', '<M8[D]', (forecast_horizon,)),
+        ('model_weights', '<f8', (n_models,)),
+    ])
+
+def _records_offset(header_length: int) -> int:
+    end = _PREFIX.size + header_length
+    return -(-end // _ALIGNMENT) * _ALIGNMENT
+
+def write_snapshot(path: str,
+                   results: Dict[str, Dict[str, Any]],
+                   historical_window: int,
+                   forecast_horizon: int,
+                   built_at: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Write computed forecast results to a snapshot file.
+
+    The file is written next to ``path`` and moved over it, so readers never
+    see a partial snapshot.
+
+    Args:
+        path: Snapshot file to create or replace
+        results: Computed results (as ``api.pipeline.compute_forecast`` returns
+            them, without charts) keyed by ticker
+        historical_window: Window the results were computed with
+        forecast_horizon: Horizon the results were computed with
+        built_at: Build time as a Unix timestamp; defaults to now
+
+    Returns:
+        The snapshot header
+    """
+    if not results:
+        raise ValueError("A snapshot needs at least one result")
+    tickers = sorted(results)
+    models = sorted({name for result in results.values() for name in result['model_weights']})
+    history_length = max(len(result['historical_data']) for result in results.values())
+
+    records = np.zeros(len(tickers), dtype=record_dtype(history_length, forecast_horizon, len(models)))
+    records['dates'] = np.datetime64('NaT')
+    for row, ticker in enumerate(tickers):
+        result = results[ticker]
+        if len(result['forecast_data']) != forecast_horizon:
+            raise ValueError(f"Forecast for {ticker} does not cover {forecast_horizon} steps")
+        n_history = len(result['historical_data'])
+        records['n_history'][row] = n_history
+        records['historical_data'][row, :n_history] = result['historical_data']
+        records['dates'][row, :n_history] = result['dates']
+        for field in ('forecast_data', 'ensemble_forecast', 'forecast_dates'):
+            records[field][row] = result[field]
+        records['model_weights'][row] = [result['model_weights'].get(name, np.nan) for name in models]
+
+    last_dates = [result['dates'][-1] for result in results.values() if len(result['dates'])]
+    header = {
+        'version': VERSION,
+        'built_at': time.time() if built_at is None else built_at,
+        'as_of': str(max(last_dates)) if last_dates else None,
+        'historical_window': historical_window,
+        'forecast_horizon': forecast_horizon,
+        'history_length': history_length,
+        'models': models,
+        'tickers': tickers
+    }
+    encoded = json.dumps(header).encode('utf-8')
+    offset = _records_offset(len(encoded))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as fh:
+        fh.write(_PREFIX.pack(MAGIC, len(encoded)))
+        fh.write(encoded)
+        fh.write(b'\0' * (offset - _PREFIX.size - len(encoded)))
+        fh.write(records.tobytes())
+    os.replace(tmp_path, path)
+    return header
+
+@timed('snapshot_build')
+def build_snapshot(tickers: Iterable[str],
+                   path: str,
+                   historical_window: int = 30,
+                   forecast_horizon: int = 5) -> Dict[str, Any]:
+    """
+    Forecast a universe and write the results to a snapshot file.
+
+    Prices come from the process-wide price store in one ``get_many`` call
+    and each ticker runs the same pipeline as a live request
+    (``api.pipeline.compute_forecast``). Tickers without enough data or
+    whose models fail are left out with a warning.
+
+    Args:
+        tickers: Universe to precompute
+        path: Snapshot file to create or replace
+        historical_window: Historical window of the served requests
+        forecast_horizon: Forecast horizon of the served requests
+
+    Returns:
+        The snapshot header
+    """
+    tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+    if not tickers:
+        raise ValueError("The snapshot universe is empty")
+    start_date, end_date = history_window(historical_window)
+    histories = get_price_store().get_many(tickers, start_date, end_date)
+
+    results = {}
+    for ticker in tickers:
+        hist_data = histories.get(ticker)
+        if hist_data is None or len(hist_data) < historical_window:
+            warnings.warn(f"Snapshot skips {ticker}: insufficient price history")
+            continue
+        try:
+            results[ticker] = compute_forecast(hist_data, ticker, historical_window, forecast_horizon)
+        except Exception as e:
+            warnings.warn(f"Snapshot skips {ticker}: {e}")
+    return write_snapshot(path, results, historical_window, forecast_horizon)
+
+class SnapshotStore:
+    """
+    Zero-copy reader of a snapshot file.
+
+    Args:
+        path: Snapshot file; it may be missing until the first build
+        max_age: Seconds after its build during which a snapshot is served
+    """
+
+    def __init__(self, path: str, max_age: float = 24 * 3600.0):
+        self.path = path
+        self.max_age = max_age
+        self.header: Optional[Dict[str, Any]] = None
+        self._records: Optional[np.memmap] = None
+        self._rows: Dict[str, int] = {}
+        self._file_id: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0}
+
+    def _refresh(self) -> None:
+        """Map the file again if it was replaced since the last lookup."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.header, self._records, self._rows, self._file_id = None, None, {}, None
+            return
+        file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if file_id == self._file_id:
+            return
+
+        with open(self.path, 'rb') as fh:
+            magic, header_length = _PREFIX.unpack(fh.read(_PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a volatility snapshot")
+            header = json.loads(fh.read(header_length))
+        if header['version'] != VERSION:
+            raise ValueError(f"Unsupported snapshot version {header['version']}")
+
+        dtype = record_dtype(header['history_length'], header['forecast_horizon'], len(header['models']))
+        # Mapping the old file stays valid after it is replaced, so views
+        # handed out earlier remain readable
+        self._records = np.memmap(self.path, dtype=dtype, mode='r',
+                                  offset=_records_offset(header_length),
+                                  shape=(len(header['tickers']),))
+        self.header = header
+        self._rows = {ticker: row for row, ticker in enumerate(header['tickers'])}
+        self._file_id = file_id
+
+    def lookup(self,
+               ticker: str,
+               historical_window: int,
+               forecast_horizon: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Return a ticker's precomputed result if the snapshot can serve it.
+
+        Args:
+            ticker: Upper-case ticker
+            historical_window: Requested historical window
+            forecast_horizon: Requested forecast horizon
+
+        Returns:
+            (result key, result) with the series and dates as read-only views
+            into the snapshot, or None when the snapshot is missing, stale,
+            built with other parameters or lacks the ticker
+        """
+        with self._lock:
+            self._refresh()
+            header, records, row = self.header, self._records, self._rows.get(ticker)
+
+        if (row is None
+                or header['historical_window'] != historical_window
+                or header['forecast_horizon'] != forecast_horizon
+                or time.time() - header['built_at'] > self.max_age):
+            self._count('misses')
+            return None
+
+        n_history = int(records['n_history'][row])
+        weights = records['model_weights'][row]
+        result = {
+            'historical_data': records['historical_data'][row, :n_history],
+            'dates': records['dates'][row, :n_history],
+            'forecast_data': records['forecast_data'][row],
+            'ensemble_forecast': records['ensemble_forecast'][row],
+            'forecast_dates': records['forecast_dates'][row],
+            'model_weights': {
+                name: float(weight) for name, weight in zip(header['models'], weights.tolist())
+                if not math.isnan(weight)
+            }
+        }
+        self._count('hits')
+        return f"snapshot:{header['built_at']!r}:{ticker}", result
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of tickers in the snapshot."""
+        with self._lock:
+            return dict(self._counters, tickers=len(self._rows))
+
+_UNSET: Any = object()
+_default_store: Optional[SnapshotStore] = _UNSET
+_default_lock = threading.Lock()
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Return the process-wide snapshot store, or None when VOLATILITY_SNAPSHOT_PATH is unset."""
+    global _default_store
+    with _default_lock:
+        if _default_store is _UNSET:
+            path = os.getenv('VOLATILITY_SNAPSHOT_PATH')
+            _default_store = SnapshotStore(
+                path,
+                max_age=float(os.getenv('VOLATILITY_SNAPSHOT_MAX_AGE', str(24 * 3600)))
+            ) if path else None
+        return _default_store
+
+def set_snapshot_store(store: Optional[SnapshotStore]) -> None:
+    """Replace the process-wide snapshot store; None reconfigures it from the environment."""
+    global _default_store
+    with _default_lock:
+        _default_store = _UNSET if store is None else store
@@ -0,0 +1,53 @@
+"""
+Precompute end-of-day volatility forecasts for a universe of tickers.
+
+Usage:
+    python scripts/build_snapshot.py [TICKER ...] [--universe FILE] [--output PATH]
+                                     [--historical-window N] [--forecast-horizon N]
+
+Meant to run once after the close (e.g. from cron). The universe is the
+tickers given on the command line plus those listed one per line in
+--universe; the snapshot is written to --output, which defaults to
+VOLATILITY_SNAPSHOT_PATH so the API picks it up.
+"""
+import argparse
+import os
+import sys
+from typing import List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from api.snapshots import build_snapshot  # noqa: E402
+
+def read_universe(path: str) -> List[str]:
+    """Read tickers from a file, one per line; blank lines and # comments are ignored."""
+    with open(path) as fh:
+        lines = (line.split('#', 1)[0].strip() for line in fh)
+        return [line.upper() for line in lines if line]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('tickers', nargs='*', help="Tickers to precompute")
+    parser.add_argument('--universe', help="File with one ticker per line")
+    parser.add_argument('--output', default=os.getenv('VOLATILITY_SNAPSHOT_PATH'),
+                        help="Snapshot file (default: $VOLATILITY_SNAPSHOT_PATH)")
+    parser.add_argument('--historical-window', type=int, default=30)
+    parser.add_argument('--forecast-horizon', type=int, default=5)
+    args = parser.parse_args()
+
+    tickers = [ticker.upper() for ticker in args.tickers]
+    if args.universe:
+        tickers += read_universe(args.universe)
+    if not tickers:
+        parser.error("no tickers given")
+    if not args.output:
+        parser.error("no --output given and VOLATILITY_SNAPSHOT_PATH is unset")
+
+    header = build_snapshot(tickers, args.output, args.historical_window, args.forecast_horizon)
+    print(f"Wrote {len(header['tickers'])} of {len(set(tickers))} tickers "
+          f"as of {header['as_of']} to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
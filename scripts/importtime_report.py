@@ -0,0 +1,97 @@
+"""
+Report where import time goes for a module, using ``python -X importtime``.
+
+Usage:
+    python scripts/importtime_report.py [module] [--top N] [--json] [--budget-ms MS]
+
+Runs the import in a fresh interpreter, prints the slowest imports by
+cumulative time, and exits with status 1 when the total exceeds the budget.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies the API must not load at import time
+HEAVY_MODULES = ['arch', 'plotly', 'scipy', 'sklearn', 'yfinance']
+
+def measure_imports(module: str) -> Dict[str, object]:
+    """
+    Import a module in a fresh interpreter and collect its import timings.
+
+    Args:
+        module: Dotted module name to import
+
+    Returns:
+        Dict with total_ms, the per-package timings (self_ms, cumulative_ms)
+        and which HEAVY_MODULES ended up loaded
+    """
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    imports: List[Dict[str, object]] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        imports.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000
+        })
+
+    # Top-level imports are the ones at the shallowest indentation
+    top_depth = min((entry['depth'] for entry in imports), default=0)
+    total_ms = sum(entry['cumulative_ms'] for entry in imports if entry['depth'] == top_depth)
+    loaded = completed.stdout.strip()
+
+    return {
+        'module': module,
+        'total_ms': round(total_ms, 3),
+        'heavy_modules_loaded': loaded.split(',') if loaded else [],
+        'imports': imports
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('module', nargs='?', default='api.main')
+    parser.add_argument('--top', type=int, default=20, help="Number of imports to list")
+    parser.add_argument('--json', action='store_true', help="Print the full report as JSON")
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help="Fail when the total import time exceeds this")
+    args = parser.parse_args()
+
+    report = measure_imports(args.module)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Import time for {args.module}: {report['total_ms']:.1f} ms")
+        heavy = ', '.join(report['heavy_modules_loaded']) or 'none'
+        print(f"Heavy dependencies loaded: {heavy}")
+        print(f"{'cumulative ms':>14} {'self ms':>10}  module")
+        slowest = sorted(report['imports'], key=lambda entry: entry['cumulative_ms'], reverse=True)
+        for entry in slowest[:args.top]:
+            print(f"{entry['cumulative_ms']:>14.1f} {entry['self_ms']:>10.1f}  {entry['module']}")
+
+    if args.budget_ms is not None and report['total_ms'] > args.budget_ms:
+        print(f"Import budget exceeded: {report['total_ms']:.1f} ms > {args.budget_ms:.1f} ms",
+              file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
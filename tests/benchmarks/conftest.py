@@ -0,0 +1,28 @@
+"""
+Synthetic price fixtures for the benchmarks.
+
+Sizes cover a year (250 bars), a decade (2,500) and a century-scale stress
+case (25,000) of daily bars, for one up to 500 tickers.
+"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from synthetic import make_ohlcv
+
+BAR_SIZES = [250, 2_500, 25_000]
+TICKER_COUNTS = [1, 50, 500]
+
+@pytest.fixture(scope='session', params=BAR_SIZES, ids=lambda n: f"{n}bars")
+def ohlcv(request):
+    return make_ohlcv(request.param)
+
+@pytest.fixture(scope='session')
+def prices(ohlcv):
+    return ohlcv['Close']
+
+@pytest.fixture(scope='session', params=TICKER_COUNTS, ids=lambda n: f"{n}tickers")
+def universe_closes(request):
+    """2,500 bars of closes for a universe of tickers, one column each."""
+    frame = make_ohlcv(2_500, request.param, seed=1)
+    return frame['Close'] if request.param > 1 else frame[['Close']]
@@ -0,0 +1,40 @@
+"""
+Synthetic OHLCV bars for the benchmarks.
+"""
+import numpy as np
+import pandas as pd
+
+def make_ohlcv(n_bars: int, n_tickers: int = 1, seed: int = 0, freq: str = 'B') -> pd.DataFrame:
+    """
+    GARCH(1,1)-like OHLCV bars ending today.
+
+    Returns:
+        One ticker: a DataFrame with Open/High/Low/Close/Volume columns.
+        Several tickers: the same columns under a (field, ticker) MultiIndex.
+    """
+    rng = np.random.default_rng(seed)
+    omega, alpha, beta = 0.02, 0.08, 0.9
+    shocks = rng.standard_normal((n_bars, n_tickers))
+    returns = np.empty((n_bars, n_tickers))
+    variance = np.full(n_tickers, omega / (1 - alpha - beta))
+    for t in range(n_bars):
+        returns[t] = np.sqrt(variance) * shocks[t]
+        variance = omega + alpha * returns[t] ** 2 + beta * variance
+
+    close = 100 * np.exp(np.cumsum(returns / 100, axis=0))
+    open_ = close * np.exp(rng.normal(0, 0.002, close.shape))
+    spread = np.abs(rng.normal(0, 0.005, close.shape))
+    fields = {
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + spread),
+        'Low': np.minimum(open_, close) * (1 - spread),
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 10_000_000, close.shape)
+    }
+    index = pd.date_range(end=pd.Timestamp.today().normalize(), periods=n_bars, freq=freq)
+    if n_tickers == 1:
+        return pd.DataFrame({name: values[:, 0] for name, values in fields.items()}, index=index)
+
+    tickers = [f"T{i:03d}" for i in range(n_tickers)]
+    columns = pd.MultiIndex.from_product([list(fields), tickers])
+    return pd.DataFrame(np.hstack(list(fields.values())), index=index, columns=columns)
@@ -0,0 +1,79 @@
+"""
+Benchmarks of chart building and end-to-end forecast requests.
+
+yfinance.download is mocked, so the numbers cover validation, caching,
+modelling and serialization but no network time.
+"""
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.pipeline import _build_charts
+from api.price_store import PriceStore, set_price_store
+from api.result_cache import NullResultCache, set_result_cache
+from volatility.garch_store import GarchModelStore, set_garch_store
+from volatility.models import VolatilityEnsemble, calculate_historical_volatility
+
+from synthetic import make_ohlcv
+
+# End-to-end sizes; 25,000 bars adds nothing beyond the model benchmarks
+REQUEST_SIZES = [250, 2_500]
+
+client = TestClient(app)
+
+@pytest.fixture(scope='module', params=REQUEST_SIZES, ids=lambda n: f"{n}bars")
+def daily_bars(request):
+    # Calendar-day bars so the request window (2 x historical_window days) spans them all
+    return make_ohlcv(request.param, freq='D')
+
+def _request_body(bars, include_charts=True):
+    return {
+        'ticker': 'SPY',
+        'historical_window': len(bars) // 2,
+        'forecast_horizon': 5,
+        'confidence_level': 0.95,
+        'include_charts': include_charts
+    }
+
+def _reset_caches():
+    set_price_store(PriceStore())
+    set_result_cache(NullResultCache())
+    set_garch_store(GarchModelStore())
+
+def test_build_charts(benchmark, daily_bars):
+    prices = daily_bars['Close']
+    ensemble = VolatilityEnsemble(historical_window=30, forecast_horizon=5)
+    ensemble.fit(prices, daily_bars)
+    hist_vol = calculate_historical_volatility(prices, 30)
+
+    charts = benchmark(
+        _build_charts,
+        hist_vol,
+        ensemble.get_model_forecasts()['garch'],
+        ensemble.predict(),
+        ensemble.get_model_weights(),
+        'SPY',
+        0.95
+    )
+    assert set(charts) == {'volatility_chart', 'residuals_chart'}
+
+@pytest.mark.parametrize('include_charts', [True, False], ids=['charts', 'numeric'])
+def test_forecast_request_cold(benchmark, daily_bars, include_charts):
+    """Every round downloads, fits and serializes from scratch."""
+    body = _request_body(daily_bars, include_charts)
+    with patch('yfinance.download', return_value=daily_bars):
+        response = benchmark.pedantic(
+            client.post, args=('/api/volatility/forecast',), kwargs={'json': body},
+            setup=_reset_caches, rounds=5, iterations=1
+        )
+    assert response.status_code == 200
+
+def test_forecast_request_cached(benchmark, daily_bars):
+    """Repeat requests served from the price and result caches."""
+    body = _request_body(daily_bars)
+    with patch('yfinance.download', return_value=daily_bars):
+        assert client.post('/api/volatility/forecast', json=body).status_code == 200
+        response = benchmark(client.post, '/api/volatility/forecast', json=body)
+    assert response.status_code == 200
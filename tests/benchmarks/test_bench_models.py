@@ -0,0 +1,79 @@
+"""
+Benchmarks of the model hot paths in volatility/models.py and the kernels
+they are built on.
+"""
+import numpy as np
+import pytest
+
+from volatility.estimators import range_volatility_suite
+from volatility.kernels import rolling_volatility
+from volatility.models import (
+    VolatilityEnsemble,
+    calculate_ewma_forecast,
+    calculate_garch_forecast,
+    ewma_variance,
+    fit_garch
+)
+from volatility.series import CompactFrame, CompactSeries
+from volatility.universe import fit_garch_universe
+
+def test_ewma_forecast(benchmark, prices):
+    forecast = benchmark(calculate_ewma_forecast, prices, 5)
+    assert len(forecast) == 5
+
+def test_garch_forecast(benchmark, prices):
+    # arch fits dominate; a few rounds are enough for a stable mean
+    forecast = benchmark.pedantic(calculate_garch_forecast, args=(prices, 5), rounds=3, iterations=1)
+    assert len(forecast) == 5
+
+def test_ensemble_fit(benchmark, ohlcv):
+    def fit():
+        ensemble = VolatilityEnsemble(historical_window=30, forecast_horizon=5)
+        ensemble.fit(ohlcv['Close'], ohlcv)
+        return ensemble
+
+    ensemble = benchmark.pedantic(fit, rounds=3, iterations=1)
+    assert ensemble.is_fitted
+
+@pytest.mark.parametrize('kind', ['pandas', 'compact'])
+def test_ensemble_fit_prefitted(benchmark, ohlcv, kind):
+    """Ensemble fit around a stored GARCH fit, as the API runs it, on pandas or compact input."""
+    prices, bars = ohlcv['Close'], ohlcv
+    if kind == 'compact':
+        prices = CompactSeries.from_pandas(prices)
+        bars = CompactFrame.from_pandas(ohlcv, ['Open', 'High', 'Low', 'Close'])
+    garch_fit = fit_garch(prices)
+
+    def fit():
+        ensemble = VolatilityEnsemble(historical_window=30, forecast_horizon=5)
+        ensemble.fit(prices, bars, garch_fit=garch_fit)
+        return ensemble.predict()
+
+    forecast = benchmark(fit)
+    assert len(forecast) == 5
+
+def test_ensemble_predict(benchmark, ohlcv):
+    ensemble = VolatilityEnsemble(historical_window=30, forecast_horizon=5)
+    ensemble.fit(ohlcv['Close'], ohlcv)
+    forecast = benchmark(ensemble.predict)
+    assert len(forecast) == 5
+
+def test_universe_rolling_volatility(benchmark, universe_closes):
+    closes = universe_closes.to_numpy()
+    volatility = benchmark(rolling_volatility, closes, [10, 20, 30, 60, 90])
+    assert volatility.shape == (5,) + closes.shape
+
+def test_universe_ewma_variance(benchmark, universe_closes):
+    returns = np.diff(np.log(universe_closes.to_numpy()), axis=0)
+    variance = benchmark(ewma_variance, returns, 0.94)
+    assert variance.shape == returns.shape
+
+def test_universe_range_estimators(benchmark, universe_closes):
+    closes = universe_closes.to_numpy()
+    # Flat bars are enough to time the arithmetic
+    suite = benchmark(range_volatility_suite, closes, closes * 1.01, closes * 0.99, closes, [20, 60])
+    assert set(suite) == {'parkinson', 'garman_klass', 'rogers_satchell', 'yang_zhang'}
+
+def test_universe_garch(benchmark, universe_closes):
+    table = benchmark.pedantic(fit_garch_universe, args=(universe_closes,), rounds=1, iterations=1)
+    assert len(table) == universe_closes.shape[1]
@@ -0,0 +1,41 @@
+"""
+Benchmarks of simulated forecast bands against the closed-form bands.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility.models import GarchFit, get_confidence_intervals
+from volatility.simulation import quantile_bands, simulate_garch_volatility
+
+LEVELS = (0.5, 0.8, 0.95)
+
+@pytest.fixture(scope='module')
+def garch_fit():
+    return GarchFit(
+        params={'mu': 0.05, 'omega': 0.02, 'alpha[1]': 0.08, 'beta[1]': 0.9},
+        conditional_variance=np.array([1.1]),
+        residuals=np.array([-1.5]),
+        last_date=pd.Timestamp('2024-03-28'),
+        last_price=100.0
+    )
+
+@pytest.mark.parametrize('forecast_horizon', [5, 21, 252])
+@pytest.mark.parametrize('n_paths', [10_000, 100_000])
+def test_simulated_bands(benchmark, garch_fit, forecast_horizon, n_paths):
+    def bands():
+        paths = simulate_garch_volatility(garch_fit, forecast_horizon, n_paths, seed=0)
+        return quantile_bands(paths, LEVELS)
+
+    result = benchmark.pedantic(bands, rounds=3, iterations=1)
+    assert set(result) == set(LEVELS)
+
+@pytest.mark.parametrize('forecast_horizon', [5, 21, 252])
+def test_closed_form_bands(benchmark, garch_fit, forecast_horizon):
+    forecast = garch_fit.forecast(forecast_horizon)
+
+    def bands():
+        return {level: get_confidence_intervals(forecast, 2.0, level) for level in LEVELS}
+
+    result = benchmark(bands)
+    assert set(result) == set(LEVELS)
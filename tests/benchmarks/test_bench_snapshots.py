@@ -0,0 +1,74 @@
+"""
+Benchmarks of nightly snapshot builds and snapshot-served requests.
+
+Prices come from an in-memory provider, so builds time the models and the
+file write, and lookups time the memory-mapped reads.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.price_store import PriceProvider, PriceStore, set_price_store
+from api.snapshots import SnapshotStore, build_snapshot, set_snapshot_store
+from volatility.garch_store import GarchModelStore, set_garch_store
+
+from synthetic import make_ohlcv
+
+client = TestClient(app)
+
+# Calendar-day bars so the request window (2 x historical_window days) spans them all
+HISTORICAL_WINDOW = 125
+
+class FrameProvider(PriceProvider):
+    """Serves one ticker's bars out of a (field, ticker) frame."""
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def fetch(self, ticker, start, end):
+        return self.frame.xs(ticker, axis=1, level=1).loc[start:end]
+
+@pytest.fixture(scope='module', params=[50, 500], ids=lambda n: f"{n}tickers")
+def universe(request):
+    frame = make_ohlcv(250, request.param, seed=2, freq='D')
+    return frame, list(frame['Close'].columns)
+
+@pytest.fixture
+def snapshot(universe, tmp_path):
+    frame, tickers = universe
+    set_price_store(PriceStore(provider=FrameProvider(frame)))
+    path = str(tmp_path / 'forecasts.snap')
+    build_snapshot(tickers, path, historical_window=HISTORICAL_WINDOW)
+    return path, tickers
+
+def test_build_snapshot(benchmark, universe, tmp_path):
+    """Nightly build from cached prices with cold GARCH fits."""
+    frame, tickers = universe
+    set_price_store(PriceStore(provider=FrameProvider(frame)))
+    path = str(tmp_path / 'forecasts.snap')
+
+    header = benchmark.pedantic(
+        build_snapshot, args=(tickers, path), kwargs={'historical_window': HISTORICAL_WINDOW},
+        setup=lambda: set_garch_store(GarchModelStore()), rounds=3, iterations=1
+    )
+    assert len(header['tickers']) == len(tickers)
+
+def test_snapshot_lookup(benchmark, snapshot):
+    path, tickers = snapshot
+    store = SnapshotStore(path)
+
+    def lookup_all():
+        for ticker in tickers:
+            store.lookup(ticker, HISTORICAL_WINDOW, 5)
+
+    benchmark(lookup_all)
+    assert store.stats()['misses'] == 0
+
+def test_forecast_request_from_snapshot(benchmark, snapshot):
+    """End-to-end numeric request answered from the snapshot."""
+    path, tickers = snapshot
+    set_snapshot_store(SnapshotStore(path))
+    body = {'ticker': tickers[0], 'historical_window': HISTORICAL_WINDOW, 'include_charts': False}
+
+    response = benchmark(client.post, '/api/volatility/forecast', json=body)
+    assert response.status_code == 200
@@ -0,0 +1,67 @@
+"""
+Shared fixtures for the test suite.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.executors import configure_pools, get_settings
+from api.price_store import PriceStore, set_price_store
+from api.result_cache import MemoryResultCache, set_result_cache
+from api.snapshots import set_snapshot_store
+from volatility.garch_store import GarchModelStore, set_garch_store
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    """Give every test empty in-memory price, result and model caches and no snapshot."""
+    set_price_store(PriceStore())
+    set_result_cache(MemoryResultCache())
+    set_garch_store(GarchModelStore())
+    set_snapshot_store(None)
+    yield
+    set_price_store(None)
+    set_result_cache(None)
+    set_garch_store(None)
+    set_snapshot_store(None)
+
+@pytest.fixture(autouse=True)
+def thread_model_pools():
+    """Run the model stages on threads, where the tests' patches are visible."""
+    original = get_settings()
+    configure_pools(model_executor='thread', batch_executor='thread')
+    yield
+    configure_pools(**original)
+
+@pytest.fixture
+def simulate_garch_prices():
+    """Factory of daily prices following a GARCH(1,1) process with known parameters."""
+    def simulate(periods: int,
+                 seed: int,
+                 start: str = '2020-01-01',
+                 omega: float = 0.05,
+                 alpha: float = 0.08,
+                 beta: float = 0.9) -> pd.Series:
+        dates = pd.date_range(start=start, periods=periods, freq='B')
+        rng = np.random.default_rng(seed)
+        variance = omega / (1 - alpha - beta)
+        returns = np.empty(len(dates))
+        for t in range(len(dates)):
+            returns[t] = np.sqrt(variance) * rng.standard_normal()
+            variance = omega + alpha * returns[t] ** 2 + beta * variance
+        return pd.Series(100 * np.exp(np.cumsum(returns / 100)), index=dates)
+    return simulate
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--run-benchmarks', action='store_true', default=False,
+        help="Run the performance benchmarks in tests/benchmarks (needs pytest-benchmark)"
+    )
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the benchmarks unless they are asked for; they take minutes."""
+    if config.getoption('--run-benchmarks'):
+        return
+    skip = pytest.mark.skip(reason="benchmark; pass --run-benchmarks to run")
+    for item in items:
+        if 'benchmarks' in item.path.parts:
+            item.add_marker(skip)
@@ -3,17 +3,25 @@ import pytest
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
+import json
+import time
 from unittest.mock import patch
 import yfinance as yf
 
+import api.main as api_main
+from api.executors import configure_pools, get_settings
 from api.main import app
+from api.price_store import PriceStore, set_price_store
+from api.result_cache import get_result_cache
+from volatility.garch_store import get_garch_store
+from volatility.models import fit_garch
 
 client = TestClient(app)
 
 @pytest.fixture
 def mock_yf_data():
     """Mock yfinance data for testing."""
-    dates = pd.date_range(start='2023-01-01', periods=100, freq='D')
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=100, freq='D')
     np.random.seed(42)
     returns = np.random.normal(0, 0.01, 100)
     prices = 100 * np.exp(np.cumsum(returns))
@@ -113,6 +121,16 @@ def test_invalid_parameters(mock_yf_download):
     
     response = client.post("/api/volatility/forecast", json=request_data)
     assert response.status_code == 422  # Validation error
+    
+    # Test with a ticker that is not a plain symbol
+    request_data = {
+        "ticker": "../../X",
+        "historical_window": 30,
+        "forecast_horizon": 5
+    }
+    
+    response = client.post("/api/volatility/forecast", json=request_data)
+    assert response.status_code == 422  # Validation error
 
 @pytest.mark.parametrize("ticker", ["SPY", "AAPL", "GOOGL"])
 def test_multiple_tickers(mock_yf_download, ticker):
@@ -151,4 +169,303 @@ def test_chart_data(mock_yf_download):
     # Check residuals chart
     res_chart = data["residuals_chart"]
     assert "data" in res_chart
-    assert "layout" in res_chart 
\ No newline at end of file
+    assert "layout" in res_chart 
+
+def test_numeric_only_response(mock_yf_download):
+    """Test that charts are skipped when not requested."""
+    request_data = {"ticker": "SPY", "include_charts": False}
+
+    with patch('volatility.visualization.create_volatility_chart') as mock_chart:
+        response = client.post("/api/volatility/forecast", json=request_data)
+    assert response.status_code == 200
+    assert mock_chart.call_count == 0
+
+    data = response.json()
+    assert "volatility_chart" not in data
+    assert "residuals_chart" not in data
+    assert len(data["ensemble_forecast"]) == 5
+
+def test_field_projection(mock_yf_download):
+    """Test that only the requested fields are returned."""
+    request_data = {"ticker": "SPY", "fields": ["ensemble_forecast", "forecast_dates"]}
+
+    response = client.post("/api/volatility/forecast", json=request_data)
+    assert response.status_code == 200
+    assert set(response.json()) == {"ensemble_forecast", "forecast_dates"}
+
+    request_data = {"ticker": "SPY", "fields": ["not_a_field"]}
+    response = client.post("/api/volatility/forecast", json=request_data)
+    assert response.status_code == 422
+
+def test_term_structure_request(mock_yf_download):
+    """Test that several horizons are answered from one GARCH fit."""
+    request_data = {"ticker": "SPY", "include_charts": False, "forecast_horizons": [63, 1, 21, 5, 5]}
+
+    with patch('volatility.garch_store.fit_garch', wraps=fit_garch) as mock_fit:
+        response = client.post("/api/volatility/forecast", json=request_data)
+    assert response.status_code == 200
+    assert mock_fit.call_count == 1
+
+    term_structure = response.json()["term_structure"]
+    assert term_structure["horizons"] == [1, 5, 21, 63]
+    assert len(term_structure["ensemble"]) == 4
+    assert {"garch", "ewma"} <= set(term_structure["models"])
+    assert term_structure["models"]["garch"][0] == pytest.approx(response.json()["forecast_data"][0])
+
+    # Without horizons the field is neither returned nor allowed
+    response = client.post("/api/volatility/forecast", json={"ticker": "SPY", "include_charts": False})
+    assert "term_structure" not in response.json()
+    response = client.post("/api/volatility/forecast", json={"ticker": "SPY", "fields": ["term_structure"]})
+    assert response.status_code == 422
+    response = client.post("/api/volatility/forecast", json={"ticker": "SPY", "forecast_horizons": [0]})
+    assert response.status_code == 422
+
+def test_consecutive_days_extend_stored_garch(mock_yf_download):
+    """Test that a rolling window on the next days extends the stored GARCH model."""
+    request_data = {"ticker": "SPY", "historical_window": 30, "include_charts": False}
+    today = pd.Timestamp.today().normalize()
+
+    for days_ago in (10, 9, 8):
+        now = (today - pd.Timedelta(days=days_ago, hours=-18)).to_pydatetime()
+        with patch('api.pipeline.datetime') as mock_datetime:
+            mock_datetime.now.return_value = now
+            response = client.post("/api/v1/volatility/forecast", json=request_data)
+        assert response.status_code == 200
+        assert response.json()["dates"][-1] == now.strftime('%Y-%m-%d')
+
+    stats = get_garch_store().stats()
+    assert stats['cold_fits'] == 1 and stats['warm_fits'] == 0
+    assert stats['extends'] == 2
+
+def test_repeated_request_served_from_cache(mock_yf_download, mock_yf_data):
+    """Test that identical requests reuse the computed result until a new bar arrives."""
+    request_data = {"ticker": "SPY", "include_charts": False}
+    mock_yf_download.return_value = mock_yf_data.iloc[:-1]
+
+    with patch('api.main._compute_forecast', wraps=api_main._compute_forecast) as mock_compute:
+        first = client.post("/api/volatility/forecast", json=request_data)
+        second = client.post("/api/volatility/forecast", json=request_data)
+        assert mock_compute.call_count == 1
+        assert first.json() == second.json()
+
+        # A new bar changes the key; force the price cache to pick it up
+        mock_yf_download.return_value = mock_yf_data
+        set_price_store(PriceStore(ttl=0))
+        client.post("/api/volatility/forecast", json=request_data)
+        assert mock_compute.call_count == 2
+
+def test_etag_not_modified(mock_yf_download):
+    """Test ETag and Cache-Control headers and conditional requests."""
+    request_data = {"ticker": "SPY", "include_charts": False}
+
+    response = client.post("/api/volatility/forecast", json=request_data)
+    etag = response.headers["etag"]
+    assert "max-age" in response.headers["cache-control"]
+
+    response = client.post("/api/volatility/forecast", json=request_data,
+                           headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    # Lists, the weak form of the tag and * match; a tag containing ours does not
+    for if_none_match in [f'"other", {etag}', f'W/{etag}', f'"x",W/{etag} ', '*']:
+        response = client.post("/api/volatility/forecast", json=request_data,
+                               headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304, if_none_match
+    response = client.post("/api/volatility/forecast", json=request_data,
+                           headers={"If-None-Match": f'"x{etag[1:]}'})
+    assert response.status_code == 200
+
+    # A different projection is a different representation
+    request_data["fields"] = ["ensemble_forecast"]
+    response = client.post("/api/volatility/forecast", json=request_data,
+                           headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+@pytest.fixture
+def pool_settings():
+    """Restore the worker pool settings after a test changes them."""
+    original = get_settings()
+    yield
+    configure_pools(**original)
+
+def test_fetch_timeout(mock_yf_download, mock_yf_data, pool_settings):
+    """Test that a slow download fails with a gateway timeout."""
+    def slow_download(*args, **kwargs):
+        time.sleep(0.5)
+        return mock_yf_data
+
+    mock_yf_download.side_effect = slow_download
+    configure_pools(fetch_timeout=0.05)
+
+    response = client.post("/api/volatility/forecast", json={"ticker": "SPY"})
+    assert response.status_code == 504
+    assert "fetch" in response.json()["detail"]
+
+def test_process_model_pool(mock_yf_download, pool_settings):
+    """Test the model stage running on a process pool."""
+    configure_pools(model_executor='process', model_workers=2)
+
+    response = client.post("/api/volatility/forecast", json={"ticker": "SPY"})
+    assert response.status_code == 200
+    assert len(response.json()["ensemble_forecast"]) == 5
+
+def test_batch_forecast_streams_per_ticker_results(mock_yf_download, mock_yf_data):
+    """Test the batch endpoint with one multi-ticker download and a partial failure."""
+    mock_yf_download.return_value = pd.concat(
+        {'SPY': mock_yf_data, 'AAPL': mock_yf_data * 2}, axis=1
+    )
+    request_data = {"requests": [
+        {"ticker": "SPY", "forecast_horizon": 5},
+        {"ticker": "AAPL", "forecast_horizon": 3},
+        {"ticker": "MISSING"},
+        {"ticker": "SPY", "historical_window": 150}
+    ]}
+
+    response = client.post("/api/volatility/forecast/batch", json=request_data)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert mock_yf_download.call_count == 1
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    results = {line["index"]: line for line in lines}
+    assert sorted(results) == [0, 1, 2, 3]
+
+    assert results[0]["status"] == 200
+    assert len(results[0]["result"]["ensemble_forecast"]) == 5
+    assert results[1]["status"] == 200
+    assert len(results[1]["result"]["forecast_data"]) == 3
+    assert results[2]["status"] == 404
+    assert "MISSING" in results[2]["detail"]
+    assert results[3]["status"] == 400
+    assert "Insufficient historical data" in results[3]["detail"]
+
+def test_batch_forecast_on_process_pool(mock_yf_download, mock_yf_data, pool_settings):
+    """Test that batch fits run on the batch pool's worker processes."""
+    mock_yf_download.return_value = pd.concat({'SPY': mock_yf_data, 'AAPL': mock_yf_data * 2}, axis=1)
+    configure_pools(batch_executor='process', batch_workers=2)
+
+    response = client.post("/api/volatility/forecast/batch", json={"requests": [
+        {"ticker": "SPY", "include_charts": False},
+        {"ticker": "AAPL", "include_charts": False}
+    ]})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["status"] for line in lines) == [200, 200]
+    assert get_garch_store().stats()['cold_fits'] == 0  # Fitted in the worker processes
+
+def test_batch_forecast_validation():
+    """Test that an empty batch is rejected."""
+    response = client.post("/api/volatility/forecast/batch", json={"requests": []})
+    assert response.status_code == 422
+
+def test_metrics_endpoint(mock_yf_download):
+    """Test that forecast stages show up as Prometheus histograms."""
+    request_data = {"ticker": "SPY", "historical_window": 30, "include_charts": False}
+    assert client.post("/api/volatility/forecast", json=request_data).status_code == 200
+    
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    for stage in ('request', 'fetch', 'model', 'garch_fit', 'ensemble_fit', 'response'):
+        assert f'volatility_stage_duration_seconds_count{{stage="{stage}"}}' in response.text
+
+def test_server_timing_header(mock_yf_download, monkeypatch):
+    """Test the optional Server-Timing header, including stages run on the model pool."""
+    request_data = {"ticker": "SPY", "historical_window": 30}
+    
+    monkeypatch.setattr(api_main, 'SERVER_TIMING', True)
+    response = client.post("/api/volatility/forecast", json=request_data)
+    stages = [entry.split(';')[0] for entry in response.headers['server-timing'].split(', ')]
+    for stage in ('fetch', 'garch_fit', 'ensemble_fit', 'charts', 'model', 'response', 'request'):
+        assert stage in stages
+    
+    monkeypatch.setattr(api_main, 'SERVER_TIMING', False)
+    response = client.post("/api/volatility/forecast", json=request_data)
+    assert 'server-timing' not in response.headers
+
+def test_forecast_binary_formats(mock_yf_download):
+    """Test Arrow IPC and MessagePack responses against the JSON one."""
+    import msgpack
+    import pyarrow as pa
+    
+    request_data = {"ticker": "SPY", "historical_window": 30, "include_charts": False}
+    expected = client.post("/api/volatility/forecast", json=request_data).json()
+    
+    response = client.post("/api/volatility/forecast", json=request_data,
+                           headers={"Accept": "application/vnd.apache.arrow.stream"})
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/vnd.apache.arrow.stream'
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.schema.field('date').type == pa.date32()
+    frame = table.to_pandas()
+    ensemble = frame[frame['series'] == 'ensemble_forecast']
+    assert ensemble['value'].tolist() == expected['ensemble_forecast']
+    assert [d.isoformat() for d in ensemble['date']] == expected['forecast_dates']
+    assert json.loads(table.schema.metadata[b'model_weights']) == expected['model_weights']
+    
+    response = client.post("/api/volatility/forecast", json=request_data,
+                           headers={"Accept": "application/msgpack"})
+    assert response.headers['content-type'] == 'application/msgpack'
+    payload = msgpack.unpackb(response.content)
+    historical = np.frombuffer(payload['historical_data']['data'], dtype='<f8')
+    assert historical.tolist() == expected['historical_data']
+    days = np.frombuffer(payload['dates']['data'], dtype='<i4').astype('datetime64[D]')
+    assert np.datetime_as_string(days).tolist() == expected['dates']
+    
+    # Each representation has its own entity tag
+    assert response.headers['etag'] != client.post("/api/volatility/forecast", json=request_data).headers['etag']
+    
+    response = client.post("/api/volatility/forecast", json=request_data, headers={"Accept": "text/csv"})
+    assert response.status_code == 406
+
+def test_batch_msgpack_stream(mock_yf_download):
+    """Test the batch endpoint streaming MessagePack maps."""
+    import msgpack
+    
+    batch = {"requests": [{"ticker": "SPY", "historical_window": 30, "include_charts": False},
+                          {"ticker": "QQQ", "historical_window": 30, "include_charts": False}]}
+    response = client.post("/api/volatility/forecast/batch", json=batch,
+                           headers={"Accept": "application/msgpack"})
+    assert response.status_code == 200
+    
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(response.content)
+    lines = sorted(unpacker, key=lambda line: line['index'])
+    assert [line['status'] for line in lines] == [200, 200]
+    forecast = np.frombuffer(lines[1]['result']['forecast_data']['data'], dtype='<f8')
+    assert len(forecast) == 5
+
+def test_versioned_and_compat_routes_share_layers(mock_yf_download):
+    """Test that /api/v1 and the unversioned route serve the same cached result."""
+    request_data = {"ticker": "SPY", "historical_window": 30, "include_charts": False}
+    
+    v1 = client.post("/api/v1/volatility/forecast", json=request_data)
+    compat = client.post("/api/volatility/forecast", json=request_data)
+    assert v1.status_code == compat.status_code == 200
+    assert v1.json() == compat.json()
+    assert v1.headers['etag'] == compat.headers['etag']
+    # One download and one model run for both routes
+    assert mock_yf_download.call_count == 1
+    assert get_result_cache().stats() == {'hits': 1, 'misses': 1}
+
+def test_legacy_forecast_route(mock_yf_download):
+    """Test the former standalone app's /forecast schema on the unified service."""
+    response = client.post("/forecast", json={"ticker": "spy", "window": 20, "forecast_horizon": 3})
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["ticker"] == "spy"
+    assert len(data["forecast_volatility"]) == len(data["forecast_dates"]) == 3
+    assert len(data["historical_volatility"]) == len(data["historical_dates"]) > 0
+    assert all(lower < upper for lower, upper in zip(data["lower_bound"], data["upper_bound"]))
+    assert client.get("/").json() == {"message": "Volatility Forecasting API"}
+    
+    from volatility.main import app as legacy_app
+    assert legacy_app is app
+
+def test_legacy_forecast_unknown_ticker(mock_yf_download):
+    """Test that a ticker without data is a 404 on the legacy route."""
+    mock_yf_download.return_value = pd.DataFrame()
+    response = client.post("/forecast", json={"ticker": "NOPE"})
+    assert response.status_code == 404
@@ -0,0 +1,64 @@
+"""
+Test suite for the walk-forward backtest.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility.backtest import backtest_ensemble, backtest_universe, realized_volatility
+from volatility.models import VolatilityEnsemble
+
+@pytest.fixture
+def prices(simulate_garch_prices):
+    """GARCH(1,1) prices long enough for several refits."""
+    return simulate_garch_prices(400, seed=13, start='2021-01-01')
+
+def test_realized_volatility_looks_forward(prices):
+    """Test that realized volatility at t uses exactly the next horizon bars."""
+    realized = realized_volatility(prices.to_numpy(), 5)
+    returns = np.diff(np.log(prices.to_numpy()))
+
+    assert realized[10] == pytest.approx(np.sqrt(np.mean(returns[10:15] ** 2) * 252) * 100)
+    assert np.isnan(realized[-5:]).all()
+
+def test_backtest_matches_ensemble_at_origin(prices):
+    """Test the first origin against a VolatilityEnsemble fitted on the same history."""
+    result = backtest_ensemble(prices, historical_window=30, forecast_horizon=5,
+                               min_train=300, refit_every=20)
+
+    assert len(result.forecasts) == len(prices) - 300 - 5 + 1
+    assert result.forecasts.index[0] == prices.index[299]
+    assert not result.forecasts.isna().any().any()
+
+    ensemble = VolatilityEnsemble(historical_window=30, forecast_horizon=5)
+    ensemble.fit(prices.iloc[:300])
+    first = result.forecasts.iloc[0]
+    forecasts = ensemble.get_model_forecasts()
+    assert first['garch'] == pytest.approx(forecasts['garch'].mean(), rel=1e-6)
+    assert first['ewma'] == pytest.approx(forecasts['ewma'].mean(), rel=1e-6)
+    assert first['ensemble'] == pytest.approx(ensemble.predict().mean(), rel=1e-6)
+
+def test_backtest_scores(prices):
+    """Test QLIKE/MSE scoring per model."""
+    result = backtest_ensemble(prices, min_train=300, refit_every=50)
+    scores = result.scores()
+
+    assert list(scores.index) == ['garch', 'ewma', 'ensemble']
+    assert (scores['n_forecasts'] == len(result.forecasts)).all()
+    realized_var = result.realized.to_numpy() ** 2
+    garch_var = result.forecasts['garch'].to_numpy() ** 2
+    assert scores.loc['garch', 'mse'] == pytest.approx(np.mean((garch_var - realized_var) ** 2))
+    assert scores.loc['garch', 'qlike'] == pytest.approx(
+        np.mean(np.log(garch_var) + realized_var / garch_var))
+
+def test_backtest_universe_isolates_failures(prices):
+    """Test parallel per-ticker backtests with a ticker too short to backtest."""
+    frame = pd.DataFrame({'AAA': prices, 'BBB': prices * 2, 'NEW': np.nan})
+    frame.iloc[-20:, frame.columns.get_loc('NEW')] = 10.0 + np.arange(20)
+
+    with pytest.warns(UserWarning, match='NEW'):
+        scores = backtest_universe(frame, max_workers=2, min_train=300, refit_every=50)
+
+    assert set(scores.index.get_level_values('ticker')) == {'AAA', 'BBB'}
+    # Scaling prices leaves log returns and hence every forecast unchanged
+    pd.testing.assert_frame_equal(scores.loc['AAA'], scores.loc['BBB'], rtol=1e-4)
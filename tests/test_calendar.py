@@ -0,0 +1,66 @@
+"""
+Test suite for the NYSE trading calendar.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility.calendar import get_calendar, nyse_holidays
+from volatility.models import calculate_ewma_forecast, fit_garch
+from volatility.online import OnlineVolatility
+
+def test_nyse_holidays_2025():
+    """Test the 2025 schedule, including the closure for President Carter's funeral."""
+    expected = [
+        '2025-01-01', '2025-01-09', '2025-01-20', '2025-02-17', '2025-04-18', '2025-05-26',
+        '2025-06-19', '2025-07-04', '2025-09-01', '2025-11-27', '2025-12-25'
+    ]
+    assert nyse_holidays(2025, 2025).tolist() == np.array(expected, dtype='datetime64[D]').tolist()
+
+def test_observance_rules():
+    holidays = set(nyse_holidays(2020, 2027).astype(str))
+    assert '2021-12-24' in holidays  # Christmas on a Saturday
+    assert '2021-12-31' not in holidays  # New Year's Day 2022 on a Saturday is not observed
+    assert '2023-01-02' in holidays  # New Year's Day on a Sunday
+    assert '2026-07-03' in holidays  # Independence Day on a Saturday
+    assert '2027-06-18' in holidays  # Juneteenth on a Saturday
+    assert not any(day.endswith('-06-19') for day in holidays if day < '2022')
+
+def test_next_sessions_skip_weekends_and_holidays():
+    calendar = get_calendar()
+    sessions = calendar.next_sessions(pd.Timestamp('2024-12-24'), 5)
+    assert sessions.astype(str).tolist() == [
+        '2024-12-26', '2024-12-27', '2024-12-30', '2024-12-31', '2025-01-02'
+    ]
+    assert not sessions.flags.writeable
+    assert calendar.is_session('2025-07-07') and not calendar.is_session('2025-07-04')
+    with pytest.raises(ValueError):
+        calendar.next_sessions('1960-01-01', 1)
+    # Before 1985 the closures are not all known, so the calendar does not answer
+    with pytest.raises(ValueError):
+        calendar.next_sessions('1977-07-13', 1)
+    with pytest.raises(ValueError):
+        calendar.is_session('1980-11-04')
+    assert calendar.is_session('1985-01-02') and not calendar.is_session('1985-09-27')
+
+def test_iso_strings():
+    calendar = get_calendar()
+    dates = np.array(['2024-02-29', '1969-12-31', '2024-03-01'], dtype='datetime64[D]')
+    assert calendar.iso(dates[[0, 2]]) == ['2024-02-29', '2024-03-01']
+    assert calendar.iso(dates) == ['2024-02-29', '1969-12-31', '2024-03-01']
+    assert calendar.iso(np.array([], dtype='datetime64[D]')) == []
+
+def test_forecasts_are_dated_on_sessions():
+    """Test that every model's forecast after a pre-holiday bar starts on the next session."""
+    dates = pd.bdate_range(end='2024-12-24', periods=300)
+    rng = np.random.default_rng(3)
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates)))), index=dates)
+    expected = pd.DatetimeIndex(['2024-12-26', '2024-12-27', '2024-12-30'])
+
+    forecasts = [
+        calculate_ewma_forecast(prices, 3),
+        fit_garch(prices).forecast(3),
+        OnlineVolatility.from_prices(prices).ewma_forecast(3)
+    ]
+    for forecast in forecasts:
+        assert forecast.index.equals(expected.astype(forecast.index.dtype))
@@ -0,0 +1,113 @@
+"""
+Test suite for the range-based volatility estimators.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility.estimators import (
+    ESTIMATORS,
+    ohlc_volatility_frame,
+    range_volatility,
+    range_volatility_suite
+)
+from volatility.models import VolatilityEnsemble
+
+TRUE_VOL = 25.0  # Annualized, percent
+
+def simulate_ohlc(n_days, n_tickers=1, steps=390, seed=5):
+    """Simulate OHLC bars from an intraday random walk with known volatility."""
+    rng = np.random.default_rng(seed)
+    step_sigma = TRUE_VOL / 100 / np.sqrt(252 * steps)
+    # Each day is `steps` intraday moves plus one overnight move of the same size
+    moves = rng.normal(0, step_sigma, size=(n_days, steps + 1, n_tickers))
+    paths = np.log(100) + np.cumsum(moves.reshape(-1, n_tickers), axis=0).reshape(moves.shape)
+    intraday = paths[:, 1:, :]
+    ohlc = np.exp(np.stack([
+        intraday[:, 0], intraday.max(axis=1), intraday.min(axis=1), intraday[:, -1]
+    ]))
+    return ohlc if n_tickers > 1 else ohlc[..., 0]
+
+@pytest.fixture
+def ohlc_frame():
+    open_, high, low, close = simulate_ohlc(120)
+    dates = pd.date_range(start='2024-01-01', periods=120, freq='B')
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close}, index=dates)
+
+def test_estimators_match_reference_formulas(ohlc_frame):
+    """Test each estimator against a direct pandas implementation."""
+    o, h, l, c = (np.log(ohlc_frame[col]) for col in ['Open', 'High', 'Low', 'Close'])
+    window = 20
+    annualize = lambda variance: np.sqrt(variance * 252) * 100
+
+    gk = 0.5 * (h - l) ** 2 - (2 * np.log(2) - 1) * (c - o) ** 2
+    rs = (h - o) * (h - c) + (l - o) * (l - c)
+    overnight = o - c.shift(1)
+    k = 0.34 / (1.34 + (window + 1) / (window - 1))
+    yz = (overnight.rolling(window).var()
+          + k * (c - o).where(overnight.notna()).rolling(window).var()
+          + (1 - k) * rs.where(overnight.notna()).rolling(window).mean())
+
+    frame = ohlc_volatility_frame(ohlc_frame, window)
+    np.testing.assert_allclose(frame['garman_klass'], annualize(gk.rolling(window).mean()),
+                               rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(frame['rogers_satchell'], annualize(rs.rolling(window).mean()),
+                               rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(frame['yang_zhang'], annualize(yz), rtol=1e-9, equal_nan=True)
+
+def test_estimators_recover_true_volatility():
+    """Test that every estimator is close to the simulated volatility."""
+    open_, high, low, close = simulate_ohlc(1000)
+
+    for estimator in ESTIMATORS:
+        estimate = range_volatility(open_, high, low, close, 999, estimator)[0, -1]
+        # Discrete sampling biases range estimators slightly low
+        assert estimate == pytest.approx(TRUE_VOL, rel=0.1), estimator
+
+def test_estimators_batch_across_tickers():
+    """Test that a time x ticker matrix equals per-ticker calls, for several windows."""
+    open_, high, low, close = simulate_ohlc(150, n_tickers=4)
+
+    suite = range_volatility_suite(open_, high, low, close, [10, 30])
+    for estimator, values in suite.items():
+        assert values.shape == (2, 150, 4)
+        for j in range(4):
+            single = range_volatility(open_[:, j], high[:, j], low[:, j], close[:, j],
+                                      [10, 30], estimator)
+            np.testing.assert_allclose(values[:, :, j], single, equal_nan=True)
+
+    with pytest.raises(ValueError):
+        range_volatility(open_, high, low, close, 10, 'unknown')
+
+def test_ensemble_uses_range_estimators(ohlc_frame):
+    """Test that full OHLC data adds range-based ensemble members."""
+    ensemble = VolatilityEnsemble(historical_window=20, forecast_horizon=5)
+    ensemble.fit(ohlc_frame['Close'], ohlc_frame)
+
+    weights = ensemble.get_model_weights()
+    assert {'garman_klass', 'rogers_satchell', 'yang_zhang'} <= set(weights)
+    assert sum(weights.values()) == pytest.approx(1.0)
+    assert len(ensemble.predict()) == 5
+
+    high_low_only = VolatilityEnsemble(historical_window=20, forecast_horizon=5)
+    high_low_only.fit(ohlc_frame['Close'], ohlc_frame[['High', 'Low']])
+    assert set(high_low_only.get_model_weights()) == {'garch', 'ewma', 'historical', 'parkinson'}
+
+def test_ensemble_skips_missing_range_levels(ohlc_frame):
+    """Test that a missing last Open or an unfilled window leaves the weights finite."""
+    missing_open = ohlc_frame.copy()
+    missing_open.iloc[-1, missing_open.columns.get_loc('Open')] = np.nan
+    ensemble = VolatilityEnsemble(historical_window=20, forecast_horizon=5)
+    ensemble.fit(missing_open['Close'], missing_open)
+
+    weights = ensemble.get_model_weights()
+    assert 'yang_zhang' in weights
+    assert np.isfinite(list(weights.values())).all()
+    assert sum(weights.values()) == pytest.approx(1.0)
+    assert np.isfinite(ensemble.predict().to_numpy()).all()
+
+    # No Yang-Zhang value at all: the member is left out
+    short = VolatilityEnsemble(historical_window=len(ohlc_frame), forecast_horizon=5)
+    short.fit(ohlc_frame['Close'], ohlc_frame)
+    assert 'yang_zhang' not in short.get_model_weights()
+    assert np.isfinite(short.predict().to_numpy()).all()
@@ -0,0 +1,96 @@
+"""
+Test suite for incremental GARCH updates.
+"""
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from volatility.garch_store import GarchModelStore
+from volatility.models import fit_garch
+
+@pytest.fixture
+def prices(simulate_garch_prices):
+    """Prices following a GARCH(1,1) process."""
+    return simulate_garch_prices(760, seed=3)
+
+def test_extend_matches_fixed_parameter_filter(prices):
+    """Test that extending a fit equals filtering the full sample with the same parameters."""
+    from arch import arch_model
+
+    garch_fit = fit_garch(prices.iloc[:700])
+    extended = garch_fit.extend(prices)
+
+    log_returns = 100 * np.log(prices / prices.shift(1)).dropna()
+    fixed = arch_model(log_returns, vol='Garch', p=1, q=1).fix(
+        [garch_fit.params[name] for name in ['mu', 'omega', 'alpha[1]', 'beta[1]']]
+    )
+    np.testing.assert_allclose(extended.conditional_variance[-50:],
+                               fixed.conditional_volatility.to_numpy()[-50:] ** 2, rtol=1e-10)
+    assert extended.last_date == prices.index[-1]
+    assert extended.params == garch_fit.params
+
+def test_store_extends_then_refits(prices):
+    """Test the refit schedule: extend for a few bars, then warm-start a refit."""
+    store = GarchModelStore(refit_every=5)
+
+    with patch('volatility.garch_store.fit_garch', wraps=fit_garch) as mock_fit:
+        store.fit('SPY', prices.iloc[:-10])
+        store.fit('SPY', prices.iloc[:-10])
+        store.fit('SPY', prices.iloc[:-8])
+        store.fit('SPY', prices.iloc[:-6])
+        assert mock_fit.call_count == 1
+
+        store.fit('SPY', prices.iloc[:-4])
+        assert mock_fit.call_count == 2
+        assert mock_fit.call_args.kwargs['starting_values'] is not None
+
+    assert store.stats() == {'cold_fits': 1, 'warm_fits': 1, 'extends': 2, 'reuses': 1, 'tickers': 1}
+
+def test_store_persists_state(prices, tmp_path):
+    """Test that a restarted store extends from the persisted state."""
+    path = str(tmp_path / 'garch.json')
+    first = GarchModelStore(refit_every=10, path=path, flush_every=3)
+    expected = first.fit('SPY', prices.iloc[:-1]).extend(prices)
+    first.fit('QQQ', prices.iloc[:-2])
+    assert not os.path.exists(path)  # Written every 3 updates or on flush()
+    first.fit('IWM', prices.iloc[:-2])
+    assert os.path.exists(path)
+    first.flush()
+
+    restarted = GarchModelStore(refit_every=10, path=path)
+    with patch('volatility.garch_store.fit_garch') as mock_fit:
+        restored = restarted.fit('SPY', prices)
+    assert mock_fit.call_count == 0
+
+    np.testing.assert_allclose(restored.forecast_variance(10), expected.forecast_variance(10))
+
+def test_store_refits_other_windows(prices):
+    """Test that a fit is only reused for the sample it was estimated on."""
+    store = GarchModelStore(refit_every=5)
+    short = store.fit('SPY', prices.iloc[-20:])
+    long = store.fit('SPY', prices.iloc[-150:])
+
+    assert long is not short
+    assert long.params == pytest.approx(fit_garch(prices.iloc[-150:]).params, rel=1e-3)
+    assert store.stats()['warm_fits'] == 1
+
+    # The same window is reused; switching back to the short one refits again
+    store.fit('SPY', prices.iloc[-150:])
+    store.fit('SPY', prices.iloc[-20:])
+    assert store.stats()['reuses'] == 1 and store.stats()['warm_fits'] == 2
+
+def test_rolling_windows_are_kept_apart_and_extended(prices):
+    """Test that each window has its own model, extended as the window slides."""
+    store = GarchModelStore(refit_every=5)
+    short = store.fit('SPY', prices.iloc[-120:-2], window=20)
+    long = store.fit('SPY', prices.iloc[-400:-2], window=150)
+    assert store.get('SPY', window=20) is short and store.get('SPY', window=150) is long
+
+    with patch('volatility.garch_store.fit_garch') as mock_fit:
+        store.fit('SPY', prices.iloc[-119:-1], window=20)
+        extended = store.fit('SPY', prices.iloc[-398:], window=150)
+    assert mock_fit.call_count == 0
+    assert extended.params == long.params and extended.last_date == prices.index[-1]
+    assert store.stats() == {'cold_fits': 2, 'warm_fits': 0, 'extends': 2, 'reuses': 0, 'tickers': 1}
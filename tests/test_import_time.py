@@ -0,0 +1,31 @@
+"""
+Import-time budget for the serverless API entry point.
+"""
+import importlib.util
+import os
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous enough for slow CI machines; cold start on a laptop is well under half
+IMPORT_BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', '2000'))
+
+@pytest.fixture(scope='module')
+def importtime_report():
+    spec = importlib.util.spec_from_file_location(
+        'importtime_report', os.path.join(REPO_ROOT, 'scripts', 'importtime_report.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_api_import_skips_heavy_dependencies(importtime_report):
+    """Test that importing the API does not load arch, plotly, scipy, sklearn or yfinance."""
+    report = importtime_report.measure_imports('api.main')
+    assert report['heavy_modules_loaded'] == []
+
+def test_api_import_time_budget(importtime_report):
+    """Test that importing the API stays within the cold-start budget."""
+    report = importtime_report.measure_imports('api.main')
+    assert report['total_ms'] < IMPORT_BUDGET_MS
@@ -0,0 +1,55 @@
+"""
+Test suite for stage timing instrumentation.
+"""
+import pytest
+
+from volatility.instrumentation import (
+    MetricsRegistry,
+    end_trace,
+    get_registry,
+    server_timing_header,
+    start_trace,
+    timed
+)
+
+def test_timed_records_histogram_and_trace():
+    """Test that timed() feeds both the registry and the active trace, even on errors."""
+    get_registry().clear()
+
+    @timed('unit_stage')
+    def fail():
+        raise ValueError("boom")
+
+    token = start_trace()
+    with timed('unit_stage'):
+        pass
+    with pytest.raises(ValueError):
+        fail()
+    trace = end_trace(token)
+
+    assert [stage for stage, _ in trace] == ['unit_stage', 'unit_stage']
+    assert get_registry().stats()['unit_stage']['count'] == 2
+
+    # Outside a trace only the histogram is updated
+    with timed('unit_stage'):
+        pass
+    assert get_registry().stats()['unit_stage']['count'] == 3
+
+def test_prometheus_rendering():
+    """Test cumulative buckets, sum and count in the exposition format."""
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 2.0):
+        registry.observe('fit', seconds)
+
+    text = registry.render_prometheus()
+    assert '# TYPE volatility_stage_duration_seconds histogram' in text
+    assert 'volatility_stage_duration_seconds_bucket{stage="fit",le="0.1"} 1' in text
+    assert 'volatility_stage_duration_seconds_bucket{stage="fit",le="1"} 2' in text
+    assert 'volatility_stage_duration_seconds_bucket{stage="fit",le="+Inf"} 3' in text
+    assert 'volatility_stage_duration_seconds_sum{stage="fit"} 2.55' in text
+    assert 'volatility_stage_duration_seconds_count{stage="fit"} 3' in text
+
+def test_server_timing_header_sums_repeated_stages():
+    """Test the Server-Timing header format."""
+    header = server_timing_header([('fetch', 0.012), ('garch_fit', 0.1), ('fetch', 0.003)])
+    assert header == 'fetch;dur=15.0, garch_fit;dur=100.0'
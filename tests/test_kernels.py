@@ -0,0 +1,66 @@
+"""
+Test suite for the rolling-window kernels.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility.kernels import (
+    log_returns,
+    rolling_mean,
+    rolling_std,
+    rolling_volatility,
+    rolling_volatility_frame
+)
+
+WINDOWS = [10, 20, 30, 60, 90]
+
+@pytest.fixture
+def prices():
+    dates = pd.date_range(start='2020-01-01', periods=600, freq='B')
+    rng = np.random.default_rng(11)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates)))), index=dates)
+
+def test_rolling_volatility_matches_pandas(prices):
+    """Test every window against a pandas rolling std of log returns."""
+    volatility = rolling_volatility(prices.to_numpy(), WINDOWS)
+    returns = np.log(prices / prices.shift(1))
+
+    assert volatility.shape == (len(WINDOWS), len(prices))
+    for i, window in enumerate(WINDOWS):
+        expected = returns.rolling(window=window).std() * np.sqrt(252) * 100
+        np.testing.assert_allclose(volatility[i], expected.to_numpy(), rtol=1e-9, equal_nan=True)
+
+def test_rolling_kernels_on_matrix(prices):
+    """Test that 2-D input gives one column per series."""
+    matrix = np.column_stack([prices.to_numpy(), prices.to_numpy() ** 1.5])
+    returns = log_returns(matrix)
+    stds = rolling_std(returns, WINDOWS)
+    means = rolling_mean(returns, WINDOWS)
+
+    assert stds.shape == means.shape == (len(WINDOWS),) + matrix.shape
+    frame = pd.DataFrame(returns)
+    for i, window in enumerate(WINDOWS):
+        np.testing.assert_allclose(stds[i], frame.rolling(window).std().to_numpy(),
+                                   rtol=1e-9, equal_nan=True)
+        np.testing.assert_allclose(means[i], frame.rolling(window).mean().to_numpy(),
+                                   rtol=1e-9, atol=1e-15, equal_nan=True)
+
+def test_rolling_kernels_propagate_gaps():
+    """Test that windows touching a NaN are NaN, as in pandas."""
+    values = np.arange(20, dtype=float)
+    values[7] = np.nan
+
+    expected = pd.Series(values).rolling(5).mean().to_numpy()
+    np.testing.assert_allclose(rolling_mean(values, 5)[0], expected, equal_nan=True)
+    assert np.isnan(rolling_std(values, 30)).all()
+
+def test_rolling_volatility_frame(prices):
+    """Test the pandas wrapper."""
+    frame = rolling_volatility_frame(prices, WINDOWS)
+
+    assert list(frame.columns) == WINDOWS
+    assert frame.index.equals(prices.index)
+
+    with pytest.raises(ValueError):
+        rolling_volatility_frame(prices, [0])
@@ -0,0 +1,79 @@
+"""
+Test suite for the online volatility state.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility.models import (
+    calculate_ewma_forecast,
+    calculate_historical_volatility,
+    calculate_parkinson_volatility,
+    fit_garch
+)
+from volatility.online import OnlineVolatility
+
+@pytest.fixture
+def ohlc_data():
+    dates = pd.date_range(start='2022-01-03', periods=300, freq='B')
+    rng = np.random.default_rng(16)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.012, len(dates))))
+    spread = np.abs(rng.normal(0, 0.006, len(dates)))
+    return pd.DataFrame({
+        'Open': close,
+        'High': close * (1 + spread),
+        'Low': close * (1 - spread),
+        'Close': close
+    }, index=dates)
+
+def test_online_matches_batch(ohlc_data):
+    """Test that bar-by-bar updates reproduce the batch estimators."""
+    prices = ohlc_data['Close']
+    garch_fit = fit_garch(prices.iloc[:250])
+    state = OnlineVolatility.from_prices(prices.iloc[:250], ohlc_data.iloc[:250],
+                                         window=20, garch_fit=garch_fit)
+    for date, bar in ohlc_data.iloc[250:].iterrows():
+        state.update(bar['Close'], bar['High'], bar['Low'], date=date)
+
+    assert state.ewma_volatility == pytest.approx(calculate_ewma_forecast(prices).iloc[0], rel=1e-10)
+    assert state.historical_volatility == pytest.approx(
+        calculate_historical_volatility(prices, 20).iloc[-1], rel=1e-9)
+    assert state.parkinson_volatility == pytest.approx(
+        calculate_parkinson_volatility(ohlc_data, 20).iloc[-1], rel=1e-9)
+    np.testing.assert_allclose(state.garch_fit().forecast_variance(5),
+                               garch_fit.extend(prices).forecast_variance(5), rtol=1e-10)
+
+def test_online_revises_last_bar(ohlc_data):
+    """Test that intraday ticks on the same date replace the last bar."""
+    prices = ohlc_data['Close']
+    state = OnlineVolatility.from_prices(prices.iloc[:-1], window=20,
+                                         garch_fit=fit_garch(prices.iloc[:-1]))
+    last_date = prices.index[-1]
+    for tick in (prices.iloc[-2] * 1.05, prices.iloc[-2] * 0.97, prices.iloc[-1]):
+        state.update(tick, date=last_date)
+
+    expected = OnlineVolatility.from_prices(prices, window=20, garch_fit=fit_garch(prices.iloc[:-1]))
+    assert state.n_returns == expected.n_returns
+    assert state.ewma_volatility == pytest.approx(expected.ewma_volatility, rel=1e-12)
+    assert state.historical_volatility == pytest.approx(expected.historical_volatility, rel=1e-12)
+    assert state.garch_variance == pytest.approx(expected.garch_variance, rel=1e-12)
+
+    with pytest.raises(ValueError):
+        state.update(100.0, date=prices.index[0])
+
+def test_online_snapshot_roundtrip(ohlc_data):
+    """Test that a JSON snapshot restores a state that keeps updating identically."""
+    prices = ohlc_data['Close']
+    state = OnlineVolatility.from_prices(prices.iloc[:-1], ohlc_data.iloc[:-1], window=20,
+                                         garch_fit=fit_garch(prices.iloc[:-1]))
+    restored = OnlineVolatility.from_dict(json.loads(json.dumps(state.to_dict())))
+
+    bar = ohlc_data.iloc[-1]
+    for s in (state, restored):
+        s.update(bar['Close'], bar['High'], bar['Low'], date=ohlc_data.index[-1])
+    assert restored.ewma_volatility == state.ewma_volatility
+    assert restored.historical_volatility == state.historical_volatility
+    assert restored.parkinson_volatility == state.parkinson_volatility
+    assert restored.garch_variance == state.garch_variance
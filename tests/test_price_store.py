@@ -0,0 +1,153 @@
+"""
+Test suite for the price history cache.
+"""
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.price_store import PriceProvider, PriceStore, normalize_bars
+
+class FakeProvider(PriceProvider):
+    """Serves bars from a fixed frame and records every request."""
+
+    def __init__(self, bars: pd.DataFrame):
+        self.bars = bars
+        self.calls = []
+
+    def fetch(self, ticker, start, end):
+        self.calls.append((ticker, pd.Timestamp(start), pd.Timestamp(end)))
+        return self.bars.loc[start:end]
+
+def make_bars(start='2024-01-01', periods=60):
+    dates = pd.date_range(start=start, periods=periods, freq='B')
+    close = 100 + np.arange(periods, dtype=float)
+    return pd.DataFrame({
+        'Open': close,
+        'High': close + 1,
+        'Low': close - 1,
+        'Close': close,
+        'Volume': 1000.0
+    }, index=dates)
+
+@pytest.fixture
+def provider():
+    return FakeProvider(make_bars())
+
+def test_miss_then_hit(provider):
+    """Test that a second request within the TTL does not hit the provider."""
+    store = PriceStore(provider=provider, ttl=60)
+
+    first = store.get_history('SPY', datetime(2024, 1, 1), datetime(2024, 3, 1))
+    second = store.get_history('SPY', datetime(2024, 1, 15), datetime(2024, 3, 1))
+
+    assert len(provider.calls) == 1
+    assert second.index[0] >= pd.Timestamp('2024-01-15')
+    pd.testing.assert_frame_equal(second, first.loc['2024-01-15':])
+    assert store.stats()['misses'] == 1
+    assert store.stats()['hits'] == 1
+
+def test_top_up_fetches_only_new_bars():
+    """Test that a stale entry is topped up from its last stored date."""
+    full = make_bars(periods=60)
+    provider = FakeProvider(full.iloc[:40])
+    store = PriceStore(provider=provider, ttl=0)
+
+    store.get_history('SPY', datetime(2024, 1, 1), datetime(2024, 6, 1))
+    last_stored = full.index[39]
+    provider.bars = full
+    time.sleep(0.01)
+    bars = store.get_history('SPY', datetime(2024, 1, 1), datetime(2024, 6, 1))
+
+    assert provider.calls[-1][1] == last_stored
+    pd.testing.assert_frame_equal(bars, full, check_freq=False)
+    assert store.stats()['topups'] == 1
+
+def test_earlier_start_is_a_miss(provider):
+    """Test that a request reaching before the cached range refetches."""
+    store = PriceStore(provider=provider, ttl=60)
+
+    store.get_history('SPY', datetime(2024, 2, 1), datetime(2024, 3, 1))
+    store.get_history('SPY', datetime(2024, 1, 1), datetime(2024, 3, 1))
+
+    assert len(provider.calls) == 2
+    assert store.stats()['misses'] == 2
+
+def test_lru_eviction(provider):
+    """Test that the in-memory tier keeps at most max_entries tickers."""
+    store = PriceStore(provider=provider, max_entries=2, ttl=60)
+
+    for ticker in ['SPY', 'QQQ', 'IWM']:
+        store.get_history(ticker, datetime(2024, 1, 1), datetime(2024, 3, 1))
+    store.get_history('SPY', datetime(2024, 1, 1), datetime(2024, 3, 1))
+
+    stats = store.stats()
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 2
+    assert stats['misses'] == 4
+
+def test_disk_tier(provider, tmp_path):
+    """Test that bars survive a restart through the Parquet files."""
+    pytest.importorskip('pyarrow')
+    store = PriceStore(provider=provider, cache_dir=str(tmp_path), ttl=60)
+    expected = store.get_history('SPY', datetime(2024, 1, 1), datetime(2024, 3, 1))
+
+    restarted = PriceStore(provider=provider, cache_dir=str(tmp_path), ttl=60)
+    bars = restarted.get_history('SPY', datetime(2024, 1, 1), datetime(2024, 3, 1))
+
+    assert len(provider.calls) == 1
+    assert restarted.stats()['disk_hits'] == 1
+    pd.testing.assert_frame_equal(bars, expected, check_freq=False)
+
+    restarted.disk_max_age = 0
+    time.sleep(0.01)
+    assert restarted.evict_expired() == 1
+    assert not list(tmp_path.iterdir())
+
+def test_interrupted_write_keeps_previous_files(tmp_path):
+    """Test that a failed Parquet write leaves the previous bars and metadata in place."""
+    pytest.importorskip('pyarrow')
+    provider = FakeProvider(make_bars())
+    store = PriceStore(provider=provider, cache_dir=str(tmp_path), ttl=0)
+    expected = store.get_history('SPY', datetime(2024, 1, 1), datetime(2024, 2, 1))
+    meta = (tmp_path / 'SPY.json').read_text()
+
+    def truncated_write(self, path, *args, **kwargs):
+        with open(path, 'wb') as fh:
+            fh.write(b'PAR1')
+        raise OSError("disk full")
+
+    provider.bars = make_bars(periods=70)
+    with patch.object(pd.DataFrame, 'to_parquet', truncated_write):
+        with pytest.raises(OSError):
+            store.get_history('SPY', datetime(2024, 1, 1), datetime(2024, 4, 1))
+
+    assert (tmp_path / 'SPY.json').read_text() == meta
+    restarted = PriceStore(provider=provider, cache_dir=str(tmp_path))
+    bars = restarted.get_history('SPY', datetime(2024, 1, 1), datetime(2024, 2, 1))
+    assert restarted.stats()['disk_hits'] == 1
+    pd.testing.assert_frame_equal(bars, expected, check_freq=False)
+
+def test_tickers_cannot_leave_cache_dir(provider, tmp_path):
+    """Test that tickers outside the symbol alphabet are rejected before any file access."""
+    cache_dir = tmp_path / 'prices'
+    store = PriceStore(provider=provider, cache_dir=str(cache_dir))
+    for ticker in ['../../X', 'A/B', 'spy', '']:
+        with pytest.raises(ValueError):
+            store.get_history(ticker, datetime(2024, 1, 1), datetime(2024, 3, 1))
+    assert not provider.calls
+    assert list(tmp_path.iterdir()) == [cache_dir]
+
+    for ticker in ['^GSPC', 'ES=F', 'BRK-B', 'BF.B']:
+        assert not store.get_history(ticker, datetime(2024, 1, 1), datetime(2024, 3, 1)).empty
+
+def test_normalize_multi_ticker_columns():
+    """Test flattening of grouped multi-ticker downloads."""
+    bars = make_bars(periods=5)
+    grouped = pd.concat({'SPY': bars, 'QQQ': bars * 2}, axis=1)
+
+    pd.testing.assert_frame_equal(normalize_bars(grouped, 'QQQ'), bars * 2)
+    assert normalize_bars(grouped, 'IWM').empty
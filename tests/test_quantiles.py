@@ -0,0 +1,39 @@
+"""
+Test suite for the cached normal quantiles.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility.models import get_confidence_bands, get_confidence_intervals
+from volatility.quantiles import normal_bands, two_sided_z
+
+def test_two_sided_z():
+    """Test the z-scores of common two-sided levels."""
+    assert two_sided_z(0.95) == pytest.approx(1.959964, abs=1e-6)
+    assert two_sided_z(0.99) == pytest.approx(2.575829, abs=1e-6)
+    assert two_sided_z(0.6827) == pytest.approx(1.0, abs=1e-3)
+    with pytest.raises(ValueError):
+        two_sided_z(1.0)
+
+def test_normal_bands_match_single_levels():
+    """Test that one multi-level call equals per-level calls."""
+    center = np.array([10.0, 12.0, 15.0])
+    bands = normal_bands(center, 2.0, [0.68, 0.9, 0.95, 0.99])
+
+    assert list(bands) == [0.68, 0.9, 0.95, 0.99]
+    for level, (lower, upper) in bands.items():
+        np.testing.assert_allclose(upper - center, two_sided_z(level) * 2.0)
+        np.testing.assert_allclose(center - lower, two_sided_z(level) * 2.0)
+
+def test_confidence_intervals_are_deterministic():
+    """Test that identical inputs give identical two-sided bands."""
+    forecast = pd.Series([20.0, 21.0], index=pd.date_range('2024-01-01', periods=2))
+    first = get_confidence_intervals(forecast, 3.0, 0.95)
+    second = get_confidence_intervals(forecast, 3.0, 0.95)
+
+    pd.testing.assert_series_equal(first[1], second[1])
+    assert first[1].iloc[0] == pytest.approx(20.0 + 1.959964 * 3.0)
+
+    bands = get_confidence_bands(forecast, 3.0, [0.9, 0.95])
+    pd.testing.assert_series_equal(bands[0.95][0], first[0])
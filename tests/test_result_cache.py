@@ -0,0 +1,52 @@
+"""
+Test suite for the forecast result cache backends.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.result_cache import DiskResultCache, MemoryResultCache, make_cache_key
+
+@pytest.fixture
+def history():
+    dates = pd.date_range(start='2024-01-01', periods=30, freq='B')
+    close = 100 + np.arange(30, dtype=float)
+    return pd.DataFrame({'High': close + 1, 'Low': close - 1, 'Close': close}, index=dates)
+
+def test_cache_key_tracks_last_bar(history):
+    """Test that the key changes with a new or revised bar but not otherwise."""
+    key = make_cache_key('SPY', 20, 5, 0.95, history)
+
+    assert key == make_cache_key('SPY', 20, 5, 0.95, history.copy())
+    assert key != make_cache_key('SPY', 20, 10, 0.95, history)
+    assert key != make_cache_key('SPY', 20, 5, 0.95, history, include_charts=True)
+
+    revised = history.copy()
+    revised.iloc[-1, revised.columns.get_loc('Close')] += 0.5
+    assert key != make_cache_key('SPY', 20, 5, 0.95, revised)
+
+    next_bar = history.iloc[[-1]].set_axis([history.index[-1] + pd.Timedelta(days=1)])
+    assert key != make_cache_key('SPY', 20, 5, 0.95, pd.concat([history, next_bar]))
+
+def test_memory_cache_lru():
+    """Test LRU eviction and hit/miss counters."""
+    cache = MemoryResultCache(max_entries=2)
+    cache.set('a', {'value': 1})
+    cache.set('b', {'value': 2})
+    assert cache.get('a') == {'value': 1}
+    cache.set('c', {'value': 3})
+
+    assert cache.get('b') is None
+    assert cache.get('c') == {'value': 3}
+    assert cache.stats() == {'hits': 2, 'misses': 1}
+
+def test_disk_cache(tmp_path):
+    """Test that results persist on disk and expire after max_age."""
+    cache = DiskResultCache(str(tmp_path))
+    cache.set('a', {'value': [1.0, 2.0]})
+
+    assert DiskResultCache(str(tmp_path)).get('a') == {'value': [1.0, 2.0]}
+
+    expired = DiskResultCache(str(tmp_path), max_age=-1)
+    assert expired.get('a') is None
+    assert not list(tmp_path.iterdir())
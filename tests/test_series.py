@@ -0,0 +1,90 @@
+"""
+Test suite for the compact series and the models running on them.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility.garch_store import GarchModelStore
+from volatility.models import (
+    VolatilityEnsemble,
+    calculate_ewma_forecast,
+    calculate_historical_volatility,
+    calculate_parkinson_volatility,
+    fit_garch
+)
+from volatility.series import CompactFrame, CompactSeries, after, has_date, last_date
+
+@pytest.fixture
+def ohlc():
+    dates = pd.date_range(start='2022-01-03', periods=400, freq='B')
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.012, len(dates))))
+    open_ = close * np.exp(rng.normal(0, 0.003, len(dates)))
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * 1.004,
+        'Low': np.minimum(open_, close) * 0.996,
+        'Close': close
+    }, index=dates)
+
+def test_round_trip_and_views(ohlc):
+    """Test pandas conversion, int32 days, float32 storage and view slicing."""
+    prices = CompactSeries.from_pandas(ohlc['Close'])
+    assert prices.days.dtype == np.int32
+    assert prices.values.flags.c_contiguous
+    pd.testing.assert_series_equal(prices.to_pandas(), ohlc['Close'], check_freq=False)
+
+    single = CompactSeries.from_pandas(ohlc['Close'], dtype=np.float32)
+    assert single.dtype == np.float32
+    assert single.nbytes == len(ohlc) * 8
+
+    tail = prices.iloc[-10:]
+    assert np.shares_memory(tail.values, prices.values)
+    assert tail.iloc[-1] == ohlc['Close'].iloc[-1]
+    with pytest.raises(ValueError):
+        CompactSeries(prices.days, prices.values[1:])
+
+def test_date_helpers(ohlc):
+    prices = CompactSeries.from_pandas(ohlc['Close'])
+    cutoff = ohlc.index[-5]
+    assert last_date(prices) == last_date(ohlc['Close']) == ohlc.index[-1]
+    assert len(after(prices, cutoff)) == len(after(ohlc['Close'], cutoff)) == 4
+    assert has_date(prices, cutoff) and not has_date(prices, pd.Timestamp('2022-01-01'))
+
+def test_models_return_input_type(ohlc):
+    """Test that compact inputs give compact outputs equal to the pandas results."""
+    prices = CompactSeries.from_pandas(ohlc['Close'])
+    bars = CompactFrame.from_pandas(ohlc)
+
+    for function, compact_input, pandas_input in [
+        (calculate_historical_volatility, prices, ohlc['Close']),
+        (calculate_ewma_forecast, prices, ohlc['Close']),
+        (calculate_parkinson_volatility, bars, ohlc)
+    ]:
+        compact = function(compact_input)
+        expected = function(pandas_input)
+        assert isinstance(compact, CompactSeries)
+        np.testing.assert_allclose(compact.values, expected.to_numpy())
+        np.testing.assert_array_equal(compact.dates, expected.index.to_numpy(dtype='datetime64[D]'))
+
+def test_ensemble_on_compact_series(ohlc):
+    """Test that the ensemble and the GARCH store run on compact series unchanged."""
+    prices = CompactSeries.from_pandas(ohlc['Close'])
+    bars = CompactFrame.from_pandas(ohlc)
+    garch_fit = fit_garch(ohlc['Close'])
+
+    compact = VolatilityEnsemble()
+    compact.fit(prices, bars, garch_fit=garch_fit)
+    reference = VolatilityEnsemble()
+    reference.fit(ohlc['Close'], ohlc, garch_fit=garch_fit)
+
+    assert compact.prices is prices
+    assert compact.get_model_weights() == pytest.approx(reference.get_model_weights())
+    pd.testing.assert_series_equal(compact.predict().to_pandas(), reference.predict(), check_freq=False)
+
+    store = GarchModelStore(refit_every=10)
+    store.fit('SPY', prices.iloc[:-3])
+    extended = store.fit('SPY', prices)
+    assert store.stats()['extends'] == 1
+    assert extended.last_date == ohlc.index[-1]
@@ -0,0 +1,64 @@
+"""
+Test suite for the Monte Carlo forecast distributions.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility.models import GarchFit
+from volatility.simulation import (
+    garch_forecast_bands,
+    quantile_bands,
+    simulate_ewma_volatility,
+    simulate_garch_volatility
+)
+
+@pytest.fixture
+def garch_fit():
+    return GarchFit(
+        params={'mu': 0.05, 'omega': 0.05, 'alpha[1]': 0.1, 'beta[1]': 0.85},
+        conditional_variance=np.array([1.2, 1.5]),
+        residuals=np.array([0.4, -2.0]),
+        last_date=pd.Timestamp('2024-03-28'),
+        last_price=100.0
+    )
+
+def test_simulation_is_seeded_and_chunked(garch_fit):
+    """Test reproducibility per seed and the path array layout."""
+    first = simulate_garch_volatility(garch_fit, 10, n_paths=5_000, seed=7, chunk_size=1_000)
+    second = simulate_garch_volatility(garch_fit, 10, n_paths=5_000, seed=7, chunk_size=1_000)
+
+    assert first.shape == (5_000, 10)
+    assert first.dtype == np.float32
+    np.testing.assert_array_equal(first, second)
+    assert not np.array_equal(first, simulate_garch_volatility(garch_fit, 10, n_paths=5_000, seed=8))
+
+def test_simulated_variance_matches_analytic_forecast(garch_fit):
+    """Test that the mean simulated variance converges to the closed-form forecast."""
+    paths = simulate_garch_volatility(garch_fit, 20, n_paths=200_000, seed=1).astype(float)
+    simulated = (paths ** 2 / 252).mean(axis=0)
+    np.testing.assert_allclose(simulated, garch_fit.forecast_variance(20), rtol=0.02)
+
+    # Step 1 is known at the origin
+    assert np.ptp(paths[:, 0]) == pytest.approx(0.0, abs=1e-3)
+
+def test_ewma_simulation_preserves_variance():
+    """Test that the EWMA recursion keeps the expected variance flat."""
+    paths = simulate_ewma_volatility(1e-4, 10, n_paths=100_000, seed=3).astype(float)
+    np.testing.assert_allclose((paths ** 2).mean(axis=0), 1e-4 * 252 * 100 ** 2, rtol=0.02)
+
+def test_quantile_bands_nest(garch_fit):
+    """Test that wider confidence levels give wider bands."""
+    paths = simulate_garch_volatility(garch_fit, 5, n_paths=20_000, seed=2)
+    bands = quantile_bands(paths, [0.5, 0.95])
+
+    lower_50, upper_50 = bands[0.5]
+    lower_95, upper_95 = bands[0.95]
+    assert np.all(lower_95[1:] < lower_50[1:])
+    assert np.all(upper_95[1:] > upper_50[1:])
+
+    frame = garch_forecast_bands(garch_fit, 5, confidence_levels=[0.95])
+    assert list(frame.columns) == ['median', 'lower_95', 'upper_95']
+    assert frame.index.equals(garch_fit.forecast(5).index)
+    with pytest.raises(ValueError):
+        quantile_bands(paths, [1.0])
@@ -0,0 +1,131 @@
+"""
+Test suite for request coalescing.
+"""
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+import api.main as api_main
+from api.main import app
+from api.singleflight import SingleFlight
+
+def test_concurrent_calls_share_one_run():
+    """Test that callers with the same key await one call and get its result."""
+    flight = SingleFlight()
+    runs = []
+
+    async def compute(value):
+        runs.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def main():
+        same = [flight.do('SPY', lambda: compute('first')) for _ in range(5)]
+        other = flight.do('QQQ', lambda: compute('other'))
+        return await asyncio.gather(*same, other)
+
+    assert asyncio.run(main()) == ['first'] * 5 + ['other']
+    assert runs == ['first', 'other']
+    assert flight.stats() == {'calls': 2, 'shared': 4}
+    assert flight.in_flight() == 0
+
+def test_errors_are_shared_and_not_kept():
+    """Test that every caller sees the exception and a later call runs again."""
+    flight = SingleFlight()
+    runs = []
+
+    async def fail():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("no data")
+
+    async def main():
+        results = await asyncio.gather(*(flight.do('SPY', fail) for _ in range(3)),
+                                       return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        with pytest.raises(ValueError):
+            await flight.do('SPY', fail)
+
+    asyncio.run(main())
+    assert len(runs) == 2
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    """Test that a joined call finishes for the remaining callers."""
+    flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return 'done'
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do('SPY', compute))
+        follower = asyncio.ensure_future(flight.do('SPY', compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == 'done'
+
+def test_joinable_decides_on_in_flight_meta():
+    """Test that a caller needing more than the in-flight call runs its own."""
+    flight = SingleFlight()
+
+    async def fetch(start):
+        await asyncio.sleep(0.01)
+        return start
+
+    async def main():
+        return await asyncio.gather(
+            flight.do('SPY', lambda: fetch(10), meta=10),
+            flight.do('SPY', lambda: fetch(10), meta=10, joinable=lambda start: start <= 20),
+            flight.do('SPY', lambda: fetch(5), meta=5, joinable=lambda start: start <= 5)
+        )
+
+    assert asyncio.run(main()) == [10, 10, 5]
+    assert flight.stats() == {'calls': 2, 'shared': 1}
+
+@pytest.fixture
+def mock_yf_data():
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=100, freq='D')
+    prices = 100 * np.exp(np.cumsum(np.random.default_rng(42).normal(0, 0.01, 100)))
+    return pd.DataFrame({
+        'Open': prices,
+        'High': prices * 1.01,
+        'Low': prices * 0.99,
+        'Close': prices,
+        'Volume': 1000000
+    }, index=dates)
+
+def test_concurrent_requests_share_download_and_model_run(mock_yf_data):
+    """Test that identical requests fit once and other windows reuse the download."""
+    downloads = []
+
+    def slow_download(*args, **kwargs):
+        downloads.append(kwargs.get('start'))
+        time.sleep(0.2)
+        return mock_yf_data
+
+    compute = patch.object(api_main, '_compute_forecast', wraps=api_main._compute_forecast)
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            bodies = [{'ticker': 'SPY', 'historical_window': 40, 'include_charts': False}] * 4
+            bodies.append({'ticker': 'SPY', 'historical_window': 30, 'include_charts': False})
+            return await asyncio.gather(*(
+                client.post('/api/v1/volatility/forecast', json=body) for body in bodies
+            ))
+
+    with patch('yfinance.download', side_effect=slow_download), compute as compute_mock:
+        responses = asyncio.run(main())
+
+    assert [response.status_code for response in responses] == [200] * 5
+    assert len(downloads) == 1
+    assert compute_mock.call_count == 2
+    assert len({response.json()['historical_data'][0] for response in responses[:4]}) == 1
+    assert len(responses[4].json()['historical_data']) < len(responses[0].json()['historical_data'])
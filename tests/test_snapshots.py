@@ -0,0 +1,108 @@
+"""
+Test suite for the precomputed forecast snapshots.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.pipeline import compute_forecast, history_window
+from api.price_store import PriceProvider, PriceStore, get_price_store, set_price_store
+from api.snapshots import SnapshotStore, build_snapshot, set_snapshot_store, write_snapshot
+
+client = TestClient(app)
+
+def make_bars(periods=80, seed=0):
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=periods, freq='D')
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    return pd.DataFrame({
+        'Open': close,
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': 1000.0
+    }, index=dates)
+
+class UniverseProvider(PriceProvider):
+    """Serves a fixed frame per ticker and counts fetches."""
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.calls = 0
+
+    def fetch(self, ticker, start, end):
+        self.calls += 1
+        return self.bars.get(ticker, pd.DataFrame()).loc[start:end]
+
+@pytest.fixture
+def provider():
+    provider = UniverseProvider({'SPY': make_bars(seed=0), 'QQQ': make_bars(60, seed=1)})
+    set_price_store(PriceStore(provider=provider))
+    return provider
+
+@pytest.fixture
+def snapshot_path(tmp_path, provider):
+    path = str(tmp_path / 'forecasts.snap')
+    with pytest.warns(UserWarning, match='IWM'):
+        build_snapshot(['SPY', 'QQQ', 'IWM'], path, historical_window=20, forecast_horizon=5)
+    return path
+
+def test_lookup_matches_live_computation(snapshot_path, provider):
+    """Test that snapshot records hold the live result as views into the file."""
+    key, result = SnapshotStore(snapshot_path).lookup('QQQ', 20, 5)
+
+    hist_data = get_price_store().get_history('QQQ', *history_window(20))
+    expected = compute_forecast(hist_data, 'QQQ', historical_window=20)
+
+    for field in ('historical_data', 'forecast_data', 'ensemble_forecast', 'dates', 'forecast_dates'):
+        np.testing.assert_array_equal(result[field], expected[field])
+        assert not result[field].flags.owndata
+    assert result['model_weights'] == pytest.approx(expected['model_weights'])
+    assert key.endswith(':QQQ')
+
+def test_lookup_misses(snapshot_path):
+    """Test that other parameters, unknown tickers and stale snapshots are not served."""
+    store = SnapshotStore(snapshot_path)
+    assert store.lookup('SPY', 30, 5) is None
+    assert store.lookup('SPY', 20, 10) is None
+    assert store.lookup('IWM', 20, 5) is None
+    assert SnapshotStore(snapshot_path, max_age=-1).lookup('SPY', 20, 5) is None
+    assert SnapshotStore(snapshot_path + '.missing').lookup('SPY', 20, 5) is None
+    assert store.stats() == {'hits': 0, 'misses': 3, 'tickers': 2}
+
+def test_rebuild_is_picked_up(snapshot_path):
+    """Test that an open store switches to a replaced file and old views stay readable."""
+    store = SnapshotStore(snapshot_path)
+    _, old = store.lookup('SPY', 20, 5)
+    old_values = old['forecast_data'].copy()
+
+    replacement = {name: (value * 2 if name == 'forecast_data' else value) for name, value in old.items()}
+    write_snapshot(snapshot_path, {'SPY': replacement}, 20, 5)
+
+    _, new = store.lookup('SPY', 20, 5)
+    np.testing.assert_array_equal(new['forecast_data'], old_values * 2)
+    np.testing.assert_array_equal(old['forecast_data'], old_values)
+    assert store.lookup('QQQ', 20, 5) is None
+
+def test_api_serves_matching_requests_from_snapshot(snapshot_path, provider):
+    """Test that the endpoint skips fetching for matching requests and computes the rest live."""
+    set_snapshot_store(SnapshotStore(snapshot_path))
+    calls = provider.calls
+
+    body = {'ticker': 'spy', 'historical_window': 20, 'forecast_horizon': 5, 'include_charts': False}
+    response = client.post('/api/v1/volatility/forecast', json=body)
+    assert response.status_code == 200
+    assert provider.calls == calls
+    _, expected = SnapshotStore(snapshot_path).lookup('SPY', 20, 5)
+    assert response.json()['forecast_data'] == expected['forecast_data'].tolist()
+
+    response = client.post('/api/v1/volatility/forecast', json=body,
+                           headers={'If-None-Match': response.headers['etag']})
+    assert response.status_code == 304
+
+    # Another window needs live prices
+    response = client.post('/api/v1/volatility/forecast', json=dict(body, historical_window=25))
+    assert response.status_code == 200
+    assert provider.calls > calls
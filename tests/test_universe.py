@@ -0,0 +1,85 @@
+"""
+Test suite for parallel GARCH fitting across a universe.
+"""
+import multiprocessing
+import os
+import signal
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility import universe
+from volatility.models import fit_garch
+from volatility.universe import fit_garch_universe
+
+# The faulty fits below reach the workers by patching before the pool forks
+needs_fork = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                                reason="needs fork-started worker processes")
+
+_fit_column = universe._fit_column
+
+def _crash_on_constant(returns, timeout):
+    """Kill the worker, as a segfault would, for a ticker with constant prices."""
+    if np.all(returns[~np.isnan(returns)] == 0):
+        os._exit(1)
+    return _fit_column(returns, timeout)
+
+def _hang_on_constant(returns, timeout):
+    """Block in a way the SIGALRM timeout cannot interrupt, as native code can."""
+    if np.all(returns[~np.isnan(returns)] == 0):
+        signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGALRM])
+        time.sleep(60)
+    return _fit_column(returns, timeout)
+
+@pytest.fixture
+def prices_frame(simulate_garch_prices):
+    """Three GARCH(1,1) tickers and one with too little history."""
+    params = {'AAA': (0.05, 0.08, 0.9), 'BBB': (0.1, 0.1, 0.85), 'CCC': (0.02, 0.05, 0.93)}
+    frame = pd.DataFrame({
+        ticker: simulate_garch_prices(600, seed=seed, start='2021-01-01',
+                                      omega=omega, alpha=alpha, beta=beta)
+        for seed, (ticker, (omega, alpha, beta)) in enumerate(params.items(), start=9)
+    })
+    frame['NEW'] = np.nan
+    frame.iloc[-10:, frame.columns.get_loc('NEW')] = 50.0 + np.arange(10)
+    return frame
+
+def test_universe_matches_single_fits(prices_frame):
+    """Test parallel fits against one-at-a-time fits, with per-ticker isolation."""
+    table = fit_garch_universe(prices_frame, forecast_horizon=5, max_workers=2)
+
+    assert list(table.index) == ['AAA', 'BBB', 'CCC', 'NEW']
+    assert table.loc['NEW', 'status'] == 'insufficient_data'
+    assert np.isnan(table.loc['NEW', 'forecast_vol'])
+
+    for ticker in ['AAA', 'BBB', 'CCC']:
+        assert table.loc[ticker, 'status'] == 'ok'
+        expected = fit_garch(prices_frame[ticker])
+        assert table.loc[ticker, 'omega'] == pytest.approx(expected.params['omega'], rel=1e-4)
+        assert table.loc[ticker, 'beta'] == pytest.approx(expected.params['beta[1]'], rel=1e-4)
+        expected_vol = np.sqrt(expected.forecast_variance(5).mean() * 252)
+        assert table.loc[ticker, 'forecast_vol'] == pytest.approx(expected_vol, rel=1e-4)
+
+def test_universe_fit_timeout(prices_frame):
+    """Test that a fit exceeding its timeout is reported, not raised."""
+    table = fit_garch_universe(prices_frame[['AAA']], max_workers=1, timeout=1e-6)
+
+    assert table.loc['AAA', 'status'] == 'timeout'
+
+@needs_fork
+@pytest.mark.parametrize('faulty_fit, status', [(_crash_on_constant, 'failed'),
+                                                (_hang_on_constant, 'timeout')],
+                         ids=['crash', 'hang'])
+def test_broken_worker_fails_only_its_ticker(prices_frame, faulty_fit, status):
+    """Test that a dead or stuck worker fails its own ticker and the rest are refitted."""
+    frame = prices_frame[['AAA', 'BBB', 'CCC']].copy()
+    frame.insert(1, 'BAD', 100.0)
+
+    with patch.object(universe, '_fit_column', faulty_fit), patch.object(universe, 'HANG_GRACE', 0.5):
+        table = fit_garch_universe(frame, max_workers=2, timeout=2.0)
+
+    assert table.loc['BAD', 'status'] == status
+    assert (table.loc[['AAA', 'BBB', 'CCC'], 'status'] == 'ok').all()
@@ -6,10 +6,16 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+from unittest.mock import patch
+
 from volatility.models import (
     calculate_volatility,
     forecast_volatility,
-    get_confidence_intervals
+    get_confidence_intervals,
+    calculate_ewma_forecast,
+    ewma_variance,
+    fit_garch,
+    VolatilityEnsemble
 )
 
 @pytest.fixture
@@ -22,6 +28,11 @@ def sample_price_data():
     prices = 100 * np.exp(np.cumsum(returns))
     return pd.Series(prices, index=dates)
 
+@pytest.fixture
+def garch_price_data(simulate_garch_prices):
+    """Create prices following a GARCH(1,1) process."""
+    return simulate_garch_prices(750, seed=7)
+
 def test_calculate_volatility(sample_price_data):
     """Test basic volatility calculation."""
     vol = calculate_volatility(sample_price_data, window=20)
@@ -73,4 +84,87 @@ def test_invalid_inputs():
         
     # Test with non-numeric data
     with pytest.raises(Exception):
-        calculate_volatility(pd.Series(['a', 'b', 'c'])) 
\ No newline at end of file
+        calculate_volatility(pd.Series(['a', 'b', 'c'])) 
+
+def test_garch_fit_matches_arch_forecast(garch_price_data):
+    """Test the analytic GARCH forecast against arch's own forecast."""
+    from arch import arch_model
+
+    garch_fit = fit_garch(garch_price_data)
+    log_returns = 100 * np.log(garch_price_data / garch_price_data.shift(1)).dropna()
+    model_fit = arch_model(log_returns, vol='Garch', p=1, q=1, dist='normal').fit(
+        disp='off', show_warning=False
+    )
+    expected = model_fit.forecast(horizon=10).variance.iloc[-1].to_numpy()
+
+    np.testing.assert_allclose(garch_fit.forecast_variance(10), expected, rtol=1e-6)
+
+    forecast = garch_fit.forecast(10)
+    assert len(forecast) == 10
+    assert not forecast.isnull().any()
+    assert forecast.index[0] > garch_price_data.index[-1]
+
+def test_ensemble_fits_garch_once(sample_price_data):
+    """Test that fit() and predict() share a single GARCH fit."""
+    ensemble = VolatilityEnsemble(historical_window=30, forecast_horizon=5)
+
+    with patch('volatility.models.fit_garch', wraps=fit_garch) as mock_fit:
+        ensemble.fit(sample_price_data)
+        forecast = ensemble.predict()
+        garch_forecast = ensemble.get_model_forecasts()['garch']
+
+    assert mock_fit.call_count == 1
+    assert len(forecast) == len(garch_forecast) == 5
+    assert not np.isnan(list(ensemble.get_model_weights().values())).any()
+
+def test_term_structure_from_one_fit(garch_price_data):
+    """Test that every horizon comes from one variance forecast and the ensemble weights."""
+    ensemble = VolatilityEnsemble(historical_window=30, forecast_horizon=5)
+    ensemble.fit(garch_price_data)
+    terms = ensemble.term_structure([1, 5, 21, 63])
+
+    variance = ensemble.garch_fit.forecast_variance(63)
+    expected = [np.sqrt(variance[:h].mean() * 252) for h in (1, 5, 21, 63)]
+    np.testing.assert_allclose(terms['garch'], expected)
+    assert terms['garch'][0] == pytest.approx(ensemble.get_model_forecasts()['garch'].iloc[0])
+    np.testing.assert_allclose(terms['ewma'], ensemble.get_model_forecasts()['ewma'].iloc[0])
+
+    weights = ensemble.get_model_weights()
+    np.testing.assert_allclose(terms['ensemble'],
+                               weights['garch'] * terms['garch'] + weights['ewma'] * terms['ewma'])
+
+def _ewma_variance_loop(returns, lambda_param):
+    variance = np.empty(len(returns))
+    variance[0] = returns[0] ** 2
+    for t in range(1, len(returns)):
+        variance[t] = lambda_param * variance[t-1] + (1 - lambda_param) * returns[t] ** 2
+    return variance
+
+def test_ewma_variance_matches_recursion(sample_price_data):
+    """Test the vectorized EWMA against the plain recursion."""
+    returns = np.diff(np.log(sample_price_data.to_numpy()))
+
+    np.testing.assert_allclose(ewma_variance(returns, 0.94),
+                               _ewma_variance_loop(returns, 0.94), rtol=1e-12)
+
+    forecast = calculate_ewma_forecast(sample_price_data, forecast_horizon=5)
+    expected = np.sqrt(_ewma_variance_loop(returns, 0.94)[-1] * 252) * 100
+    np.testing.assert_allclose(forecast.to_numpy(), expected, rtol=1e-12)
+
+def test_ewma_variance_batches_series_and_decays():
+    """Test EWMA over several series and several decay factors in one call."""
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0, 0.01, size=(200, 3))
+    lambdas = np.array([0.9, 0.94, 0.97])
+
+    variances = ewma_variance(returns, lambdas)
+
+    assert variances.shape == (3, 200, 3)
+    for i, decay in enumerate(lambdas):
+        for j in range(returns.shape[1]):
+            np.testing.assert_allclose(variances[i, :, j],
+                                       _ewma_variance_loop(returns[:, j], decay),
+                                       rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        ewma_variance(returns, 1.5)
@@ -6,14 +6,65 @@ from .models import (
     calculate_historical_volatility,
     calculate_garch_forecast,
     calculate_ewma_forecast,
+    ewma_variance,
     calculate_parkinson_volatility,
+    fit_garch,
+    GarchFit,
     VolatilityEnsemble
 )
+from .kernels import rolling_volatility, rolling_volatility_frame
+from .series import CompactFrame, CompactSeries
+from .calendar import TradingCalendar, get_calendar
+from .estimators import ohlc_volatility_frame, range_volatility, range_volatility_suite
+
+# Imported on first access, so ``import volatility`` loads only the models
+# and what they already need
+_LAZY_EXPORTS = {
+    'GarchModelStore': 'garch_store',
+    'fit_garch_universe': 'universe',
+    'backtest_ensemble': 'backtest',
+    'backtest_universe': 'backtest',
+    'OnlineVolatility': 'online',
+    'simulate_garch_volatility': 'simulation',
+    'quantile_bands': 'simulation',
+    'garch_forecast_bands': 'simulation'
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        from importlib import import_module
+        value = getattr(import_module(f'.{_LAZY_EXPORTS[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
 __all__ = [
     'calculate_historical_volatility',
     'calculate_garch_forecast',
     'calculate_ewma_forecast',
+    'ewma_variance',
     'calculate_parkinson_volatility',
-    'VolatilityEnsemble'
+    'fit_garch',
+    'GarchFit',
+    'VolatilityEnsemble',
+    'CompactSeries',
+    'CompactFrame',
+    'TradingCalendar',
+    'get_calendar',
+    'GarchModelStore',
+    'fit_garch_universe',
+    'backtest_ensemble',
+    'backtest_universe',
+    'OnlineVolatility',
+    'simulate_garch_volatility',
+    'quantile_bands',
+    'garch_forecast_bands',
+    'rolling_volatility',
+    'rolling_volatility_frame',
+    'ohlc_volatility_frame',
+    'range_volatility',
+    'range_volatility_suite'
 ] 
\ No newline at end of file
@@ -0,0 +1,225 @@
+"""
+Walk-forward backtesting of the ensemble's volatility models.
+
+Every bar from ``min_train`` onwards is a forecast origin: each model
+forecasts the average volatility over the next ``forecast_horizon`` bars
+using only prices up to the origin, and the forecast is scored against the
+volatility realized over those bars. Models are updated incrementally rather
+than refitted per origin: EWMA and the rolling windows are single causal
+passes over the whole history, and GARCH is refitted (warm-started) every
+``refit_every`` origins with the variance recursion run forward in between.
+"""
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .estimators import range_volatility
+from .kernels import TRADING_DAYS, log_returns, rolling_mean, rolling_volatility
+from .models import RANGE_ESTIMATORS, ewma_variance, fit_garch
+
+LOSSES = ('qlike', 'mse')
+
+def realized_volatility(prices, forecast_horizon: int) -> np.ndarray:
+    """
+    Annualized volatility in percent realized over the bars after each bar.
+
+    Returns:
+        Array shaped like ``prices``; entry t is the root mean squared log
+        return of bars t+1..t+forecast_horizon, NaN where those bars are missing
+    """
+    squares = log_returns(prices) ** 2
+    forward_mean = np.full(squares.shape, np.nan)
+    forward_mean[:-forecast_horizon] = rolling_mean(squares, forecast_horizon)[0, forecast_horizon:]
+    return np.sqrt(forward_mean * TRADING_DAYS) * 100
+
+def qlike_loss(forecast_variance, realized_variance) -> np.ndarray:
+    """QLIKE loss, robust to noise in the realized variance proxy (Patton, 2011)."""
+    forecast_variance = np.asarray(forecast_variance, dtype=float)
+    return np.log(forecast_variance) + np.asarray(realized_variance, dtype=float) / forecast_variance
+
+def mse_loss(forecast_variance, realized_variance) -> np.ndarray:
+    """Squared error between forecast and realized variance."""
+    return (np.asarray(forecast_variance, dtype=float) - np.asarray(realized_variance, dtype=float)) ** 2
+
+def _garch_forecasts(prices: pd.Series,
+                     origins: np.ndarray,
+                     forecast_horizon: int,
+                     refit_every: int) -> np.ndarray:
+    """Mean annualized GARCH volatility over the horizon for contiguous origins."""
+    forecasts = np.empty(len(origins))
+    params: Optional[Dict[str, float]] = None
+    for start in range(0, len(origins), refit_every):
+        block = origins[start:start + refit_every]
+        with warnings.catch_warnings():
+            # arch warns and cold-starts when the previous fit sits on a constraint
+            warnings.simplefilter('ignore')
+            fit = fit_garch(prices.iloc[:block[0] + 1], starting_values=params)
+        params = fit.params
+        fit = fit.extend(prices.iloc[:block[-1] + 1])
+
+        # One-step variances at every origin of the block, then the analytic path
+        omega, alpha, beta = params['omega'], params['alpha[1]'], params['beta[1]']
+        next_var = (omega
+                    + alpha * fit.residuals[-len(block):] ** 2
+                    + beta * fit.conditional_variance[-len(block):])
+        powers = fit.persistence ** np.arange(forecast_horizon)
+        partial_sums = np.concatenate(([0.0], np.cumsum(powers[:-1])))
+        paths = omega * partial_sums + powers * next_var[:, None]
+        forecasts[start:start + len(block)] = np.sqrt(np.maximum(paths, 0.0) * TRADING_DAYS).mean(axis=1)
+    return forecasts
+
+class BacktestResult:
+    """
+    Aligned out-of-sample forecasts and realized volatility of a backtest.
+
+    Attributes:
+        forecasts: Annualized volatility forecasts in percent, one column per
+            model plus ``ensemble``, indexed by forecast origin
+        realized: Volatility realized over the horizon after each origin
+        forecast_horizon: Number of bars each forecast covers
+    """
+
+    def __init__(self, forecasts: pd.DataFrame, realized: pd.Series, forecast_horizon: int):
+        self.forecasts = forecasts
+        self.realized = realized
+        self.forecast_horizon = forecast_horizon
+
+    def losses(self, loss: str = 'qlike') -> pd.DataFrame:
+        """Per-origin loss of every model, computed on variances."""
+        if loss not in LOSSES:
+            raise ValueError(f"Unknown loss '{loss}'; expected one of {', '.join(LOSSES)}")
+        loss_fn = qlike_loss if loss == 'qlike' else mse_loss
+        values = loss_fn(self.forecasts.to_numpy() ** 2, self.realized.to_numpy()[:, None] ** 2)
+        return pd.DataFrame(values, index=self.forecasts.index, columns=self.forecasts.columns)
+
+    def scores(self) -> pd.DataFrame:
+        """Mean QLIKE and MSE per model, lower is better."""
+        scores = pd.DataFrame({loss: self.losses(loss).mean() for loss in LOSSES})
+        scores['n_forecasts'] = self.forecasts.notna().sum()
+        scores.index.name = 'model'
+        return scores
+
+def backtest_ensemble(prices: pd.Series,
+                      ohlc_data: Optional[pd.DataFrame] = None,
+                      historical_window: int = 30,
+                      forecast_horizon: int = 5,
+                      min_train: int = 250,
+                      refit_every: int = 20,
+                      lambda_param: float = 0.94,
+                      range_estimators: Tuple[str, ...] = RANGE_ESTIMATORS) -> BacktestResult:
+    """
+    Walk-forward backtest of the ensemble and its member models.
+
+    Each origin's ensemble forecast combines the members with the same
+    inverse-level weights VolatilityEnsemble computes from data up to it.
+
+    Args:
+        prices: Daily closing prices
+        ohlc_data: Optional OHLC bars on the same index; adds the Parkinson
+            level to the weights and the range estimators as members
+        historical_window: Window of the rolling and range estimators
+        forecast_horizon: Bars each forecast covers
+        min_train: Bars available at the first forecast origin
+        refit_every: Origins between GARCH refits; in between the fitted
+            recursion is run forward over the new bars
+        lambda_param: EWMA decay factor
+        range_estimators: Range estimators added when OHLC data is given
+
+    Returns:
+        The aligned forecasts and realized volatility
+    """
+    if forecast_horizon < 1:
+        raise ValueError("Forecast horizon must be at least 1")
+    if refit_every < 1:
+        raise ValueError("refit_every must be at least 1")
+    if min_train <= historical_window:
+        raise ValueError("min_train must exceed the historical window")
+    if len(prices) < min_train + forecast_horizon:
+        raise ValueError(f"Need at least {min_train + forecast_horizon} prices for this backtest")
+
+    closes = prices.to_numpy(dtype=float)
+    origins = np.arange(min_train - 1, len(closes) - forecast_horizon)
+
+    # Causal full-history passes; the value at an origin only uses bars up to it
+    returns = log_returns(closes)
+    ewma = np.full(len(closes), np.nan)
+    ewma[1:] = np.sqrt(ewma_variance(returns[1:], lambda_param) * TRADING_DAYS) * 100
+
+    forecasts = {
+        'garch': _garch_forecasts(prices, origins, forecast_horizon, refit_every),
+        'ewma': ewma[origins]
+    }
+    levels = dict(forecasts, historical=rolling_volatility(closes, historical_window)[0, origins])
+
+    if ohlc_data is not None:
+        ohlc = [ohlc_data[column].to_numpy(dtype=float) for column in ('Open', 'High', 'Low', 'Close')]
+        levels['parkinson'] = range_volatility(*ohlc, historical_window, 'parkinson')[0, origins]
+        for estimator in range_estimators:
+            forecasts[estimator] = levels[estimator] = range_volatility(
+                *ohlc, historical_window, estimator)[0, origins]
+
+    # Inverse-level weights over every member, applied to the forecasting ones
+    inverse = {name: 1 / (level + 1e-10) for name, level in levels.items()}
+    total = sum(inverse.values())
+    forecasts['ensemble'] = np.abs(sum(inverse[name] / total * forecasts[name] for name in forecasts))
+
+    index = prices.index[origins]
+    return BacktestResult(
+        forecasts=pd.DataFrame(forecasts, index=index),
+        realized=pd.Series(realized_volatility(closes, forecast_horizon)[origins], index=index,
+                           name='realized'),
+        forecast_horizon=forecast_horizon
+    )
+
+def _backtest_scores(prices: pd.Series, options: dict) -> pd.DataFrame:
+    """Worker entry point: backtest one ticker and return its scores."""
+    return backtest_ensemble(prices.dropna(), **options).scores()
+
+def backtest_universe(prices_frame: pd.DataFrame,
+                      max_workers: Optional[int] = None,
+                      **options) -> pd.DataFrame:
+    """
+    Backtest every ticker of a closing price frame in parallel.
+
+    Args:
+        prices_frame: Daily closing prices, one column per ticker
+        max_workers: Worker processes (defaults to the CPU count); 1 runs in
+            the calling process
+        **options: Passed to backtest_ensemble
+
+    Returns:
+        Scores indexed by (ticker, model); tickers whose backtest fails are
+        left out with a warning
+    """
+    tickers = list(prices_frame.columns)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    results: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, str] = {}
+    if max_workers == 1 or len(tickers) == 1:
+        for ticker in tickers:
+            try:
+                results[ticker] = _backtest_scores(prices_frame[ticker], options)
+            except Exception as e:
+                errors[ticker] = str(e)
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(tickers))) as executor:
+            futures = {
+                ticker: executor.submit(_backtest_scores, prices_frame[ticker], options)
+                for ticker in tickers
+            }
+            for ticker, future in futures.items():
+                try:
+                    results[ticker] = future.result()
+                except Exception as e:
+                    errors[ticker] = str(e)
+
+    if errors:
+        warnings.warn("Backtest failed for " + "; ".join(f"{t}: {e}" for t, e in errors.items()))
+    if not results:
+        return pd.DataFrame(columns=list(LOSSES) + ['n_forecasts'])
+    return pd.concat(results, names=['ticker'])
@@ -0,0 +1,181 @@
+"""
+NYSE trading calendar for forecast dates.
+
+Forecasts are dated on the exchange sessions that follow the last bar, so
+weekends and NYSE holidays are skipped. ``TradingCalendar`` precomputes the
+sessions of a date range once, together with a per-calendar-day table of
+the next session, so "the next N sessions after a date" is an index lookup
+and a slice (a read-only view, no allocation). ISO strings for the dates in
+the range are built once and shared by every response.
+
+Holiday rules (``nyse_holidays``): New Year's Day, Martin Luther King Jr. Day
+(from 1998), Washington's Birthday, Good Friday, Memorial Day, Juneteenth
+(from 2022), Independence Day, Labor Day, Thanksgiving and Christmas. A
+holiday on a Sunday is observed on Monday and one on a Saturday on Friday,
+except New Year's Day, which then is not observed. Unscheduled closures
+since 1985 are listed in ``SPECIAL_CLOSURES``.
+
+Earlier years had closures these rules do not know (election days through
+1980, the 1968 paperwork-crisis Wednesdays, the 1977 blackout and others), so
+the calendar starts at ``FIRST_SESSION_DATE``: session lookups before it
+raise ValueError instead of returning wrong days.
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# First date the holiday rules and SPECIAL_CLOSURES are complete for
+FIRST_SESSION_DATE = '1985-01-01'
+
+# Unscheduled full-day closures (weather, national mourning, September 11)
+SPECIAL_CLOSURES = (
+    '1985-09-27', '1994-04-27', '2001-09-11', '2001-09-12', '2001-09-13',
+    '2001-09-14', '2004-06-11', '2007-01-02', '2012-10-29', '2012-10-30',
+    '2018-12-05', '2025-01-09'
+)
+
+def easter_sunday(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month, day = divmod(h + l - 7 * m + 90, 25)
+    return date(year, month, (h + l - 7 * m + 33 * month + 19) % 32)
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The nth given weekday (Monday=0) of a month; n=-1 is the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def _observed(holiday: date) -> date:
+    """Saturday holidays are observed on Friday, Sunday holidays on Monday."""
+    if holiday.weekday() == 5:
+        return holiday - timedelta(days=1)
+    if holiday.weekday() == 6:
+        return holiday + timedelta(days=1)
+    return holiday
+
+def nyse_holidays(start_year: int, end_year: int) -> np.ndarray:
+    """
+    NYSE full-day holidays and special closures.
+
+    Args:
+        start_year: First year, inclusive
+        end_year: Last year, inclusive
+
+    Returns:
+        Sorted datetime64[D] array of weekdays the exchange is closed
+    """
+    holidays = []
+    for year in range(start_year, end_year + 1):
+        new_year = date(year, 1, 1)
+        if new_year.weekday() != 5:
+            holidays.append(_observed(new_year))
+        if year >= 1998:
+            holidays.append(_nth_weekday(year, 1, 0, 3))
+        holidays.append(_nth_weekday(year, 2, 0, 3))
+        holidays.append(easter_sunday(year) - timedelta(days=2))
+        holidays.append(_nth_weekday(year, 5, 0, -1))
+        if year >= 2022:
+            holidays.append(_observed(date(year, 6, 19)))
+        holidays.append(_observed(date(year, 7, 4)))
+        holidays.append(_nth_weekday(year, 9, 0, 1))
+        holidays.append(_nth_weekday(year, 11, 3, 4))
+        holidays.append(_observed(date(year, 12, 25)))
+
+    days = np.array(holidays, dtype='datetime64[D]')
+    special = np.array(SPECIAL_CLOSURES, dtype='datetime64[D]')
+    days = np.concatenate([days, special[(special >= days.min()) & (special <= days.max())]])
+    return np.unique(days)
+
+def _as_day(value) -> np.datetime64:
+    if isinstance(value, np.datetime64):
+        return value.astype('datetime64[D]')
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+class TradingCalendar:
+    """
+    Precomputed exchange sessions between two dates.
+
+    Args:
+        holidays: Weekdays the exchange is closed, as datetime64[D]
+        start: First calendar day covered
+        end: Last calendar day covered
+    """
+
+    __slots__ = ('first_day', 'sessions', '_sessions_through', '_iso')
+
+    def __init__(self, holidays: np.ndarray, start: str = FIRST_SESSION_DATE, end: str = '2100-12-31'):
+        self.first_day = np.datetime64(start, 'D')
+        days = np.arange(self.first_day, np.datetime64(end, 'D') + 1)
+        self.sessions = days[np.is_busday(days, holidays=holidays)]
+        self.sessions.flags.writeable = False
+        # Number of sessions on or before each calendar day, which is also the
+        # position of the first session after it
+        self._sessions_through = np.searchsorted(self.sessions, days, side='right').astype(np.int32)
+        self._iso: List[str] = []
+
+    def _offset(self, day: np.datetime64) -> int:
+        offset = int((day - self.first_day).astype(np.int64))
+        if not 0 <= offset < len(self._sessions_through):
+            raise ValueError(f"{day} is outside the calendar")
+        return offset
+
+    def is_session(self, value) -> bool:
+        """Whether the exchange is open on a date."""
+        offset = self._offset(_as_day(value))
+        before = self._sessions_through[offset - 1] if offset else 0
+        return bool(self._sessions_through[offset] > before)
+
+    def next_sessions(self, after, count: int) -> np.ndarray:
+        """
+        The sessions following a date.
+
+        Args:
+            after: Date (e.g. the last bar's); it is not included
+            count: Number of sessions
+
+        Returns:
+            Read-only datetime64[D] view of ``count`` sessions
+        """
+        if count < 0:
+            raise ValueError("Session count must be non-negative")
+        start = int(self._sessions_through[self._offset(_as_day(after))])
+        if start + count > len(self.sessions):
+            raise ValueError("Sessions requested beyond the end of the calendar")
+        return self.sessions[start:start + count]
+
+    def iso(self, dates) -> List[str]:
+        """
+        ISO (YYYY-MM-DD) strings of dates.
+
+        Dates inside the calendar reuse strings built once for the whole
+        range; others (and NaT) are formatted on the fly.
+        """
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        offsets = (dates - self.first_day).astype(np.int64)
+        if offsets.size == 0:
+            return []
+        if offsets.min() < 0 or offsets.max() >= len(self._sessions_through) or np.isnat(dates).any():
+            return np.datetime_as_string(dates, unit='D').tolist()
+        if not self._iso:
+            days = np.arange(self.first_day, self.first_day + len(self._sessions_through))
+            self._iso = np.datetime_as_string(days, unit='D').tolist()
+        iso = self._iso
+        return [iso[offset] for offset in offsets.tolist()]
+
+@lru_cache(maxsize=1)
+def get_calendar() -> TradingCalendar:
+    """The NYSE calendar from 1985 through 2100, built on first use."""
+    return TradingCalendar(nyse_holidays(int(FIRST_SESSION_DATE[:4]), 2100))
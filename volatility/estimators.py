@@ -0,0 +1,121 @@
+"""
+Range-based volatility estimators over full OHLC data.
+
+Parkinson, Garman-Klass, Rogers-Satchell and Yang-Zhang use the open, high,
+low and close of each bar, which makes them several times more efficient
+per bar than close-to-close volatility. All functions accept 1-D arrays
+(one ticker) or 2-D time x ticker arrays and reuse the rolling kernels, so
+a whole universe and several windows are estimated in one call.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Sequence
+
+from .kernels import TRADING_DAYS, Windows, rolling_mean, rolling_std
+
+ESTIMATORS = ('parkinson', 'garman_klass', 'rogers_satchell', 'yang_zhang')
+
+def parkinson_variance(high, low) -> np.ndarray:
+    """Per-bar Parkinson variance from the high-low range."""
+    log_range = np.log(np.asarray(high, dtype=float) / np.asarray(low, dtype=float))
+    return log_range ** 2 / (4 * np.log(2))
+
+def garman_klass_variance(open_, high, low, close) -> np.ndarray:
+    """Per-bar Garman-Klass variance."""
+    log_range = np.log(np.asarray(high, dtype=float) / np.asarray(low, dtype=float))
+    log_body = np.log(np.asarray(close, dtype=float) / np.asarray(open_, dtype=float))
+    return 0.5 * log_range ** 2 - (2 * np.log(2) - 1) * log_body ** 2
+
+def rogers_satchell_variance(open_, high, low, close) -> np.ndarray:
+    """Per-bar Rogers-Satchell variance, unbiased under drift."""
+    open_ = np.asarray(open_, dtype=float)
+    log_high = np.log(np.asarray(high, dtype=float) / open_)
+    log_low = np.log(np.asarray(low, dtype=float) / open_)
+    log_close = np.log(np.asarray(close, dtype=float) / open_)
+    return log_high * (log_high - log_close) + log_low * (log_low - log_close)
+
+def yang_zhang_variance(open_, high, low, close, windows: Windows) -> np.ndarray:
+    """
+    Rolling Yang-Zhang variance, combining overnight, open-to-close and
+    Rogers-Satchell components.
+
+    Returns:
+        Array of shape (n_windows,) + close.shape; the first bar has no
+        overnight return so the first full window ends on bar ``window``
+    """
+    open_ = np.asarray(open_, dtype=float)
+    close = np.asarray(close, dtype=float)
+    windows = np.atleast_1d(np.asarray(windows))
+    if np.any(windows < 2):
+        raise ValueError("Yang-Zhang windows must be at least 2")
+
+    overnight = np.full(close.shape, np.nan)
+    overnight[1:] = np.log(open_[1:] / close[:-1])
+    # Align the open-to-close term with the overnight gaps it is paired with
+    open_to_close = np.where(np.isnan(overnight), np.nan, np.log(close / open_))
+    intraday = np.where(np.isnan(overnight), np.nan,
+                        rogers_satchell_variance(open_, high, low, close))
+
+    overnight_var = rolling_std(overnight, windows) ** 2
+    open_to_close_var = rolling_std(open_to_close, windows) ** 2
+    intraday_var = rolling_mean(intraday, windows)
+
+    # Weight minimizing the estimator variance (Yang & Zhang, 2000)
+    shape = (len(windows),) + (1,) * close.ndim
+    n = windows.reshape(shape).astype(float)
+    k = 0.34 / (1.34 + (n + 1) / (n - 1))
+    return overnight_var + k * open_to_close_var + (1 - k) * intraday_var
+
+def range_volatility(open_, high, low, close,
+                     windows: Windows,
+                     estimator: str = 'yang_zhang') -> np.ndarray:
+    """
+    Annualized rolling range-based volatility in percent.
+
+    Args:
+        open_, high, low, close: Prices, shape (n_obs,) or (n_obs, n_tickers)
+        windows: Window size or sizes in bars
+        estimator: One of ESTIMATORS
+
+    Returns:
+        Array of shape (n_windows,) + close.shape, NaN until each window fills
+    """
+    if estimator == 'parkinson':
+        variance = rolling_mean(parkinson_variance(high, low), windows)
+    elif estimator == 'garman_klass':
+        variance = rolling_mean(garman_klass_variance(open_, high, low, close), windows)
+    elif estimator == 'rogers_satchell':
+        variance = rolling_mean(rogers_satchell_variance(open_, high, low, close), windows)
+    elif estimator == 'yang_zhang':
+        variance = yang_zhang_variance(open_, high, low, close, windows)
+    else:
+        raise ValueError(f"Unknown estimator '{estimator}'; expected one of {', '.join(ESTIMATORS)}")
+
+    return np.sqrt(np.maximum(variance, 0.0) * TRADING_DAYS) * 100
+
+def range_volatility_suite(open_, high, low, close,
+                           windows: Windows,
+                           estimators: Sequence[str] = ESTIMATORS) -> Dict[str, np.ndarray]:
+    """Run several range-based estimators on the same OHLC arrays."""
+    return {
+        estimator: range_volatility(open_, high, low, close, windows, estimator)
+        for estimator in estimators
+    }
+
+def ohlc_volatility_frame(ohlc_data: pd.DataFrame,
+                          window: int = 20,
+                          estimators: Sequence[str] = ESTIMATORS) -> pd.DataFrame:
+    """Pandas wrapper returning one column per estimator for a single window."""
+    missing = {'Open', 'High', 'Low', 'Close'} - set(ohlc_data.columns)
+    if missing:
+        raise ValueError(f"OHLC data is missing columns: {', '.join(sorted(missing))}")
+
+    suite = range_volatility_suite(
+        ohlc_data['Open'].to_numpy(),
+        ohlc_data['High'].to_numpy(),
+        ohlc_data['Low'].to_numpy(),
+        ohlc_data['Close'].to_numpy(),
+        window,
+        estimators
+    )
+    return pd.DataFrame({name: values[0] for name, values in suite.items()}, index=ohlc_data.index)
@@ -0,0 +1,233 @@
+"""
+Per-ticker store of fitted GARCH(1,1) models for incremental updates.
+
+Yesterday's parameters for a ticker are almost always close to optimal, so
+when new bars arrive the store either runs the variance recursion forward
+with the stored parameters (a few arithmetic steps per bar) or, every
+``refit_every`` bars, refits warm-started from them. Models are kept per
+(ticker, historical window): a rolling window that slid forward by the new
+bars continues the stored model, while a history that does not line up
+with the stored sample is refitted. With a ``path``, the states are written
+to a JSON file every ``flush_every`` updates and on ``flush()``, not on
+every fit.
+"""
+import json
+import os
+import threading
+from multiprocessing.util import Finalize
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .models import GarchFit, PriceSeries, fit_garch
+from .series import after, first_date, has_date, last_date
+
+class _GarchState:
+    """Compact persisted state of one ticker's model."""
+
+    __slots__ = ('fit', 'first_date', 'n_bars', 'bars_since_refit')
+
+    def __init__(self,
+                 fit: GarchFit,
+                 first_date: Optional[pd.Timestamp],
+                 n_bars: int,
+                 bars_since_refit: int = 0):
+        self.fit = fit
+        # The price sample the fit was estimated on (and extended over)
+        self.first_date = first_date
+        self.n_bars = n_bars
+        self.bars_since_refit = bars_since_refit
+
+    @classmethod
+    def of(cls, fit: GarchFit, prices: PriceSeries, bars_since_refit: int = 0) -> '_GarchState':
+        return cls(fit, first_date(prices), len(prices), bars_since_refit)
+
+    def continued_by(self, prices: PriceSeries, rolling: bool) -> bool:
+        """
+        Whether prices continue the fit's sample.
+
+        They must reach the fit's last bar and start on its first bar with
+        the same bars up to the last one or, for a rolling window, later,
+        with bars dropped from the front as the window slid forward.
+        """
+        if self.first_date is None or not has_date(prices, self.fit.last_date):
+            return False
+        start = first_date(prices)
+        through_last = len(prices) - len(after(prices, self.fit.last_date))
+        if start == self.first_date:
+            return through_last == self.n_bars
+        return rolling and start > self.first_date and through_last < self.n_bars
+
+    def to_dict(self) -> dict:
+        return {
+            'params': self.fit.params,
+            'conditional_variance': float(self.fit.conditional_variance[-1]),
+            'residual': float(self.fit.residuals[-1]),
+            'last_date': self.fit.last_date.isoformat(),
+            'last_price': self.fit.last_price,
+            'first_date': self.first_date.isoformat() if self.first_date is not None else None,
+            'n_bars': self.n_bars,
+            'bars_since_refit': self.bars_since_refit
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> '_GarchState':
+        fit = GarchFit(
+            params=data['params'],
+            conditional_variance=np.array([data['conditional_variance']]),
+            residuals=np.array([data['residual']]),
+            last_date=pd.Timestamp(data['last_date']),
+            last_price=data['last_price']
+        )
+        # States saved without their sample are refitted on first use
+        first = data.get('first_date')
+        return cls(fit, pd.Timestamp(first) if first else None, data.get('n_bars', 0),
+                   data['bars_since_refit'])
+
+def _key(ticker: str, window: Optional[int]) -> str:
+    """State key, also used in the persisted JSON."""
+    return ticker if window is None else f"{ticker}:{window}"
+
+class GarchModelStore:
+    """
+    GARCH models keyed by ticker and window, updated incrementally as bars arrive.
+
+    Each key keeps the fit of its latest sample; a history that does not
+    continue it gets a warm-started refit, which then replaces it.
+
+    Args:
+        refit_every: Number of new bars after which the model is refitted
+            (warm-started); fewer new bars only extend the recursion
+        path: JSON file the states are persisted to; in-memory when None
+        flush_every: Number of updated states after which the file is
+            rewritten; call flush() (e.g. on shutdown) to write the rest
+    """
+
+    def __init__(self, refit_every: int = 5, path: Optional[str] = None, flush_every: int = 50):
+        if refit_every < 1:
+            raise ValueError("refit_every must be at least 1")
+        if flush_every < 1:
+            raise ValueError("flush_every must be at least 1")
+        self.refit_every = refit_every
+        self.path = path
+        self.flush_every = flush_every
+        self._states: Dict[str, _GarchState] = {}
+        self._lock = threading.Lock()
+        # Serializes file writes, which happen outside _lock
+        self._save_lock = threading.Lock()
+        self._unsaved = 0
+        self._counters = {'cold_fits': 0, 'warm_fits': 0, 'extends': 0, 'reuses': 0}
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def fit(self, ticker: str, prices: PriceSeries, window: Optional[int] = None) -> GarchFit:
+        """
+        Return a GARCH fit for the ticker that ends on the last price.
+
+        Args:
+            ticker: Ticker the model is stored under
+            prices: Daily closing prices, a Series or CompactSeries
+            window: Historical window of a rolling history; each window
+                keeps its own model, continued as the window slides. Without
+                one, only histories starting on the same bar are continued
+
+        Returns:
+            The stored fit, extended or refitted as needed
+        """
+        key = _key(ticker, window)
+        with self._lock:
+            state = self._states.get(key)
+
+        last_bar = last_date(prices)
+        if state is None:
+            new_state = _GarchState.of(fit_garch(prices), prices)
+            counter = 'cold_fits'
+        elif not state.continued_by(prices, rolling=window is not None):
+            # A history that no longer lines up with the state
+            new_state = _GarchState.of(fit_garch(prices, starting_values=state.fit.params), prices)
+            counter = 'warm_fits'
+        elif last_bar == state.fit.last_date:
+            if float(prices.iloc[-1]) == state.fit.last_price:
+                self._count('reuses')
+                return state.fit
+            # The latest bar was revised; the state before it is not kept
+            new_state = _GarchState.of(fit_garch(prices, starting_values=state.fit.params), prices)
+            counter = 'warm_fits'
+        else:
+            new_bars = len(after(prices, state.fit.last_date))
+            if state.bars_since_refit + new_bars >= self.refit_every:
+                new_state = _GarchState.of(fit_garch(prices, starting_values=state.fit.params), prices)
+                counter = 'warm_fits'
+            else:
+                new_state = _GarchState.of(state.fit.extend(prices), prices,
+                                           state.bars_since_refit + new_bars)
+                counter = 'extends'
+
+        self._count(counter)
+        with self._lock:
+            self._states[key] = new_state
+            self._unsaved += 1
+            due = self.path is not None and self._unsaved >= self.flush_every
+        if due:
+            self.flush()
+        return new_state.fit
+
+    def get(self, ticker: str, window: Optional[int] = None) -> Optional[GarchFit]:
+        """Return the stored fit for a ticker and window, if any."""
+        with self._lock:
+            state = self._states.get(_key(ticker, window))
+        return state.fit if state is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        """Return counts of cold fits, warm refits, forward extensions and reuses."""
+        with self._lock:
+            return dict(self._counters, tickers=len({key.split(':')[0] for key in self._states}))
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _load(self) -> None:
+        with open(self.path, 'r', encoding='utf-8') as fh:
+            data = json.load(fh)
+        self._states = {ticker: _GarchState.from_dict(state) for ticker, state in data.items()}
+
+    def flush(self) -> None:
+        """Write the states to the file if any changed since the last write."""
+        if self.path is None:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._unsaved:
+                    return
+                data = {key: state.to_dict() for key, state in self._states.items()}
+                self._unsaved = 0
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as fh:
+                json.dump(data, fh)
+            os.replace(tmp_path, self.path)
+
+_default_store: Optional[GarchModelStore] = None
+_default_lock = threading.Lock()
+
+def get_garch_store() -> GarchModelStore:
+    """Return the process-wide GARCH store, configured from the environment."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = GarchModelStore(
+                refit_every=int(os.getenv('VOLATILITY_GARCH_REFIT_EVERY', '5')),
+                path=os.getenv('VOLATILITY_GARCH_STORE_PATH') or None,
+                flush_every=int(os.getenv('VOLATILITY_GARCH_FLUSH_EVERY', '50'))
+            )
+            if _default_store.path is not None:
+                # Write pending states at exit, in model-pool worker processes too
+                Finalize(_default_store, _default_store.flush, exitpriority=10)
+        return _default_store
+
+def set_garch_store(store: Optional[GarchModelStore]) -> None:
+    """Replace the process-wide GARCH store; None recreates it from the environment."""
+    global _default_store
+    with _default_lock:
+        _default_store = store
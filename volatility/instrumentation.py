@@ -0,0 +1,145 @@
+"""
+Lightweight per-stage timing for the forecast pipeline.
+
+``timed(stage)`` is a context manager and decorator. Every measurement is
+added to a process-wide histogram for its stage, which renders in the
+Prometheus text format, and to the current request's trace when one was
+started with ``start_trace()``; the API turns a trace into a
+``Server-Timing`` header.
+
+Timings are per process: stages that run in a process pool are recorded in
+the worker's registry, not the server's.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_NAME = 'volatility_stage_duration_seconds'
+
+Trace = List[Tuple[str, float]]
+
+_trace: ContextVar[Optional[Trace]] = ContextVar('volatility_trace', default=None)
+
+class Histogram:
+    """Fixed-bucket histogram of durations in seconds."""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.total += seconds
+        self.count += 1
+
+    def cumulative_counts(self) -> List[int]:
+        """Counts of observations at or below each bucket bound."""
+        counts, running = [], 0
+        for count in self.counts:
+            running += count
+            counts.append(running)
+        return counts
+
+class MetricsRegistry:
+    """Stage duration histograms shared by every thread of the process."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record one duration for a stage."""
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return the count and total seconds of every stage."""
+        with self._lock:
+            return {stage: {'count': h.count, 'sum': h.total} for stage, h in self._histograms.items()}
+
+    def clear(self) -> None:
+        """Drop every recorded observation."""
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Render the histograms in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each forecast pipeline stage.",
+            f"# TYPE {METRIC_NAME} histogram"
+        ]
+        with self._lock:
+            for stage in sorted(self._histograms):
+                histogram = self._histograms[stage]
+                for bound, count in zip(histogram.buckets, histogram.cumulative_counts()):
+                    lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="{bound:g}"}} {count}')
+                lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {histogram.total!r}')
+                lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+_registry = MetricsRegistry()
+
+def get_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _registry
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    Time a block or function as a pipeline stage.
+
+    Usable as ``with timed('garch_fit'):`` or as a ``@timed('garch_fit')``
+    decorator; the duration is recorded even if the block raises.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _registry.observe(stage, elapsed)
+        trace = _trace.get()
+        if trace is not None:
+            trace.append((stage, elapsed))
+
+def start_trace() -> Token:
+    """Start collecting the current context's stage timings; returns a reset token."""
+    return _trace.set([])
+
+def current_trace() -> Trace:
+    """Return the (stage, seconds) timings collected since start_trace()."""
+    return list(_trace.get() or [])
+
+def end_trace(token: Token) -> Trace:
+    """Stop collecting timings and return them."""
+    trace = current_trace()
+    _trace.reset(token)
+    return trace
+
+def server_timing_header(trace: Trace) -> str:
+    """
+    Format timings as a Server-Timing header value.
+
+    Repeated stages are summed, keeping the order in which each stage first
+    finished; durations are in milliseconds.
+    """
+    totals: Dict[str, float] = {}
+    for stage, seconds in trace:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return ', '.join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in totals.items())
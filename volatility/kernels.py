@@ -0,0 +1,117 @@
+"""
+Single-pass rolling-window kernels shared by the volatility estimators.
+
+Rolling sums for every window come from one cumulative sum of the input, so
+a term structure of windows (e.g. 10/20/30/60/90 days) costs one pass over
+the data plus one subtraction per window. Inputs may be 1-D (one series) or
+2-D (time x series); outputs carry a leading window axis.
+"""
+import numpy as np
+import pandas as pd
+from typing import Sequence, Union
+
+TRADING_DAYS = 252
+
+Windows = Union[int, Sequence[int]]
+
+def _as_values(values) -> np.ndarray:
+    array = np.asarray(values, dtype=float)
+    if array.ndim not in (1, 2):
+        raise ValueError("Values must be a 1-D or 2-D array")
+    return array
+
+def _as_windows(windows: Windows) -> np.ndarray:
+    array = np.atleast_1d(np.asarray(windows))
+    if array.ndim != 1 or len(array) == 0 or not np.issubdtype(array.dtype, np.integer):
+        raise ValueError("Windows must be an integer or a sequence of integers")
+    if np.any(array < 1):
+        raise ValueError("Window sizes must be at least 1")
+    return array
+
+def _cumsum0(values: np.ndarray) -> np.ndarray:
+    """Cumulative sum along time with a leading zero row."""
+    zeros = np.zeros((1,) + values.shape[1:])
+    return np.concatenate([zeros, np.cumsum(values, axis=0)])
+
+def log_returns(prices) -> np.ndarray:
+    """
+    Log returns aligned with the price array.
+
+    Returns:
+        Array shaped like ``prices`` with NaN in the first row
+    """
+    prices = _as_values(prices)
+    returns = np.full(prices.shape, np.nan)
+    returns[1:] = np.diff(np.log(prices), axis=0)
+    return returns
+
+def rolling_mean(values, windows: Windows) -> np.ndarray:
+    """
+    Rolling mean for several window sizes in one pass.
+
+    A window containing NaN yields NaN, matching ``pandas.rolling().mean()``.
+
+    Returns:
+        Array of shape (n_windows,) + values.shape
+    """
+    values = _as_values(values)
+    windows = _as_windows(windows)
+    missing = np.isnan(values)
+    sums = _cumsum0(np.where(missing, 0.0, values))
+    gaps = _cumsum0(missing.astype(np.int64))
+
+    means = np.full((len(windows),) + values.shape, np.nan)
+    for i, window in enumerate(windows):
+        if window > len(values):
+            continue
+        complete = (gaps[window:] - gaps[:-window]) == 0
+        means[i, window - 1:] = np.where(complete, (sums[window:] - sums[:-window]) / window, np.nan)
+    return means
+
+def rolling_std(values, windows: Windows, ddof: int = 1) -> np.ndarray:
+    """
+    Rolling standard deviation for several window sizes in one pass.
+
+    Values are centred on their overall mean before the sums of squares are
+    accumulated, which keeps the cumulative-sum variance numerically stable.
+
+    Returns:
+        Array of shape (n_windows,) + values.shape
+    """
+    values = _as_values(values)
+    windows = _as_windows(windows)
+    missing = np.isnan(values)
+    if missing.all():
+        return np.full((len(windows),) + values.shape, np.nan)
+
+    centred = np.where(missing, 0.0, values - np.nanmean(values, axis=0))
+    sums = _cumsum0(centred)
+    squares = _cumsum0(centred ** 2)
+    gaps = _cumsum0(missing.astype(np.int64))
+
+    stds = np.full((len(windows),) + values.shape, np.nan)
+    for i, window in enumerate(windows):
+        if window > len(values) or window <= ddof:
+            continue
+        window_sum = sums[window:] - sums[:-window]
+        variance = ((squares[window:] - squares[:-window]) - window_sum ** 2 / window) / (window - ddof)
+        complete = (gaps[window:] - gaps[:-window]) == 0
+        stds[i, window - 1:] = np.where(complete, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+    return stds
+
+def rolling_volatility(prices, windows: Windows) -> np.ndarray:
+    """
+    Annualized close-to-close volatility in percent for several windows.
+
+    Log returns are computed once and shared by every window.
+
+    Returns:
+        Array of shape (n_windows,) + prices.shape, NaN until each window fills
+    """
+    return rolling_std(log_returns(prices), windows) * np.sqrt(TRADING_DAYS) * 100
+
+def rolling_volatility_frame(prices: pd.Series, windows: Windows) -> pd.DataFrame:
+    """Pandas wrapper around rolling_volatility with one column per window."""
+    windows = _as_windows(windows)
+    volatility = rolling_volatility(prices.to_numpy(), windows)
+    return pd.DataFrame(volatility.T, index=prices.index, columns=windows.tolist())
@@ -1,13 +1,54 @@
 """
 Simple and robust volatility calculations and forecasting.
+
+Price and volatility series may be pandas objects or the compact arrays of
+``volatility.series``; every function returns the kind of series it is given.
 """
 import numpy as np
 import pandas as pd
-from arch import arch_model
-from typing import Dict, Optional, Tuple
-from sklearn.preprocessing import MinMaxScaler
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from .estimators import parkinson_variance, range_volatility
+from .calendar import get_calendar
+from .instrumentation import timed
+from .kernels import rolling_mean, rolling_volatility
+from .quantiles import COMMON_CONFIDENCE_LEVELS, normal_bands, two_sided_z
+from .series import CompactFrame, CompactSeries, after, datetime_index, last_date
+
+# A daily series: pandas with a DatetimeIndex, or compact arrays
+PriceSeries = Union[pd.Series, CompactSeries]
+PriceFrame = Union[pd.DataFrame, CompactFrame]
+
+def _like(template, values: np.ndarray, name: Optional[str] = None):
+    """Wrap values on the template's dates in the template's kind of series."""
+    if isinstance(template, (CompactSeries, CompactFrame)):
+        dtype = template.dtype if isinstance(template, CompactSeries) else np.float64
+        return CompactSeries(template.days, values.astype(dtype, copy=False), name)
+    return pd.Series(values, index=template.index, name=name)
+
+def _forecast_dates(after_date: pd.Timestamp, forecast_horizon: int) -> np.ndarray:
+    """The forecast_horizon NYSE sessions after a date, as datetime64[D]."""
+    return get_calendar().next_sessions(after_date, forecast_horizon)
+
+def _forecast_like(template, after_date: pd.Timestamp, values: np.ndarray):
+    """Wrap forecast values on the sessions after a date in the template's kind of series."""
+    dates = _forecast_dates(after_date, len(values))
+    if isinstance(template, (CompactSeries, CompactFrame)):
+        return CompactSeries(dates, values)
+    return pd.Series(values, index=datetime_index(dates))
 
-def calculate_volatility(prices: pd.Series, window: int = 20) -> pd.Series:
+def _log_returns(prices: PriceSeries) -> np.ndarray:
+    """Daily log returns as float64, skipping missing ones like pandas dropna()."""
+    closes = prices.to_numpy(dtype=np.float64)
+    returns = np.log(closes[1:] / closes[:-1])
+    return returns[~np.isnan(returns)]
+
+def _last_finite(values: np.ndarray) -> float:
+    """The last finite value, or NaN when there is none."""
+    finite = np.flatnonzero(np.isfinite(values))
+    return float(values[finite[-1]]) if len(finite) else float('nan')
+
+def calculate_volatility(prices: PriceSeries, window: int = 20) -> PriceSeries:
     """
     Calculate historical volatility using simple rolling standard deviation of log returns.
     
@@ -23,18 +64,15 @@ def calculate_volatility(prices: pd.Series, window: int = 20) -> pd.Series:
     if window < 2:
         raise ValueError("Window size must be at least 2")
         
-    # Calculate log returns
-    log_returns = np.log(prices / prices.shift(1))
+    # Calculate annualized volatility of log returns
+    volatility = rolling_volatility(prices.to_numpy(dtype=np.float64), window)[0]
     
-    # Calculate annualized volatility
-    volatility = log_returns.rolling(window=window).std() * np.sqrt(252) * 100
-    
-    return volatility
+    return _like(prices, volatility, prices.name)
 
-def forecast_volatility(prices: pd.Series, 
+def forecast_volatility(prices: PriceSeries, 
                        forecast_horizon: int = 5,
                        decay: float = 0.94,
-                       window: int = 20) -> pd.Series:
+                       window: int = 20) -> PriceSeries:
     """
     Generate volatility forecast using EWMA (Exponentially Weighted Moving Average).
     
@@ -50,18 +88,10 @@ def forecast_volatility(prices: pd.Series,
     # Get current volatility
     current_vol = calculate_volatility(prices, window).iloc[-1]
     
-    # Generate future dates
-    last_date = prices.index[-1]
-    future_dates = pd.date_range(
-        start=last_date + pd.Timedelta(days=1),
-        periods=forecast_horizon,
-        freq='B'  # Business days
-    )
-    
-    # Simple forecast using decay factor
-    forecasts = [current_vol * (decay ** i) for i in range(forecast_horizon)]
+    # Simple forecast using decay factor, on the following sessions
+    forecasts = current_vol * decay ** np.arange(forecast_horizon)
     
-    return pd.Series(forecasts, index=future_dates)
+    return _forecast_like(prices, last_date(prices), forecasts)
 
 def get_confidence_intervals(forecast: pd.Series, 
                            historical_std: float,
@@ -77,127 +107,345 @@ def get_confidence_intervals(forecast: pd.Series,
     Returns:
         Tuple of (lower bound, upper bound)
     """
-    z_score = abs(np.percentile(np.random.standard_normal(10000), confidence * 100))
+    z_score = two_sided_z(confidence)
     
     lower_bound = forecast - z_score * historical_std
     upper_bound = forecast + z_score * historical_std
     
     return lower_bound, upper_bound
 
-def calculate_historical_volatility(prices: pd.Series, window: int = 20) -> pd.Series:
+def get_confidence_bands(forecast: pd.Series,
+                         historical_std: float,
+                         confidence_levels: Sequence[float] = COMMON_CONFIDENCE_LEVELS
+                         ) -> Dict[float, Tuple[pd.Series, pd.Series]]:
+    """
+    Calculate confidence intervals for several levels at once.
+    
+    Args:
+        forecast: Forecasted volatility
+        historical_std: Historical standard deviation of volatility
+        confidence_levels: Confidence levels, e.g. (0.68, 0.9, 0.95, 0.99)
+        
+    Returns:
+        Mapping of each level to its (lower bound, upper bound)
+    """
+    bands = normal_bands(forecast.to_numpy(), historical_std, confidence_levels)
+    return {
+        level: (pd.Series(lower, index=forecast.index), pd.Series(upper, index=forecast.index))
+        for level, (lower, upper) in bands.items()
+    }
+
+@timed('historical')
+def calculate_historical_volatility(prices: PriceSeries, window: int = 20) -> PriceSeries:
     """Calculate historical volatility using rolling window standard deviation."""
     if len(prices) < 2:
         raise ValueError("Price series must have at least 2 data points")
     if window < 2 or window > len(prices):
         raise ValueError("Window size must be between 2 and the length of the price series")
     
-    # Calculate log returns
-    log_returns = np.log(prices / prices.shift(1))
-    
-    # Calculate annualized volatility (always non-negative due to abs)
-    volatility = np.abs(log_returns.rolling(window=window).std() * np.sqrt(252) * 100)
+    # Calculate annualized volatility of log returns
+    volatility = _like(prices, rolling_volatility(prices.to_numpy(dtype=np.float64), window)[0], prices.name)
     
     # Only drop NaN values after window - 1 points (keep the same length as input minus window - 1)
     return volatility.iloc[window-1:]
 
-def calculate_garch_forecast(prices: pd.Series, forecast_horizon: int = 5) -> pd.Series:
-    """Calculate volatility forecast using GARCH(1,1) model."""
-    # Calculate log returns
-    log_returns = 100 * np.log(prices / prices.shift(1)).dropna()
+# Parameter names of the constant-mean GARCH(1,1) model, in arch's order
+GARCH_PARAMS = ('mu', 'omega', 'alpha[1]', 'beta[1]')
+
+class GarchFit:
+    """Fitted GARCH(1,1) model that can forecast any horizon without refitting.
+
+    Variances are in squared percent, matching the ``100 * log return`` scaling
+    used for the fit.
+    """
+
+    def __init__(self,
+                 params: Dict[str, float],
+                 conditional_variance: np.ndarray,
+                 residuals: np.ndarray,
+                 last_date: pd.Timestamp,
+                 last_price: Optional[float] = None):
+        self.params = dict(params)
+        self.conditional_variance = conditional_variance
+        self.residuals = residuals
+        self.last_date = last_date
+        self.last_price = last_price
+        self._forecasts: Dict[int, CompactSeries] = {}
+
+    @property
+    def persistence(self) -> float:
+        """Return alpha + beta, the decay rate of variance shocks."""
+        return self.params['alpha[1]'] + self.params['beta[1]']
+
+    def forecast_variance(self, forecast_horizon: int = 5) -> np.ndarray:
+        """Analytic multi-step variance forecast for steps 1..forecast_horizon."""
+        if forecast_horizon < 1:
+            raise ValueError("Forecast horizon must be at least 1")
+        omega = self.params['omega']
+        next_var = (omega
+                    + self.params['alpha[1]'] * self.residuals[-1] ** 2
+                    + self.params['beta[1]'] * self.conditional_variance[-1])
+
+        # h_k = omega * (1 + p + ... + p^(k-2)) + p^(k-1) * h_1
+        powers = self.persistence ** np.arange(forecast_horizon)
+        partial_sums = np.concatenate(([0.0], np.cumsum(powers[:-1])))
+        return omega * partial_sums + powers * next_var
+
+    def term_structure(self, horizons: Sequence[int]) -> np.ndarray:
+        """
+        Annualized volatility over each horizon from one variance forecast.
+
+        A horizon of h days gets sqrt(252 * mean of the step 1..h variances),
+        so all horizons share a single analytic forecast to the longest one.
+
+        Args:
+            horizons: Horizons in days, each at least 1
+
+        Returns:
+            Annualized volatility in percent, one value per horizon
+        """
+        horizons = np.asarray(horizons, dtype=int)
+        if horizons.ndim != 1 or len(horizons) == 0 or horizons.min() < 1:
+            raise ValueError("Horizons must be a non-empty list of positive integers")
+        cumulative_variance = np.cumsum(self.forecast_variance(int(horizons.max())))
+        return np.sqrt(cumulative_variance[horizons - 1] / horizons * 252)
+
+    def forecast(self, forecast_horizon: int = 5, compact: bool = False) -> PriceSeries:
+        """
+        Annualized volatility forecast, cached per horizon.
+
+        Args:
+            forecast_horizon: Number of sessions to forecast
+            compact: Return a CompactSeries instead of a pandas Series
+        """
+        if forecast_horizon not in self._forecasts:
+            conditional_vol = np.sqrt(self.forecast_variance(forecast_horizon)) * np.sqrt(252)
+            self._forecasts[forecast_horizon] = CompactSeries(
+                _forecast_dates(self.last_date, forecast_horizon), np.abs(conditional_vol)
+            )
+        forecast = self._forecasts[forecast_horizon]
+        return forecast.copy() if compact else forecast.to_pandas()
+
+    @timed('garch_extend')
+    def extend(self, prices: PriceSeries) -> 'GarchFit':
+        """
+        Run the variance recursion over bars after last_date, keeping the
+        fitted parameters.
+        
+        Args:
+            prices: Closing prices; only bars after last_date are used
+            
+        Returns:
+            A new GarchFit whose state ends on the last new bar
+        """
+        from scipy.signal import lfilter  # Deferred to keep API cold starts fast
+        
+        if self.last_price is None:
+            raise ValueError("GarchFit has no last price to extend from")
+        new_prices = after(prices, self.last_date)
+        if len(new_prices) == 0:
+            return self
+        
+        closes = np.concatenate(([self.last_price], new_prices.to_numpy(dtype=float)))
+        residuals = 100 * np.diff(np.log(closes)) - self.params['mu']
+        
+        # var[t] = omega + alpha * e[t-1]^2 + beta * var[t-1]
+        lagged_squares = np.concatenate(([self.residuals[-1]], residuals[:-1])) ** 2
+        beta = self.params['beta[1]']
+        variance, _ = lfilter([1.0], [1.0, -beta],
+                              self.params['omega'] + self.params['alpha[1]'] * lagged_squares,
+                              zi=[beta * self.conditional_variance[-1]])
+        
+        return GarchFit(
+            params=self.params,
+            conditional_variance=np.concatenate((self.conditional_variance, variance)),
+            residuals=np.concatenate((self.residuals, residuals)),
+            last_date=last_date(new_prices),
+            last_price=float(closes[-1])
+        )
+
+def _fit_arch(log_returns, starting_values: Optional[Dict[str, float]] = None):
+    """Fit arch's GARCH(1,1) to percent log returns and return its result object."""
+    from arch import arch_model  # Deferred to keep API cold starts fast
     
     # Fit GARCH model with non-negative constraints
     model = arch_model(log_returns, vol='Garch', p=1, q=1, dist='normal')
-    model_fit = model.fit(disp='off', show_warning=False)
+    if starting_values is not None:
+        starting_values = np.array([starting_values[name] for name in GARCH_PARAMS])
+    return model.fit(disp='off', show_warning=False, starting_values=starting_values)
+
+@timed('garch_fit')
+def fit_garch(prices: PriceSeries, starting_values: Optional[Dict[str, float]] = None) -> GarchFit:
+    """
+    Fit a GARCH(1,1) model to daily closing prices.
     
-    # Generate forecast
-    forecast = model_fit.forecast(horizon=forecast_horizon)
-    conditional_vol = np.sqrt(forecast.variance.iloc[-1]) * np.sqrt(252)
+    Args:
+        prices: Daily closing prices
+        starting_values: Parameters of an earlier fit to warm-start the optimizer
+        
+    Returns:
+        The fitted model
+    """
+    # Calculate log returns
+    log_returns = 100 * _log_returns(prices)
     
-    # Ensure non-negative values
-    conditional_vol = np.abs(conditional_vol)
+    model_fit = _fit_arch(log_returns, starting_values)
     
-    # Create forecast series with future dates
-    last_date = prices.index[-1]
-    forecast_dates = pd.date_range(start=last_date + pd.Timedelta(days=1), 
-                                 periods=forecast_horizon, 
-                                 freq='B')
+    return GarchFit(
+        params=model_fit.params.to_dict(),
+        conditional_variance=np.asarray(model_fit.conditional_volatility) ** 2,
+        residuals=np.asarray(model_fit.resid),
+        last_date=last_date(prices),
+        last_price=float(prices.iloc[-1])
+    )
+
+def calculate_garch_forecast(prices: PriceSeries, forecast_horizon: int = 5) -> PriceSeries:
+    """Calculate volatility forecast using GARCH(1,1) model."""
+    return fit_garch(prices).forecast(forecast_horizon, compact=isinstance(prices, CompactSeries))
+
+def ewma_variance(returns: np.ndarray, lambda_param=0.94) -> np.ndarray:
+    """
+    Run the RiskMetrics EWMA variance recursion as a single IIR filter.
+    
+    Computes var[t] = lambda * var[t-1] + (1 - lambda) * r[t]^2, seeded with
+    var[0] = r[0]^2, over every column at once.
+    
+    Args:
+        returns: Log returns, shape (n_obs,) or (n_obs, n_series)
+        lambda_param: Decay factor, or a 1-D array of decay factors to sweep
+        
+    Returns:
+        Variances shaped like ``returns``, with a leading decay-factor axis
+        when ``lambda_param`` is an array
+    """
+    from scipy.signal import lfilter  # Deferred to keep API cold starts fast
+    
+    squared = np.asarray(returns, dtype=float) ** 2
+    if squared.ndim not in (1, 2) or len(squared) == 0:
+        raise ValueError("Returns must be a non-empty 1-D or 2-D array")
     
-    return pd.Series(conditional_vol, index=forecast_dates)
+    lambdas = np.atleast_1d(np.asarray(lambda_param, dtype=float))
+    if lambdas.ndim != 1 or np.any((lambdas < 0) | (lambdas > 1)):
+        raise ValueError("Decay factors must be between 0 and 1")
+    
+    variances = np.empty((len(lambdas),) + squared.shape)
+    for i, decay in enumerate(lambdas):
+        # Initial filter state chosen so that var[0] == r[0]^2
+        variances[i], _ = lfilter([1 - decay], [1, -decay], squared,
+                                  axis=0, zi=decay * squared[:1])
+    
+    return variances if np.ndim(lambda_param) else variances[0]
 
-def calculate_ewma_forecast(prices: pd.Series, 
+@timed('ewma')
+def calculate_ewma_forecast(prices: PriceSeries, 
                           forecast_horizon: int = 5, 
-                          lambda_param: float = 0.94) -> pd.Series:
+                          lambda_param: float = 0.94) -> PriceSeries:
     """Calculate volatility forecast using EWMA model."""
     # Calculate log returns
-    log_returns = np.log(prices / prices.shift(1)).dropna()
+    log_returns = _log_returns(prices)
     
     # Calculate EWMA variance
-    ewma_var = pd.Series(index=log_returns.index)
-    ewma_var.iloc[0] = log_returns.iloc[0] ** 2
-    
-    for t in range(1, len(log_returns)):
-        ewma_var.iloc[t] = (lambda_param * ewma_var.iloc[t-1] + 
-                           (1 - lambda_param) * log_returns.iloc[t] ** 2)
+    last_var = ewma_variance(log_returns, lambda_param)[-1]
     
     # Generate forecast
-    last_var = ewma_var.iloc[-1]
     forecast_var = np.array([last_var] * forecast_horizon)
     
     # Convert to annualized volatility
     forecast_vol = np.sqrt(forecast_var) * np.sqrt(252) * 100
     
     # Create forecast series with future dates
-    last_date = prices.index[-1]
-    forecast_dates = pd.date_range(start=last_date + pd.Timedelta(days=1), 
-                                 periods=forecast_horizon, 
-                                 freq='B')
-    
-    return pd.Series(forecast_vol, index=forecast_dates)
+    return _forecast_like(prices, last_date(prices), forecast_vol)
 
-def calculate_parkinson_volatility(ohlc_data: pd.DataFrame, 
-                                 window: int = 20) -> pd.Series:
+@timed('parkinson')
+def calculate_parkinson_volatility(ohlc_data: PriceFrame, 
+                                 window: int = 20) -> PriceSeries:
     """Calculate Parkinson volatility using high-low price range."""
     if 'High' not in ohlc_data.columns or 'Low' not in ohlc_data.columns:
         raise ValueError("OHLC data must contain 'High' and 'Low' columns")
     
     # Calculate Parkinson estimator
-    high_low_ratio = np.log(ohlc_data['High'] / ohlc_data['Low'])
-    parkinson_estimator = (1 / (4 * np.log(2))) * (high_low_ratio ** 2)
+    parkinson_estimator = parkinson_variance(ohlc_data['High'].to_numpy(dtype=np.float64),
+                                             ohlc_data['Low'].to_numpy(dtype=np.float64))
     
     # Calculate rolling volatility
-    volatility = np.sqrt(parkinson_estimator.rolling(window=window).mean()) * np.sqrt(252) * 100
+    rolling_variance = rolling_mean(parkinson_estimator, window)[0]
+    volatility = _like(ohlc_data, np.sqrt(rolling_variance) * np.sqrt(252) * 100)
     
     return volatility.dropna()
 
+# Range-based estimators used as extra ensemble members when OHLC data is given
+RANGE_ESTIMATORS = ('garman_klass', 'rogers_satchell', 'yang_zhang')
+
 class VolatilityEnsemble:
-    """Ensemble model combining multiple volatility forecasting methods."""
+    """
+    Ensemble model combining multiple volatility forecasting methods.
     
-    def __init__(self, historical_window: int = 30, forecast_horizon: int = 5):
+    When fit() receives full OHLC data (Open, High, Low, Close), the
+    range-based estimators named in ``range_estimators`` join the ensemble
+    and forecast their current level over the horizon.
+    """
+    
+    def __init__(self,
+                 historical_window: int = 30,
+                 forecast_horizon: int = 5,
+                 range_estimators: Tuple[str, ...] = RANGE_ESTIMATORS):
         self.historical_window = historical_window
         self.forecast_horizon = forecast_horizon
+        self.range_estimators = tuple(range_estimators)
         self.model_weights: Dict[str, float] = {}
-        self.scaler = MinMaxScaler()
         self.is_fitted = False
-        self.prices: Optional[pd.Series] = None
+        self.prices: Optional[PriceSeries] = None
+        self.garch_fit: Optional[GarchFit] = None
+        self.forecasts: Dict[str, PriceSeries] = {}
     
-    def fit(self, prices: pd.Series, ohlc_data: Optional[pd.DataFrame] = None) -> None:
-        """Fit the ensemble model using historical data."""
-        self.prices = prices.copy()  # Store prices for later use
+    @timed('ensemble_fit')
+    def fit(self,
+            prices: PriceSeries,
+            ohlc_data: Optional[PriceFrame] = None,
+            garch_fit: Optional[GarchFit] = None) -> None:
+        """Fit the ensemble model using historical data.
+
+        A previously fitted ``garch_fit`` for the same prices may be passed in
+        to skip the GARCH optimization. The prices are referenced, not
+        copied; forecasts come back in the same kind of series.
+        """
+        self.prices = prices
+        self.garch_fit = garch_fit if garch_fit is not None else fit_garch(prices)
         
-        # Calculate historical performance for each model
-        garch_vol = calculate_garch_forecast(prices, self.forecast_horizon)
-        ewma_vol = calculate_ewma_forecast(prices, self.forecast_horizon)
+        # Forecast once per model; predict() reuses these
+        self.forecasts = {
+            'garch': self.garch_fit.forecast(self.forecast_horizon,
+                                             compact=isinstance(prices, CompactSeries)),
+            'ewma': calculate_ewma_forecast(prices, self.forecast_horizon)
+        }
         hist_vol = calculate_historical_volatility(prices, self.historical_window)
         
         models_vol = {
-            'garch': garch_vol.mean(),
-            'ewma': ewma_vol.mean(),
+            'garch': self.forecasts['garch'].mean(),
+            'ewma': self.forecasts['ewma'].mean(),
             'historical': hist_vol.iloc[-1]
         }
         
         if ohlc_data is not None:
             park_vol = calculate_parkinson_volatility(ohlc_data, self.historical_window)
             models_vol['parkinson'] = park_vol.iloc[-1]
+            
+            if {'Open', 'Close'}.issubset(ohlc_data.columns):
+                ohlc = [ohlc_data[column].to_numpy(dtype=np.float64)
+                        for column in ('Open', 'High', 'Low', 'Close')]
+                for estimator in self.range_estimators:
+                    # A missing bar or an unfilled window leaves trailing NaNs
+                    level = _last_finite(range_volatility(*ohlc, self.historical_window, estimator)[0])
+                    if not np.isfinite(level):
+                        continue
+                    models_vol[estimator] = level
+                    self.forecasts[estimator] = _like(self.forecasts['garch'],
+                                                      np.full(self.forecast_horizon, level))
+        
+        # Models without a finite level get no weight
+        models_vol = {name: level for name, level in models_vol.items() if np.isfinite(level)}
+        if not models_vol:
+            raise ValueError("No model produced a finite volatility level")
         
         # Calculate weights based on inverse variance
         variances = np.array(list(models_vol.values()))
@@ -207,32 +455,60 @@ class VolatilityEnsemble:
         self.model_weights = dict(zip(models_vol.keys(), weights))
         self.is_fitted = True
     
-    def predict(self) -> pd.Series:
+    @timed('ensemble_predict')
+    def predict(self) -> PriceSeries:
         """Generate ensemble forecast."""
         if not self.is_fitted:
             raise ValueError("Model must be fitted before making predictions")
         if self.prices is None:
             raise ValueError("No price data available. Call fit() first.")
         
-        # Combine forecasts using learned weights
-        weighted_forecast = 0
+        # Combine forecasts using learned weights; all share the GARCH forecast dates
+        weighted_forecast = np.zeros(self.forecast_horizon)
         for model_name, weight in self.model_weights.items():
-            if model_name == 'garch':
-                forecast = calculate_garch_forecast(self.prices, self.forecast_horizon)
-            elif model_name == 'ewma':
-                forecast = calculate_ewma_forecast(self.prices, self.forecast_horizon)
-            else:
+            if model_name not in self.forecasts:
                 continue  # Skip historical and Parkinson for forecasting
             
-            weighted_forecast += weight * forecast
+            weighted_forecast += weight * self.forecasts[model_name].to_numpy(dtype=np.float64)
         
         # Ensure non-negative values
-        weighted_forecast = pd.Series(
-            np.abs(weighted_forecast),
-            index=weighted_forecast.index
-        )
+        return _like(self.forecasts['garch'], np.abs(weighted_forecast))
+    
+    def term_structure(self, horizons: Sequence[int]) -> Dict[str, np.ndarray]:
+        """
+        Annualized volatility over several horizons per model and for the ensemble.
+
+        GARCH uses its analytic multi-step variance (GarchFit.term_structure);
+        EWMA and the range estimators forecast a flat level, so their term
+        structure is flat. The ensemble combines the models with the fitted
+        weights, as predict() does.
+
+        Args:
+            horizons: Horizons in days, each at least 1
+
+        Returns:
+            Mapping of model name, and ``'ensemble'``, to one value per horizon
+        """
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted before computing a term structure")
+        
+        terms = {'garch': self.garch_fit.term_structure(horizons)}
+        for model_name, forecast in self.forecasts.items():
+            if model_name != 'garch':
+                terms[model_name] = np.full(len(terms['garch']), float(forecast.iloc[0]))
         
-        return weighted_forecast
+        ensemble = np.zeros(len(terms['garch']))
+        for model_name, weight in self.model_weights.items():
+            if model_name in terms:
+                ensemble += weight * terms[model_name]
+        terms['ensemble'] = np.abs(ensemble)
+        return terms
+    
+    def get_model_forecasts(self) -> Dict[str, PriceSeries]:
+        """Return the per-model forecasts computed during fit()."""
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted before accessing forecasts")
+        return {name: forecast.copy() for name, forecast in self.forecasts.items()}
     
     def get_model_weights(self) -> Dict[str, float]:
         """Return the current model weights."""
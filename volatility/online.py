@@ -0,0 +1,271 @@
+"""
+Online volatility state for streaming price updates.
+
+``OnlineVolatility`` holds one ticker's EWMA variance, rolling-window sums
+and GARCH(1,1) conditional variance, and folds in each new bar in constant
+time instead of recomputing from the full history. A bar with the same date
+as the last one revises it (e.g. intraday ticks for today's bar), which is
+also constant time: the state from before the last bar is kept.
+
+The values match the batch functions in ``volatility.models`` on the same
+prices: ``ewma_volatility`` the EWMA forecast level, ``historical_volatility``
+the last value of calculate_historical_volatility, ``parkinson_volatility``
+the last value of calculate_parkinson_volatility, and ``garch_fit()`` the
+fit extended over the same bars.
+"""
+import math
+from array import array
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .calendar import get_calendar
+from .kernels import TRADING_DAYS
+from .models import GarchFit
+from .series import datetime_index
+
+_PARKINSON_SCALE = 1 / (4 * math.log(2))
+
+# Scalars restored when the last bar is revised
+_UNDO_FIELDS = (
+    'last_date', 'last_price', 'n_returns', 'n_bars', 'ewma_variance',
+    '_sum', '_sum_sq', '_range_sum', '_updates_since_refresh',
+    'garch_variance', 'garch_residual'
+)
+
+class OnlineVolatility:
+    """
+    Constant-time-per-bar volatility state for one ticker.
+
+    Args:
+        window: Rolling window of the historical and Parkinson estimators
+        lambda_param: EWMA decay factor
+        ranges: Track the Parkinson estimator; every bar then needs a high
+            and a low
+    """
+
+    __slots__ = (
+        'window', 'lambda_param', 'ranges', 'last_date', 'last_price',
+        'n_returns', 'n_bars', 'ewma_variance', 'garch_params',
+        'garch_variance', 'garch_residual', '_returns', '_range_vars',
+        '_sum', '_sum_sq', '_range_sum', '_updates_since_refresh', '_undo'
+    )
+
+    def __init__(self, window: int = 30, lambda_param: float = 0.94, ranges: bool = False):
+        if window < 2:
+            raise ValueError("Window size must be at least 2")
+        if not 0 <= lambda_param <= 1:
+            raise ValueError("Decay factor must be between 0 and 1")
+        self.window = window
+        self.lambda_param = lambda_param
+        self.ranges = ranges
+        self.last_date: Optional[pd.Timestamp] = None
+        self.last_price: Optional[float] = None
+        self.n_returns = 0
+        self.n_bars = 0
+        self.ewma_variance = math.nan
+        self.garch_params: Optional[Dict[str, float]] = None
+        self.garch_variance = math.nan
+        self.garch_residual = math.nan
+        # Ring buffers of the last `window` log returns and Parkinson variances
+        self._returns = array('d', [0.0] * window)
+        self._range_vars = array('d', [0.0] * (window if ranges else 0))
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._range_sum = 0.0
+        self._updates_since_refresh = 0
+        self._undo: Optional[tuple] = None
+
+    @classmethod
+    def from_prices(cls,
+                    prices: pd.Series,
+                    ohlc_data: Optional[pd.DataFrame] = None,
+                    window: int = 30,
+                    lambda_param: float = 0.94,
+                    garch_fit: Optional[GarchFit] = None) -> 'OnlineVolatility':
+        """
+        Build the state from a price history.
+
+        Args:
+            prices: Daily closing prices
+            ohlc_data: Optional bars with High and Low columns on the same
+                index; enables the Parkinson estimator
+            window: Rolling window size
+            lambda_param: EWMA decay factor
+            garch_fit: A GARCH fit on a prefix of (or all of) the prices; it is
+                extended to the last price and tracked from then on
+        """
+        state = cls(window, lambda_param, ranges=ohlc_data is not None)
+        highs = lows = [None] * len(prices)
+        if ohlc_data is not None:
+            highs = ohlc_data['High'].to_numpy(dtype=float).tolist()
+            lows = ohlc_data['Low'].to_numpy(dtype=float).tolist()
+        for date, close, high, low in zip(prices.index, prices.to_numpy(dtype=float).tolist(), highs, lows):
+            state.update(close, high, low, date=date)
+        if garch_fit is not None:
+            state.attach_garch(garch_fit.extend(prices))
+        return state
+
+    def attach_garch(self, garch_fit: GarchFit) -> None:
+        """Track a GARCH fit's conditional variance from the current bar on."""
+        if garch_fit.last_date != self.last_date:
+            raise ValueError("GARCH fit must end on the state's last bar")
+        self.garch_params = dict(garch_fit.params)
+        self.garch_variance = float(garch_fit.conditional_variance[-1])
+        self.garch_residual = float(garch_fit.residuals[-1])
+        if self._undo is not None and len(garch_fit.conditional_variance) > 1:
+            # Keep the last bar revisable with the GARCH state from before it
+            undo = dict(zip(_UNDO_FIELDS, self._undo))
+            undo['garch_variance'] = float(garch_fit.conditional_variance[-2])
+            undo['garch_residual'] = float(garch_fit.residuals[-2])
+            self._undo = tuple(undo[name] for name in _UNDO_FIELDS) + self._undo[len(_UNDO_FIELDS):]
+        else:
+            self._undo = None
+
+    def update(self,
+               close: float,
+               high: Optional[float] = None,
+               low: Optional[float] = None,
+               date: Optional[pd.Timestamp] = None) -> None:
+        """
+        Fold one bar into the state in constant time.
+
+        Args:
+            close: Closing (or latest) price of the bar
+            high, low: Bar range; required when Parkinson is tracked
+            date: Bar date; the same date as the last bar revises that bar
+        """
+        if close <= 0:
+            raise ValueError("Prices must be positive")
+        if self.ranges and (high is None or low is None):
+            raise ValueError("High and low are required when ranges are tracked")
+
+        if date is not None and self.last_date is not None:
+            if date == self.last_date:
+                if self._undo is None:
+                    raise ValueError("The last bar can no longer be revised")
+                self._rollback()
+            elif date < self.last_date:
+                raise ValueError("Bars must arrive in date order")
+
+        self._undo = tuple(getattr(self, name) for name in _UNDO_FIELDS) + (
+            self._returns[self.n_returns % self.window],
+            self._range_vars[self.n_bars % self.window] if self.ranges else 0.0
+        )
+
+        if self.ranges:
+            range_var = math.log(high / low) ** 2 * _PARKINSON_SCALE
+            slot = self.n_bars % self.window
+            self._range_sum += range_var - self._range_vars[slot]
+            self._range_vars[slot] = range_var
+        self.n_bars += 1
+
+        if self.last_price is not None:
+            log_return = math.log(close / self.last_price)
+            squared = log_return * log_return
+            if self.n_returns == 0:
+                self.ewma_variance = squared
+            else:
+                self.ewma_variance = self.lambda_param * self.ewma_variance + (1 - self.lambda_param) * squared
+
+            slot = self.n_returns % self.window
+            old = self._returns[slot]
+            self._sum += log_return - old
+            self._sum_sq += squared - old * old
+            self._returns[slot] = log_return
+            self.n_returns += 1
+
+            if self.garch_params is not None:
+                params = self.garch_params
+                self.garch_variance = (params['omega']
+                                       + params['alpha[1]'] * self.garch_residual ** 2
+                                       + params['beta[1]'] * self.garch_variance)
+                self.garch_residual = 100 * log_return - params['mu']
+
+            # Recompute the running sums now and then so rounding cannot accumulate
+            self._updates_since_refresh += 1
+            if self._updates_since_refresh >= self.window:
+                self._refresh_sums()
+
+        self.last_price = float(close)
+        self.last_date = date
+
+    def _rollback(self) -> None:
+        *scalars, old_return, old_range = self._undo
+        for name, value in zip(_UNDO_FIELDS, scalars):
+            setattr(self, name, value)
+        self._returns[self.n_returns % self.window] = old_return
+        if self.ranges:
+            self._range_vars[self.n_bars % self.window] = old_range
+
+    def _refresh_sums(self) -> None:
+        self._sum = math.fsum(self._returns)
+        self._sum_sq = math.fsum(r * r for r in self._returns)
+        if self.ranges:
+            self._range_sum = math.fsum(self._range_vars)
+        self._updates_since_refresh = 0
+
+    @property
+    def ewma_volatility(self) -> float:
+        """Annualized EWMA volatility in percent."""
+        return math.sqrt(self.ewma_variance * TRADING_DAYS) * 100
+
+    @property
+    def historical_volatility(self) -> float:
+        """Annualized rolling close-to-close volatility in percent, NaN until the window fills."""
+        if self.n_returns < self.window:
+            return math.nan
+        variance = (self._sum_sq - self._sum * self._sum / self.window) / (self.window - 1)
+        return math.sqrt(max(variance, 0.0) * TRADING_DAYS) * 100
+
+    @property
+    def parkinson_volatility(self) -> float:
+        """Annualized rolling Parkinson volatility in percent, NaN until the window fills."""
+        if not self.ranges or self.n_bars < self.window:
+            return math.nan
+        return math.sqrt(max(self._range_sum / self.window, 0.0) * TRADING_DAYS) * 100
+
+    def garch_fit(self) -> GarchFit:
+        """Return the tracked GARCH model as a fit ending on the last bar."""
+        if self.garch_params is None:
+            raise ValueError("No GARCH model attached")
+        return GarchFit(
+            params=self.garch_params,
+            conditional_variance=np.array([self.garch_variance]),
+            residuals=np.array([self.garch_residual]),
+            last_date=self.last_date,
+            last_price=self.last_price
+        )
+
+    def ewma_forecast(self, forecast_horizon: int = 5) -> pd.Series:
+        """Flat EWMA volatility forecast, as calculate_ewma_forecast returns it."""
+        forecast_dates = get_calendar().next_sessions(self.last_date, forecast_horizon)
+        return pd.Series(self.ewma_volatility, index=datetime_index(forecast_dates))
+
+    def to_dict(self) -> dict:
+        """Serialize the state to JSON-compatible values for snapshots."""
+        data = {name: getattr(self, name) for name in (
+            'window', 'lambda_param', 'ranges', 'last_price', 'n_returns', 'n_bars',
+            'ewma_variance', 'garch_params', 'garch_variance', 'garch_residual',
+            '_sum', '_sum_sq', '_range_sum', '_updates_since_refresh'
+        )}
+        data['last_date'] = self.last_date.isoformat() if self.last_date is not None else None
+        data['returns'] = self._returns.tolist()
+        data['range_vars'] = self._range_vars.tolist()
+        # The undo record is not kept; a restored state cannot revise its last bar
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'OnlineVolatility':
+        """Restore a state written by to_dict()."""
+        state = cls(data['window'], data['lambda_param'], data['ranges'])
+        for name in ('last_price', 'n_returns', 'n_bars', 'ewma_variance', 'garch_params',
+                     'garch_variance', 'garch_residual', '_sum', '_sum_sq', '_range_sum',
+                     '_updates_since_refresh'):
+            setattr(state, name, data[name])
+        if data['last_date'] is not None:
+            state.last_date = pd.Timestamp(data['last_date'])
+        state._returns = array('d', data['returns'])
+        state._range_vars = array('d', data['range_vars'])
+        return state
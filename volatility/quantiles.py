@@ -0,0 +1,51 @@
+"""
+Normal quantiles for two-sided confidence bands.
+
+z-scores come from ``statistics.NormalDist`` (no SciPy import) and are
+memoized per confidence level, so a repeated request costs a cache lookup
+and identical inputs always give identical bands.
+"""
+from functools import lru_cache
+from statistics import NormalDist
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+COMMON_CONFIDENCE_LEVELS = (0.68, 0.9, 0.95, 0.99)
+
+@lru_cache(maxsize=256)
+def two_sided_z(confidence: float) -> float:
+    """
+    Return z such that P(-z < Z < z) = confidence for a standard normal Z.
+
+    Args:
+        confidence: Confidence level in (0, 1)
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence level must be between 0 and 1")
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+def z_scores(confidence_levels: Sequence[float]) -> np.ndarray:
+    """Two-sided z-scores for several confidence levels."""
+    return np.array([two_sided_z(float(level)) for level in confidence_levels])
+
+def normal_bands(center,
+                 scale,
+                 confidence_levels: Sequence[float] = COMMON_CONFIDENCE_LEVELS
+                 ) -> Dict[float, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Symmetric center +/- z * scale bands for several levels in one broadcast.
+
+    Args:
+        center: Central values, e.g. a forecast path
+        scale: Standard deviation, a scalar or an array broadcastable to center
+        confidence_levels: Levels in (0, 1)
+
+    Returns:
+        Mapping of each level to (lower, upper) arrays shaped like center
+    """
+    center = np.asarray(center, dtype=float)
+    half_widths = z_scores(confidence_levels).reshape((-1,) + (1,) * center.ndim) * np.asarray(scale, dtype=float)
+    lower = center - half_widths
+    upper = center + half_widths
+    return {float(level): (lower[i], upper[i]) for i, level in enumerate(confidence_levels)}
@@ -0,0 +1,200 @@
+"""
+Compact NumPy-backed daily series.
+
+``CompactSeries`` keeps a daily series as two contiguous arrays, int32 days
+since 1970-01-01 and float64 (or, to halve memory, float32) values, with
+no index object, so slicing is a view and building one allocates nothing
+beyond its values. ``CompactFrame`` holds several such columns (e.g. OHLC
+bars) on shared days.
+
+The functions in ``volatility.models`` take either these or pandas objects
+and return the type they were given; the pandas conversions are meant for
+the edges (price fetching, charts, tests). Computations run in float64
+whatever the storage type; results are stored in the input's value type.
+
+``first_date``, ``last_date``, ``after`` and ``has_date`` answer the few date questions the
+models ask of either kind of series.
+"""
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+_VALUE_TYPES = (np.dtype(np.float64), np.dtype(np.float32))
+
+def _epoch_days(dates) -> np.ndarray:
+    dates = np.asarray(dates)
+    if dates.dtype.kind == 'M':
+        dates = dates.astype('datetime64[D]').astype(np.int64)
+    return np.ascontiguousarray(dates, dtype=np.int32)
+
+def _value_array(values, dtype=None) -> np.ndarray:
+    values = np.asarray(values, dtype=dtype)
+    if values.dtype not in _VALUE_TYPES:
+        values = values.astype(np.float64)
+    return np.ascontiguousarray(values)
+
+# Resolution of the indexes pandas builds from dates (ns before pandas 3, us since)
+_INDEX_DTYPE = pd.date_range('1970-01-01', periods=1).dtype
+
+def datetime_index(dates: np.ndarray) -> pd.DatetimeIndex:
+    """DatetimeIndex of day dates (int32 epoch days or datetime64) at pandas' default resolution."""
+    dates = np.asarray(dates)
+    if dates.dtype.kind != 'M':
+        dates = dates.astype('datetime64[D]')
+    return pd.DatetimeIndex(dates.astype(_INDEX_DTYPE))
+
+def _day(date) -> int:
+    return int(np.datetime64(pd.Timestamp(date).date(), 'D').astype(np.int64))
+
+class CompactSeries:
+    """
+    Daily series on contiguous arrays.
+
+    Args:
+        days: Dates as int32 days since 1970-01-01, or datetime64 values
+        values: float64 or float32 values; other types become float64
+        name: Optional series name
+    """
+
+    __slots__ = ('days', 'values', 'name')
+
+    def __init__(self, days, values, name: Optional[str] = None):
+        self.days = _epoch_days(days)
+        self.values = _value_array(values)
+        if self.days.shape != self.values.shape or self.values.ndim != 1:
+            raise ValueError("Days and values must be 1-D arrays of the same length")
+        self.name = name
+
+    @classmethod
+    def from_pandas(cls, series: pd.Series, dtype=np.float64) -> 'CompactSeries':
+        """Convert a Series with a DatetimeIndex, storing values as dtype."""
+        return cls(series.index.to_numpy(dtype='datetime64[D]'),
+                   _value_array(series.to_numpy(), dtype), series.name)
+
+    def to_pandas(self) -> pd.Series:
+        """Series of float64 values on a DatetimeIndex."""
+        return pd.Series(self.values.astype(np.float64), index=datetime_index(self.days), name=self.name)
+
+    def to_numpy(self, dtype=None) -> np.ndarray:
+        """The values, copied only if dtype differs from the storage type."""
+        return self.values if dtype is None else self.values.astype(dtype, copy=False)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.values.dtype
+
+    @property
+    def dates(self) -> np.ndarray:
+        """The days as datetime64[D]."""
+        return self.days.astype('datetime64[D]')
+
+    @property
+    def iloc(self) -> 'CompactSeries':
+        """Positional indexing, as with pandas; the series itself is positional."""
+        return self
+
+    @property
+    def nbytes(self) -> int:
+        return self.days.nbytes + self.values.nbytes
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            return CompactSeries(self.days[key], self.values[key], self.name)
+        return self.values[key].item()
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return f"CompactSeries(name={self.name!r}, length=0, dtype={self.dtype})"
+        return (f"CompactSeries(name={self.name!r}, length={len(self)}, dtype={self.dtype}, "
+                f"{self.dates[0]}..{self.dates[-1]})")
+
+    def copy(self) -> 'CompactSeries':
+        return CompactSeries(self.days.copy(), self.values.copy(), self.name)
+
+    def mean(self) -> float:
+        """Mean of the non-NaN values, as pandas computes it."""
+        return float(np.nanmean(self.values, dtype=np.float64)) if len(self) else float('nan')
+
+    def dropna(self) -> 'CompactSeries':
+        keep = ~np.isnan(self.values)
+        if keep.all():
+            return self
+        return CompactSeries(self.days[keep], self.values[keep], self.name)
+
+    def fillna(self, value: float) -> 'CompactSeries':
+        return CompactSeries(self.days, np.where(np.isnan(self.values), value, self.values), self.name)
+
+class CompactFrame:
+    """
+    Named float columns on shared days, e.g. OHLC bars.
+
+    Args:
+        days: Dates as int32 days since 1970-01-01, or datetime64 values
+        columns: Column name to values, each as long as days
+    """
+
+    __slots__ = ('days', '_columns')
+
+    def __init__(self, days, columns: Dict[str, np.ndarray]):
+        self.days = _epoch_days(days)
+        self._columns = {name: _value_array(values) for name, values in columns.items()}
+        if any(values.shape != self.days.shape for values in self._columns.values()):
+            raise ValueError("Every column must be as long as days")
+
+    @classmethod
+    def from_pandas(cls,
+                    frame: pd.DataFrame,
+                    columns: Optional[Iterable[str]] = None,
+                    dtype=np.float64) -> 'CompactFrame':
+        """Convert columns of a DataFrame with a DatetimeIndex, storing values as dtype."""
+        names = list(frame.columns if columns is None else columns)
+        return cls(frame.index.to_numpy(dtype='datetime64[D]'),
+                   {name: _value_array(frame[name].to_numpy(), dtype) for name in names})
+
+    def to_pandas(self) -> pd.DataFrame:
+        return pd.DataFrame({name: values.astype(np.float64) for name, values in self._columns.items()},
+                            index=datetime_index(self.days))
+
+    @property
+    def columns(self) -> tuple:
+        return tuple(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        return self.days.nbytes + sum(values.nbytes for values in self._columns.values())
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __getitem__(self, name: str) -> CompactSeries:
+        return CompactSeries(self.days, self._columns[name], name)
+
+def first_date(series: Union[pd.Series, CompactSeries]) -> pd.Timestamp:
+    """Date of the first value."""
+    if isinstance(series, CompactSeries):
+        return pd.Timestamp(int(series.days[0]), unit='D')
+    return series.index[0]
+
+def last_date(series: Union[pd.Series, CompactSeries]) -> pd.Timestamp:
+    """Date of the last value."""
+    if isinstance(series, CompactSeries):
+        return pd.Timestamp(int(series.days[-1]), unit='D')
+    return series.index[-1]
+
+def after(series, date: pd.Timestamp):
+    """The part of a series dated after date, a view for a CompactSeries."""
+    if isinstance(series, CompactSeries):
+        return series[int(np.searchsorted(series.days, _day(date), side='right')):]
+    return series[series.index > date]
+
+def has_date(series, date: pd.Timestamp) -> bool:
+    """Whether a series has a value dated exactly date."""
+    if isinstance(series, CompactSeries):
+        day = _day(date)
+        position = int(np.searchsorted(series.days, day))
+        return position < len(series) and series.days[position] == day
+    return date in series.index
@@ -0,0 +1,170 @@
+"""
+Monte Carlo forecast distributions of GARCH and EWMA volatility.
+
+Variance paths are simulated in chunks of paths: each chunk draws its shocks
+in one (paths x horizon) block and steps the variance recursion across all
+of its paths at once, so the float64 working set is bounded by
+``chunk_size x forecast_horizon`` whatever the number of paths. Only the
+simulated annualized volatilities are kept (as float32), from which bands
+for any number of confidence levels come out of a single quantile pass.
+
+Simulations are reproducible for a given ``seed`` and ``chunk_size``.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .kernels import TRADING_DAYS
+from .models import GarchFit
+
+DEFAULT_CONFIDENCE_LEVELS = (0.5, 0.8, 0.95)
+
+def simulate_variance_paths(next_variance: float,
+                            omega: float,
+                            alpha: float,
+                            beta: float,
+                            forecast_horizon: int = 5,
+                            n_paths: int = 10_000,
+                            seed: Optional[int] = None,
+                            chunk_size: int = 4_096,
+                            innovations: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Simulate annualized volatility paths of a GARCH(1,1)-type recursion.
+
+    The variance of step 1 is known at the origin; later steps follow
+    h[k+1] = omega + alpha * h[k] * z[k]^2 + beta * h[k].
+
+    Args:
+        next_variance: Daily variance of step 1, in squared percent
+        omega, alpha, beta: Recursion parameters (EWMA is omega=0,
+            alpha=1-lambda, beta=lambda)
+        forecast_horizon: Steps per path
+        n_paths: Number of paths
+        seed: Seed of the random generator
+        chunk_size: Paths simulated at once
+        innovations: Standardized residuals to bootstrap shocks from instead
+            of drawing them from a standard normal
+
+    Returns:
+        float32 array of shape (n_paths, forecast_horizon) with annualized
+        volatility in percent
+    """
+    if forecast_horizon < 1:
+        raise ValueError("Forecast horizon must be at least 1")
+    if n_paths < 1 or chunk_size < 1:
+        raise ValueError("n_paths and chunk_size must be at least 1")
+    if innovations is not None:
+        innovations = np.asarray(innovations, dtype=float)
+        innovations = innovations[np.isfinite(innovations)]
+        if len(innovations) == 0:
+            raise ValueError("Innovations must contain finite values")
+
+    rng = np.random.default_rng(seed)
+    volatility = np.empty((n_paths, forecast_horizon), dtype=np.float32)
+    for start in range(0, n_paths, chunk_size):
+        size = min(chunk_size, n_paths - start)
+        if innovations is None:
+            shocks = rng.standard_normal((size, forecast_horizon - 1))
+        else:
+            shocks = rng.choice(innovations, size=(size, forecast_horizon - 1))
+        squared_shocks = shocks ** 2
+
+        variance = np.full(size, float(next_variance))
+        volatility[start:start + size, 0] = np.sqrt(variance * TRADING_DAYS)
+        for step in range(1, forecast_horizon):
+            variance = omega + (alpha * squared_shocks[:, step - 1] + beta) * variance
+            volatility[start:start + size, step] = np.sqrt(variance * TRADING_DAYS)
+    return volatility
+
+def simulate_garch_volatility(garch_fit: GarchFit,
+                              forecast_horizon: int = 5,
+                              n_paths: int = 10_000,
+                              seed: Optional[int] = None,
+                              chunk_size: int = 4_096,
+                              bootstrap: bool = False) -> np.ndarray:
+    """
+    Simulate volatility paths from a fitted GARCH(1,1) model.
+
+    Args:
+        bootstrap: Resample the fit's standardized residuals (filtered
+            historical simulation) instead of drawing normal shocks
+
+    Returns:
+        float32 array of shape (n_paths, forecast_horizon), annualized percent
+    """
+    params = garch_fit.params
+    innovations = None
+    if bootstrap:
+        innovations = garch_fit.residuals / np.sqrt(garch_fit.conditional_variance)
+    return simulate_variance_paths(
+        garch_fit.forecast_variance(1)[0],
+        params['omega'],
+        params['alpha[1]'],
+        params['beta[1]'],
+        forecast_horizon, n_paths, seed, chunk_size, innovations
+    )
+
+def simulate_ewma_volatility(next_variance: float,
+                             forecast_horizon: int = 5,
+                             lambda_param: float = 0.94,
+                             n_paths: int = 10_000,
+                             seed: Optional[int] = None,
+                             chunk_size: int = 4_096) -> np.ndarray:
+    """
+    Simulate volatility paths of the EWMA recursion.
+
+    Args:
+        next_variance: Last value of ewma_variance (daily, in log-return units)
+
+    Returns:
+        float32 array of shape (n_paths, forecast_horizon), annualized percent
+    """
+    return simulate_variance_paths(
+        next_variance * 100 ** 2, 0.0, 1 - lambda_param, lambda_param,
+        forecast_horizon, n_paths, seed, chunk_size
+    )
+
+def quantile_bands(paths: np.ndarray,
+                   confidence_levels: Sequence[float] = DEFAULT_CONFIDENCE_LEVELS
+                   ) -> Dict[float, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Central empirical bands for several confidence levels in one quantile pass.
+
+    Args:
+        paths: Simulated values, shape (n_paths, forecast_horizon)
+        confidence_levels: Levels in (0, 1)
+
+    Returns:
+        Mapping of each level to (lower, upper) arrays over the horizon
+    """
+    levels = np.asarray(confidence_levels, dtype=float)
+    if np.any((levels <= 0) | (levels >= 1)):
+        raise ValueError("Confidence levels must be between 0 and 1")
+
+    probabilities = np.concatenate([(1 - levels) / 2, (1 + levels) / 2])
+    quantiles = np.quantile(paths, probabilities, axis=0)
+    n = len(levels)
+    return {float(level): (quantiles[i], quantiles[n + i]) for i, level in enumerate(levels)}
+
+def garch_forecast_bands(garch_fit: GarchFit,
+                         forecast_horizon: int = 5,
+                         confidence_levels: Sequence[float] = DEFAULT_CONFIDENCE_LEVELS,
+                         n_paths: int = 10_000,
+                         seed: Optional[int] = 0) -> pd.DataFrame:
+    """
+    Simulated GARCH volatility bands on the forecast dates.
+
+    Returns:
+        DataFrame with ``median`` and ``lower_<level>``/``upper_<level>``
+        columns (e.g. ``lower_95``) indexed like GarchFit.forecast()
+    """
+    paths = simulate_garch_volatility(garch_fit, forecast_horizon, n_paths, seed)
+    bands = quantile_bands(paths, confidence_levels)
+    columns = {'median': np.median(paths, axis=0)}
+    for level in confidence_levels:
+        lower, upper = bands[float(level)]
+        label = f"{level * 100:g}".replace('.', '_')
+        columns[f"lower_{label}"] = lower
+        columns[f"upper_{label}"] = upper
+    return pd.DataFrame(columns, index=garch_fit.forecast(forecast_horizon).index)
@@ -0,0 +1,238 @@
+"""
+Parallel GARCH(1,1) fitting across a universe of tickers.
+
+Log returns for the whole universe are written once into a shared-memory
+block; worker processes attach to it and fit one column each, so no
+DataFrames are pickled. Every fit runs under its own timeout, and a
+failure or non-convergence affects only that ticker's row. A worker that
+dies (e.g. a segfault or OOM kill in the optimizer) or hangs where the
+timeout cannot interrupt it breaks the whole pool; the unfinished tickers
+are then refitted one at a time on fresh pools, so the ticker at fault is
+found and only its row fails.
+"""
+import os
+import signal
+import threading
+import warnings
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .models import GARCH_PARAMS, GarchFit, _fit_arch
+
+# Fewer returns than this do not identify a GARCH(1,1)
+MIN_OBSERVATIONS = 30
+
+# Seconds beyond the fit timeout after which a worker that has not returned
+# is taken to be stuck in native code, which SIGALRM cannot interrupt
+HANG_GRACE = 10.0
+
+RESULT_COLUMNS = [
+    'status', 'n_obs', 'mu', 'omega', 'alpha', 'beta', 'persistence',
+    'last_variance', 'next_day_vol', 'forecast_vol', 'error'
+]
+
+class _FitTimeout(Exception):
+    pass
+
+def _raise_timeout(signum, frame):
+    raise _FitTimeout()
+
+def _fit_column(returns: np.ndarray, timeout: Optional[float]) -> dict:
+    """Fit one ticker's percent log returns; never raises."""
+    returns = returns[~np.isnan(returns)]
+    if len(returns) < MIN_OBSERVATIONS:
+        return {'status': 'insufficient_data', 'n_obs': len(returns),
+                'error': f"Need at least {MIN_OBSERVATIONS} returns"}
+
+    # SIGALRM interrupts the optimizer where it is available (POSIX main thread)
+    use_alarm = (timeout is not None
+                 and hasattr(signal, 'setitimer')
+                 and threading.current_thread() is threading.main_thread())
+    previous = None
+    try:
+        if use_alarm:
+            previous = signal.signal(signal.SIGALRM, _raise_timeout)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            model_fit = _fit_arch(returns)
+    except _FitTimeout:
+        return {'status': 'timeout', 'n_obs': len(returns),
+                'error': f"Fit exceeded {timeout:g}s"}
+    except Exception as e:
+        return {'status': 'failed', 'n_obs': len(returns), 'error': str(e)}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            if previous is not None:
+                signal.signal(signal.SIGALRM, previous)
+
+    return {
+        'status': 'ok' if model_fit.convergence_flag == 0 else 'not_converged',
+        'n_obs': len(returns),
+        'params': dict(zip(GARCH_PARAMS, np.asarray(model_fit.params, dtype=float))),
+        'last_variance': float(model_fit.conditional_volatility[-1] ** 2),
+        'last_residual': float(model_fit.resid[-1]),
+        'error': None if model_fit.convergence_flag == 0 else "Optimizer did not converge"
+    }
+
+def _fit_shared_column(shm_name: str,
+                       shape: Tuple[int, int],
+                       column: int,
+                       timeout: Optional[float]) -> dict:
+    """Worker entry point: attach to the shared returns and fit one column."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        returns = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order='F')
+        # Copy out the column so no view outlives the mapping
+        return _fit_column(np.array(returns[:, column]), timeout)
+    finally:
+        shm.close()
+
+def _stop(executor: Executor, terminate: bool) -> None:
+    """Shut a pool down, killing its workers if one of them may be stuck."""
+    if terminate:
+        if hasattr(executor, 'terminate_workers'):  # Python 3.14+
+            executor.terminate_workers()
+            return
+        for process in list(getattr(executor, '_processes', {}).values()):
+            process.terminate()
+    executor.shutdown(wait=not terminate, cancel_futures=True)
+
+def _fit_in_pool(shm_name: str,
+                 shape: Tuple[int, int],
+                 columns: List[int],
+                 timeout: Optional[float],
+                 workers: int) -> Tuple[Dict[int, dict], Optional[str]]:
+    """
+    Fit columns on a fresh pool until they finish or the pool breaks.
+
+    Returns:
+        The finished fits by column, and None, 'crashed' when a worker died
+        or 'hung' when no fit returned within the timeout plus HANG_GRACE
+    """
+    hang_timeout = None if timeout is None else timeout + HANG_GRACE
+    fits: Dict[int, dict] = {}
+    failure = None
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {
+            executor.submit(_fit_shared_column, shm_name, shape, column, timeout): column
+            for column in columns
+        }
+        pending = set(futures)
+        while pending and failure is None:
+            done, pending = wait(pending, timeout=hang_timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                failure = 'hung'
+            for future in done:
+                try:
+                    fits[futures[future]] = future.result()
+                except BrokenProcessPool:
+                    failure = 'crashed'
+                except Exception as e:
+                    fits[futures[future]] = {'status': 'failed', 'n_obs': 0, 'error': str(e)}
+    finally:
+        _stop(executor, terminate=failure is not None)
+    return fits, failure
+
+def _result_row(fit: dict, last_date: pd.Timestamp, forecast_horizon: int) -> dict:
+    row = {column: np.nan for column in RESULT_COLUMNS}
+    row.update(status=fit['status'], n_obs=fit['n_obs'], error=fit.get('error'))
+    if 'params' not in fit:
+        return row
+
+    params = fit['params']
+    garch_fit = GarchFit(
+        params=params,
+        conditional_variance=np.array([fit['last_variance']]),
+        residuals=np.array([fit['last_residual']]),
+        last_date=last_date
+    )
+    variance = garch_fit.forecast_variance(forecast_horizon)
+    row.update(
+        mu=params['mu'],
+        omega=params['omega'],
+        alpha=params['alpha[1]'],
+        beta=params['beta[1]'],
+        persistence=garch_fit.persistence,
+        last_variance=fit['last_variance'],
+        next_day_vol=np.sqrt(variance[0] * 252),
+        forecast_vol=np.sqrt(variance.mean() * 252)
+    )
+    return row
+
+def fit_garch_universe(prices_frame: pd.DataFrame,
+                       forecast_horizon: int = 5,
+                       max_workers: Optional[int] = None,
+                       timeout: Optional[float] = 30.0) -> pd.DataFrame:
+    """
+    Fit GARCH(1,1) to every ticker of a price frame in parallel.
+
+    Args:
+        prices_frame: Daily closing prices, one column per ticker; leading or
+            trailing NaN (shorter histories) are allowed
+        forecast_horizon: Days over which ``forecast_vol`` is averaged
+        max_workers: Worker processes (defaults to the CPU count); 1 fits in
+            the calling process
+        timeout: Seconds allowed per fit, or None for no limit; with worker
+            processes, a fit stuck in native code is stopped HANG_GRACE
+            seconds later
+
+    Returns:
+        DataFrame indexed by ticker with RESULT_COLUMNS; ``status`` is one of
+        ok, not_converged, insufficient_data, timeout or failed, and the
+        annualized vols are in percent
+    """
+    if forecast_horizon < 1:
+        raise ValueError("Forecast horizon must be at least 1")
+    if prices_frame.empty:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    closes = prices_frame.to_numpy(dtype=np.float64)
+    # Column-major so each worker's column is one contiguous slice
+    returns = np.asfortranarray(100 * np.diff(np.log(closes), axis=0))
+    tickers = list(prices_frame.columns)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if max_workers == 1 or len(tickers) == 1:
+        fits = [_fit_column(returns[:, j], timeout) for j in range(len(tickers))]
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(returns.nbytes, 1))
+        try:
+            np.ndarray(returns.shape, dtype=np.float64, buffer=shm.buf, order='F')[:] = returns
+            columns = list(range(len(tickers)))
+            by_column, failure = _fit_in_pool(shm.name, returns.shape, columns, timeout,
+                                              min(max_workers, len(tickers)))
+            remaining = [j for j in columns if j not in by_column]
+            # A dead or stuck worker breaks the whole pool. Refit the rest one
+            # at a time, so the next failure is the first unfinished ticker's
+            while remaining:
+                fits_one_by_one, failure = _fit_in_pool(shm.name, returns.shape, remaining, timeout, 1)
+                by_column.update(fits_one_by_one)
+                remaining = [j for j in remaining if j not in by_column]
+                if failure is not None and remaining:
+                    culprit = remaining.pop(0)
+                    n_obs = int(np.count_nonzero(~np.isnan(returns[:, culprit])))
+                    by_column[culprit] = (
+                        {'status': 'failed', 'n_obs': n_obs, 'error': "Worker process died"}
+                        if failure == 'crashed' else
+                        {'status': 'timeout', 'n_obs': n_obs,
+                         'error': f"Fit did not return within {timeout + HANG_GRACE:g}s; worker stopped"}
+                    )
+            fits = [by_column[j] for j in columns]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    last_dates = [
+        prices_frame[ticker].last_valid_index() or prices_frame.index[-1]
+        for ticker in tickers
+    ]
+    rows = [_result_row(fit, last_date, forecast_horizon) for fit, last_date in zip(fits, last_dates)]
+    return pd.DataFrame(rows, index=pd.Index(tickers, name='ticker'), columns=RESULT_COLUMNS)
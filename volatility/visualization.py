@@ -3,9 +3,11 @@ from plotly.subplots import make_subplots
 import pandas as pd
 from typing import Optional, Dict, List
 import numpy as np
-from scipy.stats import norm
 from datetime import datetime
 
+from .calendar import get_calendar
+from .quantiles import normal_bands
+
 def create_volatility_plot(
     historical_dates: List[str],
     historical_volatility: List[float],
@@ -89,11 +91,11 @@ def create_volatility_chart(
     """Create a Plotly figure showing historical and forecast volatility."""
     # Convert all data to lists for JSON serialization
     hist_data = historical_data.fillna(0).tolist()
-    hist_dates = historical_data.index.strftime('%Y-%m-%d').tolist()
+    hist_dates = get_calendar().iso(historical_data.index.to_numpy(dtype='datetime64[D]'))
     forecast_data_list = forecast_data.fillna(0).tolist()
-    forecast_dates = forecast_data.index.strftime('%Y-%m-%d').tolist()
+    forecast_dates = get_calendar().iso(forecast_data.index.to_numpy(dtype='datetime64[D]'))
     ensemble_data = ensemble_forecast.fillna(0).tolist()
-    ensemble_dates = ensemble_forecast.index.strftime('%Y-%m-%d').tolist()
+    ensemble_dates = get_calendar().iso(ensemble_forecast.index.to_numpy(dtype='datetime64[D]'))
     
     # Create figure
     fig = go.Figure()
@@ -127,11 +129,10 @@ def create_volatility_chart(
     
     # Add confidence intervals if requested
     if show_confidence_intervals:
-        z_score = norm.ppf((1 + confidence_level) / 2)
         std_dev = np.std(historical_data.dropna())
         
-        upper_bound = [x + z_score * std_dev for x in ensemble_data]
-        lower_bound = [x - z_score * std_dev for x in ensemble_data]
+        bands = normal_bands(ensemble_data, std_dev, [confidence_level])
+        lower_bound, upper_bound = (bound.tolist() for bound in bands[confidence_level])
         
         fig.add_trace(go.Scatter(
             x=ensemble_dates,